@@ -0,0 +1,83 @@
+"""
+bench_buffer_pool.py
+
+Benchmark of the reuse of the intermediate buffers (`Pipeline.set_buffer_pool`).
+
+Two pipelines are called in a loop, with and without a `BufferPool`: an image pipeline
+(padding of a 1080p float32 image, two poolings, transposition to CHW) and an audio pipeline
+(10 s of 16 kHz stereo audio padded right then centered). The time per call and the peak
+memory allocated by a call (traced by `tracemalloc`, numpy reports its arrays to it) are
+measured in steady state, after a first warmup call. The calls with and without the pool
+alternate and the median time is reported, so a slowdown of the machine during the run
+affects both the same way.
+
+Usage:
+
+    python -m benchmark.bench_buffer_pool [--repeat 50]
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.dl_data_pipeline import Pipeline, InputNode
+from src.dl_data_pipeline.pipeline import BufferPool
+from src.dl_data_pipeline.process_functions import process_1d, process_2d
+
+def image_pipeline() -> tuple[Pipeline, np.ndarray]:
+    inp = InputNode()
+    padded = process_2d.padding_2d(inp, (1088, 1920), 0)
+    pooled = process_2d.avg_pooling_2d(process_2d.max_pooling_2d(padded, 2), 2)
+    data = np.random.default_rng(0).random((1080, 1920, 3), dtype=np.float32)
+    return Pipeline(inp, process_2d.image_hwc_to_chw(pooled)), data
+
+def audio_pipeline() -> tuple[Pipeline, np.ndarray]:
+    inp = InputNode()
+    centered = process_1d.center_pad_rcut(process_1d.rpad_rcut(inp, 170000), 176000)
+    data = np.random.default_rng(0).standard_normal((2, 160000)).astype(np.float32)
+    return Pipeline(inp, centered), data
+
+def measure_times(pipelines: list[Pipeline], data: np.ndarray, repeat: int) -> list[float]:
+    """Median time per call in seconds of each pipeline, their calls alternate."""
+    times: list[list[float]] = [[] for _ in pipelines]
+    for pipeline in pipelines:
+        pipeline(data)
+    for _ in range(repeat):
+        for pipeline, pipeline_times in zip(pipelines, times):
+            start = time.perf_counter()
+            pipeline(data)
+            pipeline_times.append(time.perf_counter() - start)
+    return [statistics.median(pipeline_times) for pipeline_times in times]
+
+def measure_peak(pipeline: Pipeline, data: np.ndarray) -> int:
+    """Peak bytes allocated by a call in steady state."""
+    pipeline(data)
+    tracemalloc.start()
+    pipeline(data)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    pipeline(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - current
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    options = parser.parse_args()
+
+    print(f"{'pipeline':10} {'pool':>5} {'time (ms)':>10} {'peak alloc (MB)':>16}")
+    for name, build in (("image", image_pipeline), ("audio", audio_pipeline)):
+        plain, data = build()
+        pooled, _ = build()
+        pooled.set_buffer_pool(BufferPool())
+        times = measure_times([plain, pooled], data, options.repeat)
+        for use_pool, pipeline, elapsed in zip((False, True), (plain, pooled), times):
+            peak = measure_peak(pipeline, data)
+            print(f"{name:10} {str(use_pool):>5} {elapsed * 1e3:10.2f} {peak / 1e6:16.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+bench_import_time.py
+
+Benchmark of the time taken to import the package, paid by every spawned worker process.
+
+Each import runs in a fresh interpreter. The reported time is the median of several runs of
+the import alone (the interpreter startup isn't counted). The slowest modules are listed from
+`python -X importtime`, and the heavy optional dependencies (OpenCV, asyncio) that were
+imported are reported.
+
+Usage:
+
+    python -m benchmark.bench_import_time [--module src.dl_data_pipeline] [--runs 10] [--max-ms 300]
+
+With `--max-ms`, the script exits with status 1 when the median is above the limit.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("cv2", "asyncio")
+
+MEASURE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure(module: str) -> dict:
+    code = MEASURE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+def slowest_modules(module: str, count: int) -> list[tuple[int, str]]:
+    """Cumulative import time in microseconds of the slowest modules, from `-X importtime`."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:count]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.dl_data_pipeline")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules listed")
+    parser.add_argument("--max-ms", type=float, help="fail if the median import time is above this")
+    options = parser.parse_args()
+
+    results = [measure(options.module) for _ in range(options.runs)]
+    median = statistics.median(result["seconds"] for result in results) * 1e3
+    best = min(result["seconds"] for result in results) * 1e3
+
+    print(f"import {options.module}")
+    print(f"median : {median:8.1f} ms")
+    print(f"best   : {best:8.1f} ms")
+    print(f"heavy modules imported : {', '.join(results[0]['heavy']) or 'none'}")
+    print("\nslowest modules (cumulative):")
+    for cumulative, name in slowest_modules(options.module, options.top):
+        print(f"{cumulative / 1e3:8.1f} ms  {name}")
+
+    if options.max_ms is not None and median > options.max_ms:
+        print(f"\nmedian import time {median:.1f} ms is above {options.max_ms} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+bench_pipeline_overhead.py
+
+Microbenchmark of the per node overhead of `Pipeline.__call__`.
+
+A pipeline made of many cheap nodes (transpositions of a tiny image and `__getitem__`) is
+executed with the compiled plan of `Pipeline`, and with the node by node execution used before
+(`PipelineNode.execute()` in a `try` per node, values stored in the nodes). The time of the
+functions themselves is measured alone and subtracted, what remains is the overhead.
+
+Usage:
+
+    python -m benchmark.bench_pipeline_overhead [--nodes 200] [--repeat 2000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.dl_data_pipeline import Pipeline, InputNode
+from src.dl_data_pipeline.pipeline import PipelineNode
+from src.dl_data_pipeline.process_functions.process_2d import image_hwc_to_chw, image_chw_to_hwc
+
+def build_pipeline(num_nodes: int) -> tuple[InputNode, PipelineNode]:
+    """Chain of transpositions and `__getitem__` (`x[...]` is a view of the whole array)."""
+    inp = InputNode()
+    x = inp
+    for _ in range(num_nodes // 4):
+        x = image_chw_to_hwc(image_hwc_to_chw(x))[...][...]
+    return inp, x
+
+def legacy_call(exec_graph: list[PipelineNode], inp: InputNode, output: PipelineNode, data: np.ndarray) -> np.ndarray:
+    """Node by node execution, as `Pipeline.__call__` did before the compiled plan."""
+    inp._set_value(data)
+    for node in exec_graph:
+        try:
+            node.execute()
+        except Exception as e:
+            raise RuntimeError(f"{node} : {e}")
+    return output.value
+
+def topological_order(output: PipelineNode) -> list[PipelineNode]:
+    order, visited = [], set()
+    def visit(node: PipelineNode) -> None:
+        if node not in visited:
+            visited.add(node)
+            for parent in node.parent:
+                visit(parent)
+            order.append(node)
+    visit(output)
+    return order
+
+def timeit(func, repeat: int) -> float:
+    """Best time of 5 runs of `repeat` calls, in seconds per call."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=2000)
+    options = parser.parse_args()
+
+    data = np.zeros((4, 4, 3))
+    inp, output = build_pipeline(options.nodes)
+    pipeline = Pipeline(inp, output)
+    exec_graph = topological_order(output)
+    plan = pipeline.compile()
+    num_steps = len(plan)
+
+    # cost of the functions alone
+    def functions_only():
+        value = data
+        for func, _, _, _ in plan:
+            value = func(value)
+    baseline = timeit(functions_only, options.repeat)
+
+    legacy = timeit(lambda: legacy_call(exec_graph, inp, output, data), options.repeat)
+    compiled = timeit(lambda: pipeline(data), options.repeat)
+
+    print(f"nodes executed per call : {num_steps}")
+    print(f"functions only          : {baseline / num_steps * 1e9:8.1f} ns/node")
+    print(f"{'':24}   {'total':>8}   {'overhead':>8}")
+    for name, duration in (("node by node (before)", legacy), ("compiled plan (after)", compiled)):
+        total = duration / num_steps * 1e9
+        overhead = (duration - baseline) / num_steps * 1e9
+        print(f"{name:24} : {total:8.1f}   {overhead:8.1f} ns/node")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+bench_process_functions.py
+
+Microbenchmarks of every public function of `process_2d`, `process_1d` and `any_process`.
+
+Each function is called undecorated (`func.__wrapped__`, no pipeline overhead) on realistic
+sizes: 224x224, 1024x1024 and 4K (2160x3840) images in uint8 and float32, 1 s and 60 s of
+16 kHz stereo audio in float32. The decoding of JPEG photos (1080p and 12 MP) is measured
+with and without the reduced resolution decoding of `open_and_resize`, and the decoding of
+`decode_image` from a file, from bytes and into a preallocated array. The time of a case is
+the median of several runs, each run calling the function enough times to last about 20 ms.
+
+Results are saved as JSON with the dtype and size of the outputs, so a change of output
+dtype (e.g. a float64 padding of float32 audio) is reported as well as a slowdown when
+comparing with a saved baseline.
+
+Usage:
+
+    python -m benchmark.bench_process_functions --save baseline.json
+    python -m benchmark.bench_process_functions --compare baseline.json [--threshold 1.2]
+    python -m benchmark.bench_process_functions --filter pooling --quick
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from src.dl_data_pipeline.process_functions import process_1d, process_2d, any_process
+
+IMAGE_SIZES = {"224": (224, 224), "1024": (1024, 1024), "4k": (2160, 3840)}
+IMAGE_DTYPES = (np.uint8, np.float32)
+# sizes of the photos decoded and resized to 224x224
+PHOTO_SIZES = {"1080p": (1080, 1920), "12mp": (3000, 4000)}
+AUDIO_RATE = 16000
+AUDIO_SECONDS = (1, 60)
+
+# a case is a name, the function and a builder of its arguments (called once, not timed)
+Case = Tuple[str, Callable, Callable[[], Tuple[Any, ...]]]
+
+def image(size: str, dtype: type, channels: int = 3) -> np.ndarray:
+    height, width = IMAGE_SIZES[size]
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (height, width, channels)).astype(dtype)
+
+def photo(size: str) -> np.ndarray:
+    """Smooth gradients with some noise, compressed like a photo (random pixels aren't)."""
+    height, width = PHOTO_SIZES[size]
+    y, x = np.mgrid[:height, :width].astype(np.float32)
+    noise = np.random.default_rng(0).normal(0, 4, (height, width, 3))
+    channels = np.stack([x / width, y / height, (x + y) / (height + width)], -1) * 255
+    return np.clip(channels + noise, 0, 255).astype(np.uint8)
+
+def photo_file(directory: str, size: str) -> str:
+    path = os.path.join(directory, f"photo_{size}.jpg")
+    if not os.path.exists(path):
+        cv2.imwrite(path, photo(size))
+    return path
+
+def photo_bytes(directory: str, size: str) -> bytes:
+    with open(photo_file(directory, size), "rb") as fp:
+        return fp.read()
+
+def open_then_resize(path: str, target_shape: Tuple[int, int], max_ratio_distortion: float) -> np.ndarray:
+    image = process_2d.open_rgb_image.__wrapped__(path)
+    return process_2d.resize_with_max_distortion.__wrapped__(image, target_shape, max_ratio_distortion)
+
+def audio(seconds: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((2, seconds * AUDIO_RATE)).astype(np.float32)
+
+def image_file(directory: str, size: str, extension: str) -> str:
+    path = os.path.join(directory, f"image_{size}{extension}")
+    if not os.path.exists(path):
+        cv2.imwrite(path, image(size, np.uint8))
+    return path
+
+def build_cases(directory: str, quick: bool) -> List[Case]:
+    sizes = ["224", "1024"] if quick else list(IMAGE_SIZES)
+    seconds = AUDIO_SECONDS[:1] if quick else AUDIO_SECONDS
+    cases: List[Case] = []
+
+    for size in sizes:
+        height, width = IMAGE_SIZES[size]
+        for extension in (".jpg", ".png"):
+            cases.append((f"open_rgb_image/{size}{extension}",
+                          process_2d.open_rgb_image,
+                          lambda size=size, extension=extension: (image_file(directory, size, extension),)))
+
+        for dtype in IMAGE_DTYPES:
+            name = f"{size}/{np.dtype(dtype).name}"
+            make = lambda size=size, dtype=dtype: image(size, dtype)
+            cases += [
+                (f"padding_2d/{name}", process_2d.padding_2d,
+                 lambda make=make, height=height, width=width: (make(), (height + 32, width + 32), 0)),
+                (f"resize_with_max_distortion/{name}", process_2d.resize_with_max_distortion,
+                 lambda make=make: (make(), (224, 224), 0.1)),
+                (f"image_to_channel_num/{name}", process_2d.image_to_channel_num,
+                 lambda size=size, dtype=dtype: (image(size, dtype, channels=1), 3)),
+                (f"image_hwc_to_chw/{name}", process_2d.image_hwc_to_chw, lambda make=make: (make(),)),
+                (f"image_chw_to_hwc/{name}", process_2d.image_chw_to_hwc,
+                 lambda make=make: (np.transpose(make(), [2, 0, 1]),)),
+                (f"max_pooling_2d/{name}", process_2d.max_pooling_2d, lambda make=make: (make(), 2)),
+                (f"avg_pooling_2d/{name}", process_2d.avg_pooling_2d, lambda make=make: (make(), 2)),
+                (f"any_pooling_2d/{name}", lambda data, strides: process_2d.any_pooling_2d.__wrapped__(
+                    data, strides, pooling_function=np.min), lambda make=make: (make(), 2)),
+                (f"rescale/{name}", any_process.rescale, lambda make=make: (make(), -1.0, 1.0)),
+            ]
+
+    for size in (["1080p"] if quick else list(PHOTO_SIZES)):
+        make = lambda size=size: (photo_file(directory, size), (224, 224), 0.1)
+        cases += [
+            (f"open_rgb_image+resize/{size}.jpg", open_then_resize, make),
+            (f"open_and_resize/{size}.jpg", process_2d.open_and_resize, make),
+            (f"open_rgb_image/{size}.jpg", process_2d.open_rgb_image, lambda size=size: (photo_file(directory, size),)),
+            (f"decode_image/{size}.jpg", process_2d.decode_image, lambda size=size: (photo_file(directory, size),)),
+            (f"decode_image/{size}.jpg/bytes", process_2d.decode_image, lambda size=size: (photo_bytes(directory, size),)),
+            (f"decode_image/{size}.jpg/out", lambda source, out: process_2d.decode_image.__wrapped__(source, out=out),
+             lambda size=size: (photo_file(directory, size), np.empty((*PHOTO_SIZES[size], 3), np.uint8))),
+        ]
+
+    for second in seconds:
+        length = second * AUDIO_RATE
+        make = lambda second=second: audio(second)
+        for func in (process_1d.rpad_rcut, process_1d.lpad_lcut, process_1d.center_pad_rcut):
+            cases += [
+                (f"{func.__name__}/{second}s/pad", func, lambda make=make, length=length: (make(), length + AUDIO_RATE)),
+                (f"{func.__name__}/{second}s/cut", func, lambda make=make, length=length: (make(), length // 2)),
+            ]
+        cases.append((f"rescale/audio_{second}s", any_process.rescale, lambda make=make: (make(),)))
+    return cases
+
+def measure(func: Callable, args: Tuple[Any, ...], runs: int, target: float = 0.02) -> Dict[str, Any]:
+    """Median and minimum time of a call, with the dtype and size of the output."""
+    func = getattr(func, "__wrapped__", func)
+    output = func(*args)
+
+    # number of calls per run so that a run lasts about `target` seconds
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(*args)
+        duration = time.perf_counter() - start
+        if duration >= target or loops >= 1 << 20:
+            break
+        loops *= 2 if duration == 0 else max(2, min(10, int(target / duration) + 1))
+
+    times = [duration / loops]
+    for _ in range(runs - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(*args)
+        times.append((time.perf_counter() - start) / loops)
+
+    return {"median_s": statistics.median(times),
+            "min_s": min(times),
+            "loops": loops,
+            "runs": runs,
+            "out_dtype": str(getattr(output, "dtype", type(output).__name__)),
+            "out_nbytes": int(getattr(output, "nbytes", 0))}
+
+def environment() -> Dict[str, str]:
+    return {"python": platform.python_version(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "system": platform.system()}
+
+def compare(results: Dict[str, Dict[str, Any]],
+            baseline: Dict[str, Dict[str, Any]],
+            threshold: float,
+            min_delta: float) -> int:
+    """Print the ratio of each case to the baseline, return the number of regressions.
+    Slowdowns of less than `min_delta` seconds are timing noise of the fastest cases."""
+    regressions = 0
+    print(f"\n{'case':48} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:48} {'-':>12} {result['median_s'] * 1e6:10.1f}us {'new':>7}")
+            continue
+
+        ratio = result["median_s"] / reference["median_s"]
+        notes = []
+        if ratio > threshold and result["median_s"] - reference["median_s"] > min_delta:
+            notes.append("SLOWER")
+        if result["out_dtype"] != reference["out_dtype"]:
+            notes.append(f"dtype {reference['out_dtype']} -> {result['out_dtype']}")
+        if result["out_nbytes"] != reference["out_nbytes"]:
+            notes.append(f"bytes {reference['out_nbytes']} -> {result['out_nbytes']}")
+        regressions += len(notes) != 0
+        print(f"{name:48} {reference['median_s'] * 1e6:10.1f}us {result['median_s'] * 1e6:10.1f}us "
+              f"{ratio:7.2f} {' '.join(notes)}")
+
+    missing = sorted(set(baseline) - set(results))
+    if len(missing) != 0:
+        print(f"\nnot measured: {', '.join(missing)}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="slowdown ratio reported as a regression (default 1.2)")
+    parser.add_argument("--min-delta-us", type=float, default=2.0,
+                        help="ignore slowdowns smaller than this many microseconds (default 2)")
+    parser.add_argument("--filter", default="", help="only run the cases containing this string")
+    parser.add_argument("--runs", type=int, default=7, help="number of timed runs per case")
+    parser.add_argument("--quick", action="store_true", help="skip the 4K images and 60 s audio")
+    options = parser.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, func, make_args in build_cases(directory, options.quick):
+            if options.filter not in name:
+                continue
+            results[name] = measure(func, make_args(), options.runs)
+            result = results[name]
+            print(f"{name:48} {result['median_s'] * 1e6:10.1f}us  {result['out_dtype']:>8}")
+
+    if options.save is not None:
+        with open(options.save, "w") as fp:
+            json.dump({"environment": environment(), "results": results}, fp, indent=2)
+
+    if options.compare is not None:
+        with open(options.compare) as fp:
+            baseline = json.load(fp)["results"]
+        if options.filter:
+            baseline = {name: value for name, value in baseline.items() if options.filter in name}
+        regressions = compare(results, baseline, options.threshold, options.min_delta_us * 1e-6)
+        if regressions != 0:
+            print(f"\n{regressions} regression(s)")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,15 @@ except:
 
 from .pipeline.data_pipeline import Pipeline
 from .pipeline.input_node import InputNode
-from .process_functions import (process_1d, process_2d, any_process)
+from .pipeline.execution_error import PipelineExecutionError
 from .validator.base_validator import ValidationError
-from .deferred import deferred_execution, instant_excecution
\ No newline at end of file
+from .deferred import deferred_execution, instant_excecution
+
+# the process functions are imported on first access, e.g. `dl_data_pipeline.process_2d`
+_LAZY_SUBMODULES = ("process_1d", "process_2d", "any_process")
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        import importlib
+        return importlib.import_module(f".process_functions.{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,32 @@
+"""
+This module provides caches of node values, to compute the deterministic part of a pipeline
+once per sample instead of once per call.
+
+A cache is attached to some nodes (or to every node) of a pipeline with `Pipeline.set_cache`.
+Cached values are looked up with the identity of the node function and a fingerprint of the
+input values of the node.
+
+Classes:
+- `NodeCache`: Abstract base class of the caches.
+- `MemoryCache`: In-memory LRU cache bounded by the total size in bytes of the stored arrays.
+- `DiskCache`: Persistent cache storing arrays as `.npy` files, read back memory-mapped.
+
+Usage Example:
+    >>> from dl_data_pipeline.cache import MemoryCache
+    >>> inp = InputNode()
+    >>> image = process_2d.resize_with_max_distortion(process_2d.open_rgb_image(inp), (224, 224), 0.1)
+    >>> pipeline = Pipeline(inp, augment(image))
+
+    >>> cache = MemoryCache(max_bytes=4 * 1024**3)
+    >>> pipeline.set_cache(cache, nodes=image)  # decode + resize computed once per path
+    >>> cache.stats
+    {'hits': 0, 'misses': 0, 'evictions': 0, 'entries': 0, 'bytes': 0}
+
+    >>> # survives the worker processes, a hit is a memory-mapped read
+    >>> pipeline.set_cache(DiskCache("/data/cache", max_bytes=100 * 1024**3), nodes=image)
+"""
+
+from .base_cache import NodeCache
+from .memory_cache import MemoryCache
+from .disk_cache import DiskCache
+from .cached_call import CachedCall
@@ -0,0 +1,104 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from .fingerprint import value_fingerprint
+
+class NodeCache(ABC):
+    """
+    Abstract base class of the caches of node values.
+
+    A cache is attached to nodes of a `Pipeline` with `Pipeline.set_cache`. Before computing
+    a cached node, the pipeline looks for the value under a key made of `node_key` (the
+    identity of the node function) and `fingerprint` (a digest of the input values), and
+    stores the computed value on a miss.
+
+    Subclasses must override the `get` and `put` methods, and may override `node_key` and
+    `fingerprint` to change what identifies a value.
+
+    Only deterministic nodes should be cached: a hit returns the value computed for equal
+    inputs, without calling the function.
+    """
+    def __init__(self) -> None:
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters of the cache.
+
+        Returns:
+            Dict[str, int]: "hits", "misses" and "evictions".
+        """
+        return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions}
+
+    def node_key(self, func: Callable) -> Any:
+        """Identity of a node function in the keys of the cache.
+
+        Args:
+            func (Callable): function stored in the node.
+
+        Returns:
+            Any: hashable identity, the function itself by default.
+        """
+        return func
+
+    def fingerprint(self, data: Tuple[Any, ...]) -> str:
+        """Digest of the input values of a node.
+
+        Args:
+            data (Tuple[Any, ...]): values of the parent nodes.
+
+        Raises:
+            TypeError: the values can't be fingerprinted, the node is computed without cache.
+
+        Returns:
+            str: the digest.
+        """
+        return value_fingerprint(data)
+
+    @abstractmethod
+    def get(self, key: Any) -> Tuple[bool, Any]:
+        """Look for a value.
+
+        Args:
+            key (Any): key of the value.
+
+        Returns:
+            Tuple[bool, Any]: whether the value was found, and the value.
+        """
+
+    @abstractmethod
+    def put(self, key: Any, value: Any) -> Any:
+        """Store a value.
+
+        Args:
+            key (Any): key of the value.
+            value (Any): the value.
+
+        Returns:
+            Any: the value as returned by a later hit (e.g. a read-only view), used by
+                the node instead of the computed one.
+        """
+
+def _read_only(value: Any) -> Any:
+    """Replace the arrays of a value by read-only views.
+
+    Args:
+        value (Any): the value, arrays of lists and tuples are replaced too.
+
+    Returns:
+        Any: the value with read-only arrays.
+    """
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, list):
+        return [_read_only(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_read_only(v) for v in value)
+    return value
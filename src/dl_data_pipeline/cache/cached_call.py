@@ -0,0 +1,31 @@
+from collections.abc import Callable
+from typing import Any
+
+from .base_cache import NodeCache
+
+class CachedCall:
+    """
+    Node function looking for its result in a cache before computing it.
+
+    Inputs that can't be fingerprinted are computed without the cache.
+
+    Args:
+        func (Callable): function stored in the node.
+        cache (NodeCache): the cache.
+    """
+    def __init__(self, func: Callable, cache: NodeCache) -> None:
+        self.__func = func
+        self.__cache = cache
+        self.__node_key = cache.node_key(func)
+        self.__name__ = getattr(func, "__name__", type(func).__name__)
+
+    def __call__(self, *data: Any) -> Any:
+        try:
+            key = (self.__node_key, self.__cache.fingerprint(data))
+        except TypeError:
+            return self.__func(*data)
+
+        found, value = self.__cache.get(key)
+        if found:
+            return value
+        return self.__cache.put(key, self.__func(*data))
@@ -0,0 +1,262 @@
+import os
+import threading
+import uuid
+from collections.abc import Callable
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .base_cache import NodeCache, _read_only
+from .fingerprint import function_fingerprint, value_fingerprint
+
+class DiskCache(NodeCache):
+    """
+    Persistent cache of node values, stored as `.npy` files and read back memory-mapped.
+
+    A hit costs the page faults of the read instead of the computation (e.g. a JPEG decode
+    and a resize). The cache outlives the worker processes and can be shared by the workers
+    of `Pipeline.map(backend="process")` as they write in the same directory.
+
+    Keys are made of a fingerprint of the node function with its constant arguments, so
+    changing an argument (e.g. the target shape of a resize) invalidates the values, and of
+    a fingerprint of the input values. Strings naming an existing file are fingerprinted
+    with the path, modification time and size of the file, so a modified file is computed
+    again.
+
+    Only array values (without objects) are stored, other values are computed at each call.
+    When the total size of the files exceeds `max_bytes`, the least recently used files are
+    deleted until it's below `low_watermark * max_bytes`. The size is tracked by each
+    process, and the directory is scanned again when the budget is exceeded, so the budget
+    holds with several processes. Evicting below the budget keeps a full cache from
+    scanning the directory at every miss. A single thread evicts at a time, without
+    blocking the others.
+
+    Args:
+        directory (str): directory of the cache, created if needed.
+        max_bytes (int): maximum total size of the files.
+        low_watermark (float, optional): fraction of max_bytes kept after an eviction.
+            Defaults to 0.9.
+
+    Raises:
+        ValueError: max_bytes is negative or low_watermark isn't in [0, 1].
+
+    Example:
+        >>> cache = DiskCache("/tmp/decoded_images", max_bytes=50 * 1024**3)
+        >>> pipeline.set_cache(cache, nodes=[resized_image])
+        >>> for image in pipeline.map(paths, backend="process"):
+        >>>     ...
+    """
+    def __init__(self, directory: str, max_bytes: int, low_watermark: float = 0.9) -> None:
+        super().__init__()
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be positive, not {max_bytes}")
+        if not 0 <= low_watermark <= 1:
+            raise ValueError(f"low_watermark must be in [0, 1], not {low_watermark}")
+        self.__directory = os.path.abspath(directory)
+        self.__max_bytes = max_bytes
+        self.__low_bytes = int(max_bytes * low_watermark)
+        self.__lock = threading.Lock()
+        self.__evicting = False
+        os.makedirs(self.__directory, exist_ok=True)
+        self.__bytes = sum(size for _, size, _ in self._scan())
+
+    @property
+    def directory(self) -> str:
+        """Directory of the cache.
+
+        Returns:
+            str: absolute path.
+        """
+        return self.__directory
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters of the cache.
+
+        Returns:
+            Dict[str, int]: "hits", "misses", "evictions" and "bytes" written by this process
+                or found when the directory was last scanned.
+        """
+        return {**super().stats, "bytes": self.__bytes}
+
+    def node_key(self, func: Callable) -> str:
+        """Fingerprint of the node function and its constant arguments.
+
+        Args:
+            func (Callable): function stored in the node.
+
+        Raises:
+            TypeError: the function or its arguments can't be fingerprinted (e.g. a lambda).
+
+        Returns:
+            str: the fingerprint.
+        """
+        return function_fingerprint(func)
+
+    def fingerprint(self, data: Tuple[Any, ...]) -> str:
+        """Fingerprint of the input values, existing files are identified by their path,
+        modification time and size.
+
+        Args:
+            data (Tuple[Any, ...]): values of the parent nodes.
+
+        Raises:
+            TypeError: the values can't be fingerprinted.
+
+        Returns:
+            str: the fingerprint.
+        """
+        return value_fingerprint(_with_file_stats(data))
+
+    def get(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        path = self._path(key)
+        try:
+            value = np.load(path, mmap_mode="r", allow_pickle=False)
+        except (FileNotFoundError, ValueError, OSError):
+            with self.__lock:
+                self._misses += 1
+            return False, None
+
+        # the modification time orders the files for the eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self.__lock:
+            self._hits += 1
+        return True, value
+
+    def put(self, key: Tuple[str, str], value: Any) -> Any:
+        if not isinstance(value, np.ndarray) or value.dtype.hasobject or value.nbytes > self.__max_bytes:
+            return value
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # write then rename, readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as fp:
+                np.save(fp, value, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return _read_only(value)
+
+        with self.__lock:
+            self.__bytes += os.path.getsize(path)
+            evict = self.__bytes > self.__max_bytes and not self.__evicting
+            self.__evicting = self.__evicting or evict
+        if evict:
+            try:
+                self._evict()
+            finally:
+                with self.__lock:
+                    self.__evicting = False
+        return _read_only(value)
+
+    def clear(self) -> None:
+        """Delete every file of the cache."""
+        with self.__lock:
+            for path, _, _ in self._scan():
+                _remove(path)
+            self.__bytes = 0
+
+    def _path(self, key: Tuple[str, str]) -> str:
+        """File of a key, values of a node function are stored in the same sub directory.
+
+        Args:
+            key (Tuple[str, str]): fingerprints of the node function and the input values.
+
+        Returns:
+            str: path of the file.
+        """
+        node_key, input_key = key
+        return os.path.join(self.__directory, node_key, f"{input_key}.npy")
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """List the files of the cache.
+
+        Returns:
+            List[Tuple[str, int, float]]: path, size and modification time of each file.
+        """
+        files = []
+        for root, _, names in os.walk(self.__directory):
+            for name in names:
+                if not name.endswith(".npy"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError: # removed by an other process
+                    continue
+                files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict(self) -> None:
+        """Delete the least recently used files until the size is below the low watermark,
+        called by a single thread at a time, without the lock held."""
+        with self.__lock:
+            written = self.__bytes
+        files = sorted(self._scan(), key=lambda file: file[2])
+        remaining = sum(size for _, size, _ in files)
+        evictions = 0
+        for path, size, _ in files:
+            if remaining <= self.__low_bytes:
+                break
+            if _remove(path):
+                evictions += 1
+            remaining -= size
+
+        with self.__lock:
+            # the files written by the other threads during the scan are counted
+            self.__bytes = remaining + max(self.__bytes - written, 0)
+            self._evictions += evictions
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_DiskCache__lock"]
+        state["_DiskCache__evicting"] = False
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}("
+                f"directory = {self.__directory}, "
+                f"max_bytes = {self.__max_bytes}, "
+                f"bytes = {self.__bytes})")
+
+def _with_file_stats(value: Any) -> Any:
+    """Replace the strings naming an existing file by the path, modification time and size.
+
+    Args:
+        value (Any): the value, lists and tuples are searched too.
+
+    Returns:
+        Any: the value to fingerprint.
+    """
+    if isinstance(value, str) and os.path.isfile(value):
+        stat = os.stat(value)
+        return ("file", os.path.abspath(value), stat.st_mtime_ns, stat.st_size)
+    if isinstance(value, (list, tuple)):
+        return tuple(_with_file_stats(v) for v in value)
+    return value
+
+def _remove(path: str) -> bool:
+    """Delete a file, which may have been deleted by an other process.
+
+    Args:
+        path (str): the file.
+
+    Returns:
+        bool: True if the file was deleted by this call.
+    """
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,123 @@
+"""
+fingerprint.py
+
+This module provides the functions computing the keys of the node caches.
+
+A fingerprint is a digest of a value that is stable across processes and runs: arrays are
+hashed from their dtype, shape and bytes, functions from their module, qualified name and
+bytecode, so two module level lambdas (or a function edited between two runs) don't share
+their cache entries.
+
+Functions:
+    value_fingerprint: Digest of a value (e.g. the inputs of a node).
+    function_fingerprint: Digest identifying a node function and its constant arguments.
+    value_nbytes: Memory size of a value, used by the byte budget of the caches.
+"""
+
+import hashlib
+import pickle
+import sys
+import types
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from ..pipeline.deferred_call import DeferredCall
+
+def value_fingerprint(value: Any) -> str:
+    """Digest of a value, equal values have the same digest.
+
+    Args:
+        value (Any): the value, arrays, scalars, strings, bytes, containers of them,
+            functions and picklable objects are supported.
+
+    Raises:
+        TypeError: the value can't be fingerprinted.
+
+    Returns:
+        str: hexadecimal digest.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    _update(hasher, value)
+    return hasher.hexdigest()
+
+def function_fingerprint(func: Callable) -> str:
+    """Digest identifying a node function, its constant arguments included.
+
+    Args:
+        func (Callable): function stored in a node.
+
+    Raises:
+        TypeError: a constant argument can't be fingerprinted.
+
+    Returns:
+        str: hexadecimal digest.
+    """
+    if isinstance(func, DeferredCall):
+        return value_fingerprint((func.func, func.args, func.kwargs))
+    return value_fingerprint(func)
+
+def value_nbytes(value: Any) -> int:
+    """Memory size of a value.
+
+    Args:
+        value (Any): the value, the size of the arrays of lists and tuples is summed.
+
+    Returns:
+        int: number of bytes.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(value_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+def _update(hasher: Any, value: Any) -> None:
+    """Feed a value to a hasher, the type is part of the digest.
+
+    Args:
+        hasher (Any): hashlib hasher.
+        value (Any): the value.
+
+    Raises:
+        TypeError: the value can't be fingerprinted.
+    """
+    hasher.update(type(value).__qualname__.encode())
+    if isinstance(value, np.ndarray):
+        hasher.update(f"{value.dtype.str}{value.shape}".encode())
+        if value.dtype.hasobject:
+            raise TypeError("arrays of objects can't be fingerprinted")
+        hasher.update(np.ascontiguousarray(value).data)
+    elif value is None or isinstance(value, (bool, int, float, complex, str, np.generic)):
+        hasher.update(repr(value).encode())
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        hasher.update(value)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(str(len(value)).encode())
+        for v in value:
+            _update(hasher, v)
+    elif isinstance(value, dict):
+        hasher.update(str(len(value)).encode())
+        for k in sorted(value, key=repr):
+            _update(hasher, k)
+            _update(hasher, value[k])
+    elif isinstance(value, (set, frozenset)):
+        # the iteration order of strings changes with the hash seed of the process
+        hasher.update(str(len(value)).encode())
+        for digest in sorted(value_fingerprint(v) for v in value):
+            hasher.update(digest.encode())
+    elif isinstance(value, types.CodeType):
+        hasher.update(value.co_code)
+        _update(hasher, value.co_consts)
+        _update(hasher, value.co_names)
+    elif callable(value) and hasattr(value, "__qualname__") and "<locals>" not in value.__qualname__:
+        hasher.update(f"{getattr(value, '__module__', '')}.{value.__qualname__}".encode())
+        if isinstance(value, types.FunctionType):
+            # functions with the same name (e.g. lambdas) differ by their code
+            _update(hasher, value.__code__)
+    else:
+        try:
+            hasher.update(pickle.dumps(value))
+        except Exception as e:
+            raise TypeError(f"value of type {type(value)} can't be fingerprinted : {e}")
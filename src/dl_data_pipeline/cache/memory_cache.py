@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from .base_cache import NodeCache, _read_only
+from .fingerprint import value_nbytes
+
+class MemoryCache(NodeCache):
+    """
+    In-memory LRU cache of node values, bounded by the total size of the stored values.
+
+    The size of a value is the `nbytes` of its arrays, so the budget follows the memory
+    actually used whatever the number of entries. When the budget is exceeded, the least
+    recently used values are evicted. Values larger than the whole budget are not stored.
+
+    Arrays are stored as read-only views, as a hit returns the same array to every caller,
+    a function modifying its input in place raises an error instead of corrupting the cache.
+
+    The cache is thread safe. When a pipeline is sent to worker processes, each worker gets
+    an empty cache with the same budget.
+
+    Args:
+        max_bytes (int): maximum total size of the stored values.
+
+    Raises:
+        ValueError: max_bytes is negative.
+
+    Example:
+        >>> cache = MemoryCache(max_bytes=2 * 1024**3)
+        >>> pipeline.set_cache(cache, nodes=[resized_image])
+        >>> for epoch in range(10):
+        >>>     for image in pipeline.map(paths):  # images are decoded and resized once
+        >>>         ...
+        >>> cache.stats
+        {'hits': 90000, 'misses': 10000, 'evictions': 0, 'entries': 10000, 'bytes': 1505280000}
+    """
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__()
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be positive, not {max_bytes}")
+        self.__max_bytes = max_bytes
+        self.__bytes = 0
+        self.__entries: OrderedDict[Any, Tuple[Any, int]] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters of the cache.
+
+        Returns:
+            Dict[str, int]: "hits", "misses", "evictions", "entries" and "bytes" stored.
+        """
+        return {**super().stats, "entries": len(self.__entries), "bytes": self.__bytes}
+
+    def get(self, key: Any) -> Tuple[bool, Any]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self.__entries.move_to_end(key)
+            self._hits += 1
+            return True, entry[0]
+
+    def put(self, key: Any, value: Any) -> Any:
+        size = value_nbytes(value)
+        if size > self.__max_bytes:
+            return value
+        value = _read_only(value)
+
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__bytes -= previous[1]
+            self.__entries[key] = (value, size)
+            self.__bytes += size
+
+            # evict least recently used values
+            while self.__bytes > self.__max_bytes:
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.__bytes -= evicted_size
+                self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Remove every value of the cache."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # values and lock stay in the process
+        state = self.__dict__.copy()
+        state["_MemoryCache__entries"] = OrderedDict()
+        state["_MemoryCache__bytes"] = 0
+        del state["_MemoryCache__lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}("
+                f"max_bytes = {self.__max_bytes}, "
+                f"entries = {len(self.__entries)}, "
+                f"bytes = {self.__bytes})")
@@ -1,6 +1,7 @@
 from functools import wraps
 from contextlib import contextmanager
 from ..pipeline.pipe_node import PipelineNode
+from ..pipeline.deferred_call import DeferredCall, register_batched, register_fused
 
 _DEFERRED_EXECUTION_MODE = True
 
@@ -59,8 +60,8 @@ def _create_pipeline_node(func, *args, **kwargs) -> PipelineNode:
                         "decorator") # TODO change to an other exception
 
     # kw_no_data = {k: v for k, v in kwargs.items() if not isinstance(v, PipeNode)}
-    deferred_func = lambda *data: func(*data, *args_no_data, **kwargs)
-    deferred_func.__name__ = func.__name__
+    # store the call instead of a closure so the node can be pickled
+    deferred_func = DeferredCall(func, args_no_data, kwargs)
     return PipelineNode(deferred_func, parents)
 
 def deferred_execution(func):
@@ -71,6 +72,23 @@ def deferred_execution(func):
     that the function execution should be deferred. When the function is eventually called
     with the actual data, the deferred execution is triggered.
 
+    `async def` functions can be deferred too, their nodes are awaited by `Pipeline.acall`
+    and run to completion by the synchronous execution methods.
+
+    The returned function has a `register_batched` decorator, registering an implementation
+    working on a leading batch axis, used by `Pipeline.call_batch`:
+
+    >>> @image_hwc_to_chw.register_batched
+    >>> def _image_hwc_to_chw_batched(data):
+    >>>     return np.transpose(data, [0, 3, 1, 2])
+
+    It also has a `register_fused` decorator, registering the builder of the call fusing a
+    node of this function with its single consumer, used by `Pipeline` when it's built:
+
+    >>> @open_rgb_image.register_fused(resize_with_max_distortion)
+    >>> def _fuse_open_and_resize(open_call, resize_call):
+    >>>     return DeferredCall(open_and_resize.__wrapped__, resize_call.args, resize_call.kwargs)
+
     Args:
         func (callable): The function to be deferred.
 
@@ -91,4 +109,16 @@ def deferred_execution(func):
         else:
             return func(*args, **kwargs)
 
+    def register(batched_func):
+        register_batched(func, batched_func)
+        return batched_func
+
+    def register_fused_with(consumer):
+        def register_fuse(fuse):
+            register_fused(func, getattr(consumer, "__wrapped__", consumer), fuse)
+            return fuse
+        return register_fuse
+
+    wrapper.register_batched = register
+    wrapper.register_fused = register_fused_with
     return wrapper
@@ -7,6 +7,13 @@ Classes:
     Pipeline: Manages the flow of data from input `PipeNode` objects through a series of operations to produce output `PipeNode` objects. Supports validation and execution of the pipeline.
     PipeNode: A node in a pipeline that can execute a function based on the values of its parent nodes, allowing for deferred execution and modular data processing.
     InputNode: A specialized `PipeNode` that represents the entry point of data into the pipeline, holding initial input values without performing any computation.
+    RunStats: Throughput statistics of a bulk execution of a pipeline (e.g. `Pipeline.map`).
+    NodeHook: Base class of the callbacks notified before and after each node computed by a pipeline.
+    Profiler: A `NodeHook` recording per node wall time, number of calls and size of the outputs.
+    FailedSample: A sample whose execution failed in a bulk execution, with the exception and the failing node.
+    PipelineExecutionError: Exception raised when a node fails during an execution.
+    BackgroundValidation: Bounded queue of outputs validated by a background thread, after the calls returned.
+    BufferPool: Per thread reusable buffers of the intermediate values of the synchronous calls.
 
 Usage Example:
 
@@ -35,8 +42,25 @@ Modules:
     data_pipeline: Contains the `Pipeline` class for managing the data flow in a pipeline.
     pipe_node: Contains the `PipeNode` class, the basic building block for creating data processing graphs.
     input_node: Contains the `InputNode` class, a specialized node for inputting data into the pipeline.
+    run_stats: Contains the `RunStats` class, throughput statistics of a bulk execution.
+    parallel_map: Contains the scheduling helpers used by the bulk execution methods.
+    deferred_call: Contains the `DeferredCall` class, the picklable callable stored in deferred nodes.
+    hooks: Contains the `NodeHook` class and the wrapper notifying hooks around node functions.
+    profiler: Contains the `Profiler` class, the hook recording the cost of each node.
+    failed_sample: Contains the `FailedSample` class, the record of a failed sample of a bulk execution.
+    execution_error: Contains the `PipelineExecutionError` exception.
+    background_validation: Contains the `BackgroundValidation` class, the validation of the outputs off the critical path.
+    buffer_pool: Contains the `BufferPool` class and the registry of the functions accepting an `out` argument.
 """
 
 from .data_pipeline import Pipeline
 from .input_node import InputNode
-from .pipe_node import PipelineNode
\ No newline at end of file
+from .pipe_node import PipelineNode
+from .run_stats import RunStats
+from .deferred_call import DeferredCall
+from .hooks import NodeHook
+from .profiler import Profiler
+from .failed_sample import FailedSample
+from .execution_error import PipelineExecutionError
+from .background_validation import BackgroundValidation
+from .buffer_pool import BufferPool
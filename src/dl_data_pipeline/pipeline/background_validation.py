@@ -0,0 +1,238 @@
+"""
+background_validation.py
+
+This module defines the `BackgroundValidation` class, which runs the validators of a pipeline on a
+background thread, after the outputs have been returned to the caller.
+
+Classes:
+    BackgroundValidation: Bounded queue of outputs validated by a background thread.
+"""
+
+import queue
+import threading
+from collections.abc import Callable, Sequence
+from typing import Any, Dict, List, Tuple
+
+from ..validator import Validator
+
+WHEN_FULL_POLICIES = ("block", "drop")
+
+# outputs of a call to validate: (output index, validators of the output, output value)
+ValidationTask = List[Tuple[int, Sequence[Validator], Any]]
+
+class BackgroundValidation:
+    """
+    Validate the outputs of a pipeline on a background thread, off the critical path of the
+    calls.
+
+    The outputs are put in a bounded queue and validated by a daemon thread started at the
+    first call. When the queue is full, the call waits for a free place ("block", the
+    validation can't fall behind by more than `max_queue` calls) or the outputs aren't
+    validated ("drop", counted in `dropped`).
+
+    A failure is passed to `on_failure(error, output_index)` if it is set. Otherwise the first
+    failure is raised by the next call of the pipeline (or by `join`), and the following ones
+    until then are only counted in `failures`.
+
+    Note:
+        The outputs are validated after they were returned, they must not be modified in
+        place by the caller in the meantime. The callback runs on the background thread.
+
+    Args:
+        max_queue (int, optional): maximum number of calls waiting for their validation.
+            Defaults to 64.
+        on_failure (Callable[[Exception, int], None] | None, optional): called with the
+            error and the output index of each failure. Defaults to None.
+        when_full (str, optional): "block" or "drop". Defaults to "block".
+
+    Raises:
+        ValueError: max_queue is less than 1 or unknown when_full policy.
+
+    Example:
+
+    >>> background = BackgroundValidation(max_queue=128, on_failure=lambda e, i: metrics.increment("invalid"))
+    >>> pipeline.set_background_validation(background)
+    >>> result = pipeline(request)  # returns before the validators ran
+    >>> background.join()  # wait for the queued validations
+    """
+    def __init__(self,
+                 max_queue: int = 64,
+                 on_failure: Callable[[Exception, int], None] | None = None,
+                 when_full: str = "block",
+                 ) -> None:
+        if max_queue < 1:
+            raise ValueError(f"max_queue must be at least 1, not {max_queue}")
+        if when_full not in WHEN_FULL_POLICIES:
+            raise ValueError(f"when_full must be one of {WHEN_FULL_POLICIES}, not {when_full!r}")
+
+        self.__max_queue = max_queue
+        self.__on_failure = on_failure
+        self.__when_full = when_full
+        self.__validated = 0
+        self.__dropped = 0
+        self.__failures = 0
+        self.__init_worker()
+
+    def __init_worker(self) -> None:
+        self.__queue: queue.Queue = queue.Queue(self.__max_queue)
+        self.__lock = threading.Lock()
+        self.__thread: threading.Thread | None = None
+        # thread stopped by `close`, until it took its stop sentinel
+        self.__stopping: threading.Thread | None = None
+        self.__pending: Exception | None = None
+
+    @property
+    def validated(self) -> int:
+        """Number of calls validated so far.
+
+        Returns:
+            int: number of validated calls.
+        """
+        return self.__validated
+
+    @property
+    def dropped(self) -> int:
+        """Number of calls not validated because the queue was full.
+
+        Returns:
+            int: number of dropped calls.
+        """
+        return self.__dropped
+
+    @property
+    def failures(self) -> int:
+        """Number of outputs which didn't validate so far.
+
+        Returns:
+            int: number of failures.
+        """
+        return self.__failures
+
+    @property
+    def pending(self) -> int:
+        """Number of calls waiting for their validation.
+
+        Returns:
+            int: size of the queue.
+        """
+        return self.__queue.qsize()
+
+    def submit(self, task: ValidationTask) -> None:
+        """Queue the outputs of a call for their validation.
+
+        Args:
+            task (ValidationTask): the outputs to validate, with their index and validators.
+        """
+        self.__start_worker()
+        if self.__when_full == "block":
+            self.__queue.put(task)
+            return
+        try:
+            self.__queue.put_nowait(task)
+        except queue.Full:
+            with self.__lock:
+                self.__dropped += 1
+
+    def raise_pending(self) -> None:
+        """Raise the first failure not raised yet, if any.
+
+        Raises:
+            Exception: the error of the validator (e.g. a ValidationError).
+        """
+        with self.__lock:
+            error, self.__pending = self.__pending, None
+        if error is not None:
+            raise error
+
+    def join(self) -> None:
+        """Wait until every queued call is validated, then raise the pending failure.
+
+        Raises:
+            Exception: the first failure not raised yet, if there is no on_failure callback.
+        """
+        self.__queue.join()
+        self.raise_pending()
+
+    def close(self) -> None:
+        """Validate the queued calls and stop the background thread.
+
+        The thread is started again by the next call.
+        """
+        with self.__lock:
+            thread, self.__thread = self.__thread, None
+            if thread is not None:
+                self.__stopping = thread
+        if thread is not None:
+            # the lock isn't held, the put may wait for the worker which takes it
+            self.__queue.put(None)
+            thread.join()
+            with self.__lock:
+                if self.__stopping is thread:
+                    self.__stopping = None
+
+    def __start_worker(self) -> None:
+        """Start the background thread if it isn't running.
+
+        While a closed thread hasn't stopped, no other thread reads the queue, so the stop
+        sentinel is always taken by the closed thread.
+        """
+        while True:
+            with self.__lock:
+                stopping = self.__stopping
+                if stopping is None:
+                    if self.__thread is None:
+                        self.__thread = threading.Thread(target=self.__run, name="pipeline-validation", daemon=True)
+                        self.__thread.start()
+                    return
+            stopping.join()
+            with self.__lock:
+                if self.__stopping is stopping:
+                    self.__stopping = None
+
+    def __run(self) -> None:
+        while True:
+            task = self.__queue.get()
+            try:
+                if task is None:
+                    return
+                self.__validate(task)
+            finally:
+                self.__queue.task_done()
+
+    def __validate(self, task: ValidationTask) -> None:
+        for output_index, validators, output in task:
+            for validator in validators:
+                try:
+                    validator.validate(output)
+                except Exception as e:
+                    self.__fail(e, output_index)
+                    break
+        with self.__lock:
+            self.__validated += 1
+
+    def __fail(self, error: Exception, output_index: int) -> None:
+        with self.__lock:
+            self.__failures += 1
+            if self.__on_failure is None and self.__pending is None:
+                self.__pending = error
+        if self.__on_failure is not None:
+            try:
+                self.__on_failure(error, output_index)
+            except Exception as e:
+                # an error of the callback itself is raised by the next call
+                with self.__lock:
+                    if self.__pending is None:
+                        self.__pending = e
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the copy (e.g. in a worker process) starts its own thread with an empty queue
+        return {"max_queue": self.__max_queue,
+                "on_failure": self.__on_failure,
+                "when_full": self.__when_full}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["max_queue"], state["on_failure"], state["when_full"])
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(max_queue = {self.__max_queue}, when_full = {self.__when_full!r}, "
+                f"validated = {self.__validated}, dropped = {self.__dropped}, failures = {self.__failures})")
@@ -0,0 +1,229 @@
+"""
+buffer_pool.py
+
+This module defines the `BufferPool` class, which gives the nodes of a pipeline reusable output
+arrays, so that the synchronous executions stop allocating their intermediate values once the
+buffers of every shape met are allocated.
+
+Functions registered with `register_buffered` accept an `out` argument which is either an array or
+an allocator `(shape, dtype) -> array`, and always write their result in it. The pipeline passes
+them the allocator of their node.
+
+Classes:
+    BufferPool: Per thread buffers of the intermediate values of a pipeline.
+    SlotAllocator: Allocator of the output buffers of a node.
+
+Functions:
+    register_buffered: Register a function accepting an `out` array or allocator.
+    is_buffered: Check if a node function accepts an `out` array or allocator.
+    resolve_out: Get the output array of a buffered function.
+    pooled_call: Call of a buffered function with the allocator of its output.
+"""
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from .deferred_call import DeferredCall
+
+# functions accepting an `out` argument, array or allocator `(shape, dtype) -> array`
+_BUFFERED_FUNCTIONS = set()
+
+Allocator = Callable[[Tuple[int, ...], np.dtype], np.ndarray]
+
+def register_buffered(func: Callable) -> Callable:
+    """Register a function accepting an `out` argument, an array or an allocator.
+
+    Given an `out` argument, the function must write its result in the array (or in the
+    array returned by the allocator) and return it, never a view of its inputs.
+
+    Args:
+        func (Callable): the function.
+
+    Returns:
+        Callable: the function.
+    """
+    _BUFFERED_FUNCTIONS.add(func)
+    return func
+
+def is_buffered(func: Callable | None) -> bool:
+    """Check if a node function accepts an `out` array or allocator.
+
+    Args:
+        func (Callable | None): function stored in a node.
+
+    Returns:
+        bool: True if the node is a `DeferredCall` of a buffered function, without `out`
+            argument set by the user.
+    """
+    return (isinstance(func, DeferredCall) and func.func in _BUFFERED_FUNCTIONS
+            and "out" not in func.kwargs)
+
+def resolve_out(out: np.ndarray | Allocator | None, shape: Tuple[int, ...], dtype: Any) -> np.ndarray | None:
+    """Get the output array of a buffered function.
+
+    Args:
+        out (np.ndarray | Allocator | None): the `out` argument of the function.
+        shape (Tuple[int, ...]): shape of the result.
+        dtype (Any): dtype of the result, used by the allocators.
+
+    Raises:
+        ValueError: out is an array of an other shape.
+
+    Returns:
+        np.ndarray | None: the array receiving the result, None if out is None.
+    """
+    if out is None:
+        return None
+    if callable(out):
+        return out(tuple(shape), np.dtype(dtype))
+    if out.shape != tuple(shape):
+        raise ValueError(f"out has shape {out.shape}, the result has shape {tuple(shape)}")
+    return out
+
+class BufferPool:
+    """
+    Reusable output arrays of the intermediate nodes of a pipeline.
+
+    Each thread has its own buffers, one per node and per shape and dtype met, so a buffer
+    is reused by the next call of the thread, once the value it holds is released. The
+    outputs of the pipeline are never pooled, they are given to the caller.
+
+    A pool can be shared by several pipelines, even nested ones (`as_deferred`), the buffers
+    of a node are identified by the pipeline and the slot of the node.
+
+    Args:
+        max_buffers_per_node (int, optional): number of (shape, dtype) buffers kept per node
+            and per thread, the least recently used is dropped beyond. Defaults to 4.
+
+    Raises:
+        ValueError: max_buffers_per_node is less than 1.
+
+    Example:
+
+    >>> pool = BufferPool()
+    >>> pipeline.set_buffer_pool(pool)
+    >>> for path in paths:
+    >>>     pipeline(path)
+    >>> pool.allocations, pool.reuses
+    (3, 2997)
+    """
+    def __init__(self, max_buffers_per_node: int = 4) -> None:
+        if max_buffers_per_node < 1:
+            raise ValueError(f"max_buffers_per_node must be at least 1, not {max_buffers_per_node}")
+        self.__max_buffers = max_buffers_per_node
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__allocations = 0
+        self.__reuses = 0
+
+    @property
+    def allocations(self) -> int:
+        """Number of buffers allocated so far, by every thread.
+
+        Returns:
+            int: number of allocations.
+        """
+        return self.__allocations
+
+    @property
+    def reuses(self) -> int:
+        """Number of times a buffer was reused so far, by every thread.
+
+        Returns:
+            int: number of reuses.
+        """
+        return self.__reuses
+
+    def allocator(self, node_key: Hashable) -> "SlotAllocator":
+        """Allocator of the output buffers of a node.
+
+        Args:
+            node_key (Hashable): identity of the node, unique among the pipelines sharing
+                the pool, e.g. `(owner, slot)`.
+
+        Returns:
+            SlotAllocator: the allocator.
+        """
+        return SlotAllocator(self, node_key)
+
+    def get(self, node_key: Hashable, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """Buffer of a node for the current thread, allocated if it doesn't exist.
+
+        Args:
+            node_key (Hashable): identity of the node, see `allocator`.
+            shape (Tuple[int, ...]): shape of the buffer.
+            dtype (np.dtype): dtype of the buffer.
+
+        Returns:
+            np.ndarray: the buffer, its content is undefined.
+        """
+        buffers: Dict[Hashable, Dict[Tuple[Tuple[int, ...], np.dtype], np.ndarray]] = getattr(self.__local, "buffers", None)
+        if buffers is None:
+            buffers = self.__local.buffers = {}
+        node_buffers = buffers.setdefault(node_key, {})
+
+        key = (shape, dtype)
+        buffer = node_buffers.pop(key, None)
+        if buffer is None:
+            buffer = np.empty(shape, dtype)
+            if len(node_buffers) >= self.__max_buffers:
+                # dicts keep the insertion order, the first one is the least recently used
+                del node_buffers[next(iter(node_buffers))]
+            with self.__lock:
+                self.__allocations += 1
+        else:
+            with self.__lock:
+                self.__reuses += 1
+        node_buffers[key] = buffer
+        return buffer
+
+    def nbytes(self) -> int:
+        """Size of the buffers of the current thread.
+
+        Returns:
+            int: number of bytes.
+        """
+        buffers = getattr(self.__local, "buffers", {})
+        return sum(buffer.nbytes for node_buffers in buffers.values() for buffer in node_buffers.values())
+
+    def clear(self) -> None:
+        """Free the buffers of the current thread.
+        """
+        self.__local.buffers = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # buffers aren't sent to the worker processes, they allocate their own
+        return {"max_buffers_per_node": self.__max_buffers}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["max_buffers_per_node"])
+
+class SlotAllocator:
+    """
+    Allocator `(shape, dtype) -> array` of the output buffers of a node.
+
+    Args:
+        pool (BufferPool): the pool of the buffers.
+        node_key (Hashable): identity of the node, see `BufferPool.allocator`.
+    """
+    def __init__(self, pool: BufferPool, node_key: Hashable) -> None:
+        self.__pool = pool
+        self.__node_key = node_key
+
+    def __call__(self, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        return self.__pool.get(self.__node_key, shape, dtype)
+
+def pooled_call(func: DeferredCall, allocator: Allocator) -> DeferredCall:
+    """Call of a buffered function with the allocator of its output.
+
+    Args:
+        func (DeferredCall): the call of a buffered function.
+        allocator (Allocator): allocator passed as `out` argument.
+
+    Returns:
+        DeferredCall: the call, with `out=allocator`.
+    """
+    return DeferredCall(func.func, func.args, {**func.kwargs, "out": allocator}, func.__name__)
@@ -12,11 +12,34 @@ Classes:
               to produce output `PipeNode` objects. Supports validation and execution of the pipeline.
 """
 
-from collections.abc import Callable
+import operator
+import os
+import random
+from collections.abc import Callable, Generator, Iterable, Sequence
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Any, Tuple, Dict
+
+import numpy as np
+
 from .pipe_node import PipelineNode
+from .deferred_call import DeferredCall, SyncCall, is_async_call, fuse_calls
+from .parallel_map import iter_chunks, imap_bounded, create_executor
+from .run_stats import RunStats
+from .hooks import NodeHook, HookedCall
+from .profiler import Profiler
+from .execution_error import PipelineExecutionError
+from .failed_sample import FailedSample, ERROR_POLICIES
+from .background_validation import BackgroundValidation
+from .buffer_pool import BufferPool, is_buffered, pooled_call
 
-from ..validator import Validator
+from ..validator import (
+    Validator, MinMaxValidator, MeanVarValidator, StatisticsValidator, SampledValidator, BatchValidationError)
+from ..cache import NodeCache, CachedCall
+
+# steps (func, get_inputs, unpack, output_slot, release_slots) executed by the synchronous calls
+RunnablePlan = List[Tuple[Callable, Callable, bool, int, Tuple[int, ...]]]
 
 class Pipeline:
     """
@@ -30,6 +53,17 @@ class Pipeline:
             that serve as the inputs to the pipeline.
         outputs (PipeNode | list[PipeNode]): A single `PipeNode` or a list of `PipeNode` objects
             that serve as the outputs of the pipeline.
+        merge_duplicates (bool, optional): Compute only once the nodes applying the same function
+            to the same parents with equal constant arguments (e.g. an image opened twice).
+            Only enable it if the duplicated functions are deterministic, two calls of a
+            random augmentation on the same input would return the same view. Defaults to False.
+        fuse_nodes (bool, optional): Compute a node and its single parent with one fused call
+            when their functions have a fused implementation (registered with
+            `register_fused`, e.g. `open_rgb_image` followed by `resize_with_max_distortion`
+            decodes the image at a reduced resolution). The parent must not be an output.
+            The fused call may give slightly different values (e.g. the reduced decoding
+            of a JPEG), the parent isn't computed anymore so it can't be cached, and the
+            hooks and the errors report the child node. Defaults to False.
 
     Raises:
         ValueError: If `inputs` or `outputs` is not a `PipeNode` or a list of `PipeNode`.
@@ -48,7 +82,12 @@ class Pipeline:
     >>> # Execute the pipeline
     >>> result = pipeline(input_data)
     """
-    def __init__(self, inputs: PipelineNode | list[PipelineNode], outputs: PipelineNode | list[PipelineNode]) -> None:
+    def __init__(self,
+                 inputs: PipelineNode | list[PipelineNode],
+                 outputs: PipelineNode | list[PipelineNode],
+                 merge_duplicates: bool = False,
+                 fuse_nodes: bool = False,
+                 ) -> None:
         if not (isinstance(inputs, PipelineNode) or (isinstance(inputs, list) and all(isinstance(x, PipelineNode) for x in inputs))):
             raise TypeError("inputs must be a PipeNode or a list of PipeNode")
 
@@ -58,6 +97,10 @@ class Pipeline:
         self.__inputs = inputs if isinstance(inputs, list) else [inputs]
         self.__outputs = outputs if isinstance(outputs, list) else [outputs]
         self.__validators: list[list[Validator]] = [[] for _ in range(len(self.__outputs))]
+        # validators run on each output, with the statistics validators fused
+        self.__run_validators: list[list[Validator]] = [[] for _ in range(len(self.__outputs))]
+        # validates the outputs of the single calls after they returned, if set
+        self.__background: BackgroundValidation | None = None
 
         # init an exec graph
         exec_graph: list[PipelineNode] = []
@@ -74,32 +117,619 @@ class Pipeline:
 
         # build the actual graph
         build_topo(virtual_node)
-        self.__exec_graph = exec_graph[:-1] # remove the last ghost node
+        exec_graph = exec_graph[:-1] # remove the last ghost node
+        self.__num_nodes = len(exec_graph)
+
+        # merge the nodes computing the same function of the same parents
+        # with equal constant arguments, each node maps to the one computed
+        canonical = _merge_duplicates(exec_graph) if merge_duplicates else {node: node for node in exec_graph}
+        self.__exec_graph = [node for node in exec_graph if canonical[node] is node]
+
+        # each node gets a slot (its topological position), values of a call
+        # are stored in a list indexed by these slots instead of in the nodes,
+        # so a single pipeline can be called from several threads at once
+        slots = {node: i for i, node in enumerate(self.__exec_graph)}
+        slots.update({node: slots[canonical[node]] for node in exec_graph})
+        self.__node_slots = slots
+        self.__parent_slots = [[slots[p] for p in node.parent] for node in self.__exec_graph]
+        self.__input_slots = [slots.get(node) for node in self.__inputs] # unused inputs have no slot
+        self.__output_slots = [slots[node] for node in self.__outputs]
+
+        # function computed in each slot, None for the nodes holding a value (e.g. inputs),
+        # async functions are run to completion when the graph is executed synchronously
+        self.__funcs = [node.func if len(parent_slots) != 0 else None
+                        for node, parent_slots in zip(self.__exec_graph, self.__parent_slots)]
+
+        # a node computed from its single parent with a fused call reads the parents of the
+        # parent, which isn't computed anymore, each fused parent maps to the slot computing it
+        self.__fused_slots = _fuse_chains(self.__funcs, self.__parent_slots, set(self.__output_slots)) if fuse_nodes else {}
+        self.__uncached_funcs = [SyncCall(func) if is_async_call(func) else func for func in self.__funcs]
+        self.__cached_funcs = list(self.__uncached_funcs)
+
+        # functions actually called, the cached ones wrapped by the hooks if any, the plans
+        # of the synchronous calls write the intermediate values in the buffers of the pool
+        self.__hooks: List[NodeHook] = []
+        self.__pool: BufferPool | None = None
+        # identity of the pipeline in the keys of the buffers, a pool can be shared with other
+        # pipelines (e.g. a nested one computed while a buffer of this one holds a value)
+        self.__pool_owner = object()
+        self.__sync_funcs = list(self.__cached_funcs)
+        self.__plan_funcs = list(self.__cached_funcs)
+
+        # children of each slot, used to schedule nodes as soon as their parents are done
+        self.__unique_parent_slots = [sorted(set(parent_slots)) for parent_slots in self.__parent_slots]
+        self.__children_slots: list[list[int]] = [[] for _ in self.__exec_graph]
+        for slot, parent_slots in enumerate(self.__unique_parent_slots):
+            for parent_slot in parent_slots:
+                self.__children_slots[parent_slot].append(slot)
+
+        # executed by the synchronous calls, one plan per requested subset of outputs
+        self.__output_slot_set = set(self.__output_slots)
+        self.__plans: Dict[Tuple[int, ...] | None, RunnablePlan] = {}
+        self.__plans[None] = _runnable_plan(self.compile())
+
+        # executed by `call_batch`, batched implementation of each slot if it has one
+        self.__unhooked_batched_funcs = [func.batched if isinstance(func, DeferredCall) else None for func in self.__funcs]
+        self.__batched_funcs = list(self.__unhooked_batched_funcs)
+        self.__batch_plans: Dict[Tuple[int, ...] | None, List[Tuple[Callable, Tuple[int, ...], int, Tuple[int, ...]]]] = {}
+
+    def compile(self, outputs: Sequence[int] | None = None) -> List[Tuple[Callable, Tuple[int, ...], int, Tuple[int, ...]]]:
+        """Build the flat execution plan run by the synchronous calls.
+
+        Each step of the plan is a tuple `(func, input_slots, output_slot, release_slots)`:
+        `func` is called with the values of `input_slots` of the execution context, the result
+        is stored in `output_slot`, then the values of `release_slots` (which have no consumer
+        left) are freed. Nodes without computation (e.g. inputs) have no step.
 
-    def add_validator(self, validator: Validator, output_index: int) -> None:
+        Plans are built once (when the pipeline is created, or at the first call requesting
+        a subset of outputs), and executed by a tight loop without per node method calls or
+        attribute lookups (the input slots are read with a precomputed `operator.itemgetter`).
+
+        Args:
+            outputs (Sequence[int] | None, optional): indices of the outputs to compute, only
+                their ancestors are part of the plan. Defaults to all the outputs.
+
+        Raises:
+            IndexError: an output index is out of bound for outputs list.
+
+        Returns:
+            List[Tuple[Callable, Tuple[int, ...], int, Tuple[int, ...]]]: the steps in
+                topological order.
+        """
+        return self._compile(outputs, self.__plan_funcs)
+
+    def _compile(self,
+                 outputs: Sequence[int] | None,
+                 funcs: List[Callable | None],
+                 ) -> List[Tuple[Callable, Tuple[int, ...], int, Tuple[int, ...]]]:
+        """Build the execution plan calling `funcs`, see `compile`.
+
+        Args:
+            outputs (Sequence[int] | None): indices of the outputs to compute.
+            funcs (List[Callable | None]): function called for each slot.
+
+        Returns:
+            List[Tuple[Callable, Tuple[int, ...], int, Tuple[int, ...]]]: the steps in
+                topological order.
+        """
+        output_slots = [self.__output_slots[i] for i in self._output_indices(outputs)]
+
+        # ancestors of the requested outputs
+        needed = set(output_slots)
+        for slot in range(len(self.__exec_graph) - 1, -1, -1):
+            if slot in needed:
+                needed.update(self.__unique_parent_slots[slot])
+
+        # last use of each value in the topological order, intermediate values are freed
+        # as soon as their last consumer is computed (e.g. a decoded image once it's resized)
+        release_after: List[List[int]] = [[] for _ in self.__exec_graph]
+        for slot in sorted(needed):
+            consumers = [child for child in self.__children_slots[slot] if child in needed]
+            if len(consumers) != 0 and slot not in output_slots:
+                release_after[max(consumers)].append(slot)
+
+        return [(func, tuple(parent_slots), slot, tuple(release_after[slot]))
+                for slot, (func, parent_slots) in enumerate(zip(funcs, self.__parent_slots))
+                if func is not None and slot in needed]
+
+    def optimization_report(self) -> Dict[str, int]:
+        """Report of the optimizations applied on the graph when the pipeline was built.
+
+        Returns:
+            Dict[str, int]: "nodes" in the graph, "merged_nodes" removed as duplicates,
+                "fused_nodes" computed by the fused call of their child and "executed_nodes"
+                computed at each call.
+        """
+        return {"nodes": self.__num_nodes,
+                "merged_nodes": self.__num_nodes - len(self.__exec_graph),
+                "fused_nodes": len(self.__fused_slots),
+                "executed_nodes": sum(func is not None for func in self.__funcs)}
+
+    def set_cache(self, cache: NodeCache | None, nodes: PipelineNode | list[PipelineNode] | None = None) -> None:
+        """Cache the values of some nodes, or of every node of the pipeline.
+
+        Before computing a cached node, its value is looked for in the cache with the identity
+        of the node function and a fingerprint of its input values. Only deterministic nodes
+        should be cached, e.g. the decoding and resizing of an image read again at each epoch.
+
+        Args:
+            cache (NodeCache | None): the cache, None to stop caching the nodes.
+            nodes (PipelineNode | list[PipelineNode] | None, optional): nodes to cache.
+                Defaults to every node computed by the pipeline.
+
+        Raises:
+            TypeError: Not a NodeCache type.
+            ValueError: a node isn't computed by the pipeline, was fused with its consumer,
+                or its function can't be identified by the cache (e.g. a local function or a
+                constant argument that can't be fingerprinted by a `DiskCache`).
+
+        Example:
+
+        >>> cache = MemoryCache(max_bytes=2 * 1024**3)
+        >>> pipeline.set_cache(cache, nodes=[resized_image])
+        """
+        if cache is not None and not isinstance(cache, NodeCache):
+            raise TypeError(f"cache must be NodeCache type, not {type(cache)}")
+
+        if nodes is None:
+            slots = [slot for slot, func in enumerate(self.__funcs) if func is not None]
+        else:
+            nodes = nodes if isinstance(nodes, list) else [nodes]
+            slots = []
+            for node in nodes:
+                slot = self.__node_slots.get(node)
+                if slot in self.__fused_slots:
+                    raise ValueError(f"{node} was fused with its consumer {self.__exec_graph[self.__fused_slots[slot]]}, "
+                                     "build the pipeline with fuse_nodes=False to cache it")
+                if slot is None or self.__funcs[slot] is None:
+                    raise ValueError(f"{node} isn't computed by the pipeline")
+                slots.append(slot)
+
+        cached_funcs = list(self.__cached_funcs)
+        for slot in slots:
+            func = self.__uncached_funcs[slot]
+            try:
+                cached_funcs[slot] = func if cache is None else CachedCall(func, cache)
+            except TypeError as e:
+                raise ValueError(f"{self.__exec_graph[slot]} can't be cached : {e}") from e
+        self.__cached_funcs = cached_funcs
+        self._update_funcs()
+
+    def add_hook(self, hook: NodeHook) -> None:
+        """Notify a hook before and after the computation of each node.
+
+        The node functions are wrapped only while hooks are attached, a pipeline without
+        hooks runs its plain execution plan. Async nodes awaited by `acall` aren't notified.
+
+        Args:
+            hook (NodeHook): the hook.
+
+        Raises:
+            TypeError: Not a NodeHook type.
+        """
+        if not isinstance(hook, NodeHook):
+            raise TypeError(f"hook must be NodeHook type, not {type(hook)}")
+        self.__hooks.append(hook)
+        self._update_funcs()
+
+    def remove_hook(self, hook: NodeHook) -> None:
+        """Stop notifying a hook.
+
+        Args:
+            hook (NodeHook): a hook added with `add_hook`.
+
+        Raises:
+            ValueError: the hook isn't attached to the pipeline.
+        """
+        if hook not in self.__hooks:
+            raise ValueError(f"{hook} isn't attached to the pipeline")
+        self.__hooks.remove(hook)
+        self._update_funcs()
+
+    @contextmanager
+    def profile(self) -> Generator[Profiler, None, None]:
+        """Record the cost of each node while the context is open.
+
+        Yields:
+            Profiler: the profiler, read it with `report()` or `table()`.
+
+        Example:
+
+        >>> with pipeline.profile() as profiler:
+        >>>     for result in pipeline.map(paths, workers=8):
+        >>>         ...
+        >>> print(profiler.table())
+        node                         calls  total (ms)  mean (ms)  mean bytes            shape
+        ------------------------------------------------------------------------------------
+        1:open_rgb_image              1000    4210.337      4.210     6220800  (1080, 1920, 3)
+        2:resize_with_max_distortion  1000     391.521      0.392      150528    (224, 224, 3)
+        """
+        profiler = Profiler(self.__exec_graph)
+        self.add_hook(profiler)
+        try:
+            yield profiler
+        finally:
+            self.remove_hook(profiler)
+
+    def set_buffer_pool(self, pool: BufferPool | None) -> None:
+        """Write the intermediate values of the synchronous calls in reusable buffers.
+
+        A node gets a buffer of the pool if its function accepts an `out` argument (registered
+        with `register_buffered`, e.g. `padding_2d`, `rpad_rcut`, the pooling functions), if
+        it isn't cached nor an output, and if all its consumers accept an `out` argument
+        too, so none of them returns a view of the buffer. The consumers which aren't
+        pooled write in a new array, e.g. `image_hwc_to_chw` returns a contiguous copy
+        instead of a view. Once a buffer of each shape is allocated, the calls of a thread
+        don't allocate the values of these nodes anymore.
+
+        The buffers are used by `__call__`, `map` and `stream`. `call_parallel`, `acall` and
+        `call_batch` allocate new values.
+
+        Args:
+            pool (BufferPool | None): the pool, None to stop using buffers.
+
+        Raises:
+            TypeError: Not a BufferPool type.
+
+        Example:
+
+        >>> pool = BufferPool()
+        >>> pipeline.set_buffer_pool(pool)
+        >>> results = list(pipeline.map(paths, workers=8))
+        """
+        if pool is not None and not isinstance(pool, BufferPool):
+            raise TypeError(f"pool must be BufferPool type, not {type(pool)}")
+        self.__pool = pool
+        self._update_funcs()
+
+    def _pooled_funcs(self, pool: BufferPool) -> List[Callable | None]:
+        """Node functions writing their values in the buffers of a pool, see `set_buffer_pool`.
+
+        Args:
+            pool (BufferPool): the pool.
+
+        Returns:
+            List[Callable | None]: function of each slot.
+        """
+        funcs = list(self.__cached_funcs)
+        buffered = [is_buffered(func) and func is uncached
+                    for func, uncached in zip(self.__cached_funcs, self.__uncached_funcs)]
+        pooled = [buffered[slot] and slot not in self.__output_slot_set and len(children) != 0
+                  and all(buffered[child] for child in children)
+                  for slot, children in enumerate(self.__children_slots)]
+
+        for slot, func in enumerate(funcs):
+            if pooled[slot]:
+                funcs[slot] = pooled_call(func, pool.allocator((self.__pool_owner, slot)))
+            elif buffered[slot] and any(pooled[parent] for parent in self.__unique_parent_slots[slot]):
+                # copy out of the buffer of the parent instead of returning a view of it
+                funcs[slot] = pooled_call(func, np.empty)
+        return funcs
+
+    def _update_funcs(self) -> None:
+        """Wrap the node functions with the attached hooks and rebuild the plans."""
+        hooks = tuple(self.__hooks)
+        plan_funcs = self.__cached_funcs if self.__pool is None else self._pooled_funcs(self.__pool)
+        if len(hooks) == 0:
+            self.__sync_funcs = list(self.__cached_funcs)
+            self.__plan_funcs = list(plan_funcs)
+            self.__batched_funcs = list(self.__unhooked_batched_funcs)
+        else:
+            self.__sync_funcs = [HookedCall(func, node, hooks) if func is not None else None
+                                 for func, node in zip(self.__cached_funcs, self.__exec_graph)]
+            self.__plan_funcs = [HookedCall(func, node, hooks) if func is not None else None
+                                 for func, node in zip(plan_funcs, self.__exec_graph)]
+            self.__batched_funcs = [HookedCall(func, node, hooks) if func is not None else None
+                                    for func, node in zip(self.__unhooked_batched_funcs, self.__exec_graph)]
+
+        # rebuild the plans with the new functions
+        self.__plans = {None: _runnable_plan(self.compile())}
+        self.__batch_plans = {}
+
+    def add_validator(self,
+                      validator: Validator,
+                      output_index: int,
+                      every_n: int | None = None,
+                      fraction: float | None = None,
+                      element_stride: int | None = None,
+                      seed: int | None = None,
+                      ) -> Validator:
         """Add a validator for an output
 
+        A `MinMaxValidator` and a `MeanVarValidator` of the same output are run as a single
+        `StatisticsValidator`, which reads the data once.
+
+        With a sampling argument, the validator is wrapped in a `SampledValidator` which
+        runs it on a subset of the calls or of the elements, and counts the validated and
+        skipped calls.
+
         Args:
             validator (Validator): validator object.
             output_index (int): index of the output to validate.
+            every_n (int | None, optional): validate one call every `every_n` calls.
+                Defaults to None.
+            fraction (float | None, optional): probability of validating a call.
+                Defaults to None.
+            element_stride (int | None, optional): validate one element every
+                `element_stride` elements of the arrays. Defaults to None.
+            seed (int | None, optional): seed of the random sampling. Defaults to None.
 
         Raises:
             TypeError: Not a Validator type.
             IndexError: Index is out of bound for outputs list.
+            ValueError: invalid sampling arguments.
+
+        Returns:
+            Validator: the validator attached to the output, the `SampledValidator` if
+                sampled, to read its counters.
+
+        Example:
+
+        >>> sampled = pipeline.add_validator(MinMaxValidator(0, 1), 0, fraction=0.01)
+        >>> ...
+        >>> print(sampled.validated, sampled.skipped)
         """
         if not isinstance(validator, Validator):
             raise TypeError(f"validator must be Validator type, not {type(validator)}")
         if output_index >= len(self.__outputs) or output_index < 0:
             raise IndexError(f"output_index isn't included in [0, len(outputs)[")
 
+        if every_n is not None or fraction is not None or element_stride is not None:
+            validator = SampledValidator(validator, every_n, fraction, element_stride, seed)
+
         self.__validators[output_index].append(validator)
+        self.__run_validators[output_index] = _fuse_validators(self.__validators[output_index])
+        return validator
+
+    def set_background_validation(self, background: BackgroundValidation | None) -> None:
+        """Validate the outputs of the single calls on a background thread.
+
+        `__call__`, `call_parallel` and `acall` return their outputs without waiting for the
+        validators, the outputs are validated by `background`. A failure goes to its
+        `on_failure` callback, or is raised by the next call. The bulk executions (`map`,
+        `stream`, `call_batch`) keep validating each sample before returning it, so their
+        error policies apply to the validation errors.
+
+        Args:
+            background (BackgroundValidation | None): the background validation, None to
+                validate before returning again. The previous one isn't joined.
+
+        Raises:
+            TypeError: Not a BackgroundValidation type.
+
+        Example:
+
+        >>> background = BackgroundValidation(max_queue=256, on_failure=report_invalid)
+        >>> pipeline.set_background_validation(background)
+        """
+        if background is not None and not isinstance(background, BackgroundValidation):
+            raise TypeError(f"background must be BackgroundValidation type, not {type(background)}")
+        self.__background = background
 
 
 
-    def __call__(self, *args: Any) -> Any:
+    def __call__(self, *args: Any, outputs: Sequence[int] | None = None) -> Any:
         """Init the input node of the graph, execute in topological order
         and return the output nodes.
 
+        If `outputs` is given, only the nodes needed by these outputs are computed, and only
+        their validators are run. The pruned plan is built at the first call and cached for
+        each subset of outputs.
+
+        Args:
+            *args (Any): values of the input nodes.
+            outputs (Sequence[int] | None, optional): indices of the outputs to compute.
+                Defaults to all the outputs.
+
+        Raises:
+            ValueError: args isn't same length as input length.
+            IndexError: an output index is out of bound for outputs list.
+            ValidationError: schema of output doesn't validate the output, or of the output
+                of a previous call with background validation.
+            RuntimeError: a node produced a runtime error.
+
+        Returns:
+            Any: output of the graph, the requested outputs in the requested order.
+
+        Example:
+
+        >>> pipeline = Pipeline(inp, [features, thumbnail, label])
+        >>> features = pipeline(path, outputs=[0])  # thumbnail and label aren't computed
+        """
+        return self._call(args, outputs, self.__background)
+
+    def _call(self,
+              args: Tuple[Any, ...],
+              outputs: Sequence[int] | None = None,
+              background: BackgroundValidation | None = None,
+              ) -> Any:
+        """Execute the graph for one call, see `__call__`.
+
+        Args:
+            args (Tuple[Any, ...]): values of the input nodes.
+            outputs (Sequence[int] | None, optional): indices of the outputs to compute.
+                Defaults to all the outputs.
+            background (BackgroundValidation | None, optional): validates the outputs after
+                they are returned. Defaults to None, validated before.
+
+        Returns:
+            Any: output of the graph.
+        """
+        self._check_args(args)
+        if background is not None:
+            background.raise_pending()
+
+        # excecute
+        key = tuple(outputs) if outputs is not None else None
+        plan = self.__plans.get(key)
+        if plan is None:
+            plan = self.__plans[key] = _runnable_plan(self.compile(key))
+        context = self._execute(args, plan)
+        return self._collect_outputs(context, key, background)
+
+    def call_batch(self,
+                   *args: Any,
+                   outputs: Sequence[int] | None = None,
+                   on_error: str = "raise",
+                   quarantine: List[FailedSample] | None = None,
+                   ) -> Any:
+        """Execute the graph on a batch of samples at once.
+
+        Each input is a batch: an array with a leading batch axis, or a sequence of samples
+        (e.g. a list of paths). Nodes whose function has a batched implementation (registered
+        with `register_batched`) are computed with one call on the stacked values, the others
+        with a loop over the samples. Results of the loops are stacked in an array if they are
+        arrays of the same shape and dtype, and kept as a list otherwise.
+
+        Node caches only apply to the nodes computed with a loop over the samples.
+
+        If the batch fails with an error policy other than "raise", the samples are executed
+        again one by one to isolate the failed ones, see `Pipeline.map`.
+
+        Args:
+            *args (Any): batches of values of the input nodes, of the same length.
+            outputs (Sequence[int] | None, optional): indices of the outputs to compute.
+                Defaults to all the outputs.
+            on_error (str, optional): "raise", "skip" or "sentinel", see `Pipeline.map`.
+                Defaults to "raise".
+            quarantine (List[FailedSample] | None, optional): list receiving the failed
+                samples. Defaults to None.
+
+        Raises:
+            ValueError: args isn't same length as input length, the batches don't have
+                the same length or unknown error policy.
+            IndexError: an output index is out of bound for outputs list.
+            BatchValidationError: schema of output samples doesn't validate, with the
+                indices of the failing samples.
+            PipelineExecutionError: a node produced a runtime error.
+
+        Returns:
+            Any: batched outputs of the graph, a list if a failed sample is replaced by its
+                `FailedSample`.
+
+        Example:
+
+        >>> crops = np.stack([...])  # (256, 200, 200, 3)
+        >>> batch = pipeline.call_batch(crops)  # (256, 3, 112, 112)
+        """
+        self._check_args(args)
+        _check_error_policy(on_error)
+        if len(set(len(arg) for arg in args)) > 1:
+            raise ValueError(f"batches must have the same length, not {[len(arg) for arg in args]}")
+
+        key = tuple(outputs) if outputs is not None else None
+        if on_error == "raise":
+            return self._execute_batch(args, key)
+        try:
+            return self._execute_batch(args, key)
+        except Exception:
+            pass
+
+        # execute the samples one by one to isolate the failed ones
+        items = list(zip(*args)) if len(args) > 1 else list(args[0])
+        results = self._call_chunk(items, "sentinel", key)
+        if quarantine is not None:
+            quarantine.extend(result for result in results if isinstance(result, FailedSample))
+        if on_error == "skip":
+            results = [result for result in results if not isinstance(result, FailedSample)]
+
+        # same layout as a batch execution, failed samples can't be stacked
+        if len(self._output_indices(key)) == 1:
+            return _stack(results)
+        return [_stack([result if isinstance(result, FailedSample) else result[i] for result in results])
+                for i in range(len(self._output_indices(key)))]
+
+    def _execute_batch(self, args: Tuple[Any, ...], key: Tuple[int, ...] | None) -> Any:
+        """Execute the graph on a batch, see `Pipeline.call_batch`.
+
+        Args:
+            args (Tuple[Any, ...]): batches of values of the input nodes.
+            key (Tuple[int, ...] | None): indices of the outputs to compute, None for all.
+
+        Raises:
+            BatchValidationError: schema of output samples doesn't validate.
+            PipelineExecutionError: a node produced a runtime error.
+
+        Returns:
+            Any: batched outputs of the graph.
+        """
+        plan = self.__batch_plans.get(key)
+        if plan is None:
+            plan = self.__batch_plans[key] = self._compile(key, self.__sync_funcs)
+
+        context = self._new_context(args)
+        for func, input_slots, output_slot, release_slots in plan:
+            inputs = [context[i] for i in input_slots]
+            batched_func = self.__batched_funcs[output_slot]
+            try:
+                if batched_func is not None and all(isinstance(value, np.ndarray) for value in inputs):
+                    context[output_slot] = batched_func(*inputs)
+                else:
+                    context[output_slot] = _stack([func(*sample) for sample in zip(*inputs)])
+            except Exception as e:
+                raise self._node_error(output_slot, e) from e
+
+            for released in release_slots:
+                context[released] = None
+
+        return self._collect_batch_outputs(context, key)
+
+    def call_parallel(self, *args: Any, executor: Executor | None = None, workers: int | None = None) -> Any:
+        """Execute the graph for one sample, running independent branches concurrently.
+
+        A node is submitted to the executor as soon as all its parents are computed, so
+        branches that don't depend on each other (e.g. an image branch and an audio branch
+        of a multi-input model) overlap. This reduces the latency of a call when the
+        functions release the GIL (I/O, OpenCV, most large NumPy operations).
+
+        Note:
+            The executor must not be the one running this call, otherwise the nodes might
+            wait for a free worker forever.
+
+        Args:
+            *args (Any): values of the input nodes.
+            executor (Executor | None, optional): executor running the nodes, reuse one for
+                low latency calls. Defaults to a thread pool created for the call.
+            workers (int | None, optional): number of threads of the pool created if no
+                executor is provided. Defaults to the number of CPUs.
+
+        Raises:
+            ValueError: args isn't same length as input length.
+            ValidationError: schema of output doesn't validate the output.
+            RuntimeError: a node produced a runtime error.
+
+        Returns:
+            Any: output of the graph.
+
+        Example:
+
+        >>> executor = ThreadPoolExecutor(max_workers=4)
+        >>> image, audio = pipeline.call_parallel("image.png", "audio.npy", executor=executor)
+        """
+        self._check_args(args)
+        if self.__background is not None:
+            self.__background.raise_pending()
+
+        if executor is not None:
+            context = self._execute_parallel(args, executor)
+        else:
+            workers = workers if workers is not None else os.cpu_count() or 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                context = self._execute_parallel(args, executor)
+        return self._collect_outputs(context, background=self.__background)
+
+    async def acall(self, *args: Any, executor: Executor | None = None) -> Any:
+        """Execute the graph for one sample without blocking the event loop.
+
+        Every node is scheduled as soon as its parents are computed. Async functions
+        (`async def` decorated with `deferred_execution`) are awaited concurrently, synchronous
+        functions are offloaded to `executor`, so I/O bound stages overlap with CPU stages.
+
+        Args:
+            *args (Any): values of the input nodes.
+            executor (Executor | None, optional): executor running the synchronous nodes.
+                Defaults to the default executor of the event loop.
+
         Raises:
             ValueError: args isn't same length as input length.
             ValidationError: schema of output doesn't validate the output.
@@ -107,36 +737,555 @@ class Pipeline:
 
         Returns:
             Any: output of the graph.
+
+        Example:
+
+        >>> @deferred_execution
+        >>> async def fetch(key):
+        >>>     return await store.get(key)
+
+        >>> inp = InputNode()
+        >>> pipeline = Pipeline(inp, decode(fetch(inp)))
+        >>> result = await pipeline.acall("image_key")
+        """
+        self._check_args(args)
+        if self.__background is not None:
+            self.__background.raise_pending()
+        context = await self._execute_async(args, executor)
+        return self._collect_outputs(context, background=self.__background)
+
+    def memory_report(self, *args: Any) -> Dict[str, int]:
+        """Execute the graph once and measure the peak memory held by the node values.
+
+        Intermediate values are freed as soon as their last consumer is computed, this
+        method compares the peak with the one of an execution keeping every value until the
+        end of the call. Only arrays are measured, views count once with their base array.
+
+        Args:
+            *args (Any): values of the input nodes.
+
+        Raises:
+            ValueError: args isn't same length as input length.
+            RuntimeError: a node produced a runtime error.
+
+        Returns:
+            Dict[str, int]: "peak_bytes", "peak_bytes_without_release" and "saved_bytes".
+
+        Example:
+
+        >>> pipeline.memory_report("path/to/image.png")
+        {'peak_bytes': 12582912, 'peak_bytes_without_release': 19267584, 'saved_bytes': 6684672}
+        """
+        self._check_args(args)
+        context = self._new_context(args)
+        kept: List[Any] = list(context)
+
+        peak_bytes = _nbytes(context)
+        for func, get_inputs, unpack, output_slot, release_slots in self.__plans[None]:
+            try:
+                inputs = get_inputs(context)
+                context[output_slot] = kept[output_slot] = func(*inputs) if unpack else func(inputs)
+            except Exception as e:
+                raise self._node_error(output_slot, e) from e
+
+            # the parents and the new value are alive at the same time
+            peak_bytes = max(peak_bytes, _nbytes(context))
+            for released in release_slots:
+                context[released] = None
+
+        peak_bytes_without_release = _nbytes(kept)
+        return {"peak_bytes": peak_bytes,
+                "peak_bytes_without_release": peak_bytes_without_release,
+                "saved_bytes": peak_bytes_without_release - peak_bytes}
+
+    def _check_args(self, args: Tuple[Any, ...]) -> None:
+        """Check the number of values passed to the pipeline.
+
+        Args:
+            args (Tuple[Any, ...]): values of the input nodes.
+
+        Raises:
+            ValueError: args isn't same length as input length.
         """
         if len(args) != len(self.__inputs):
             raise ValueError(f"Pipeline takes {len(self.__inputs)} positional(s) argument(s), "
                              f"but {len(args)} were(was) provided")
 
-        # set value in inputs node
-        for node, arg in zip(self.__inputs, args):
-            node._set_value(arg)
+    def _output_indices(self, outputs: Sequence[int] | None) -> Sequence[int]:
+        """Check requested output indices.
 
-        # excecute
-        for node in self.__exec_graph:
-            try:
-                node.execute()
-            except Exception as e:
-                raise RuntimeError("Error at runtime when excecuting the graph"
-                                   f"during the node : {node}."
-                                   f"Exception : {e}.")
+        Args:
+            outputs (Sequence[int] | None): indices of the outputs, None for all of them.
+
+        Raises:
+            IndexError: an output index is out of bound for outputs list.
+
+        Returns:
+            Sequence[int]: the indices.
+        """
+        if outputs is None:
+            return range(len(self.__outputs))
+        for index in outputs:
+            if index >= len(self.__outputs) or index < 0:
+                raise IndexError(f"output index {index} isn't included in [0, len(outputs)[")
+        return outputs
+
+    def _collect_outputs(self,
+                         context: List[Any],
+                         outputs: Sequence[int] | None = None,
+                         background: BackgroundValidation | None = None,
+                         ) -> Any:
+        """Get the outputs from the execution context and validate them.
+
+        Args:
+            context (List[Any]): values of the nodes after the execution.
+            outputs (Sequence[int] | None, optional): indices of the computed outputs.
+                Defaults to all the outputs.
+            background (BackgroundValidation | None, optional): queue the outputs for their
+                validation instead of validating them. Defaults to None.
+
+        Raises:
+            ValidationError: schema of output doesn't validate the output.
+
+        Returns:
+            Any: output of the graph.
+        """
+        indices = self._output_indices(outputs)
 
         # return the output node value
-        output = [node.value for node in self.__outputs]
+        output = [context[self.__output_slots[i]] for i in indices]
 
         # validate data
-        for output_data, validators in zip(output, self.__validators):
-            for validator in validators:
-                validator.validate(output_data)
+        if background is not None:
+            task = [(i, self.__run_validators[i], output_data)
+                    for output_data, i in zip(output, indices) if len(self.__run_validators[i]) != 0]
+            if len(task) != 0:
+                background.submit(task)
+        else:
+            for output_data, i in zip(output, indices):
+                for validator in self.__run_validators[i]:
+                    validator.validate(output_data)
 
         if len(output) == 1:
             return output[0]
         return output
 
+    def _collect_batch_outputs(self, context: List[Any], outputs: Sequence[int] | None = None) -> Any:
+        """Get the batched outputs from the execution context and validate each sample.
+
+        Args:
+            context (List[Any]): values of the nodes after the execution.
+            outputs (Sequence[int] | None, optional): indices of the computed outputs.
+                Defaults to all the outputs.
+
+        Raises:
+            BatchValidationError: schema of output samples doesn't validate.
+
+        Returns:
+            Any: batched outputs of the graph.
+        """
+        indices = self._output_indices(outputs)
+        output = [context[self.__output_slots[i]] for i in indices]
+
+        for output_batch, i in zip(output, indices):
+            for validator in self.__run_validators[i]:
+                failing = np.flatnonzero(validator.validate_batch(output_batch))
+                if len(failing) != 0:
+                    raise BatchValidationError(f"{len(failing)} samples of output {i} don't validate "
+                                               f"{type(validator).__name__}, indices : {failing.tolist()}.",
+                                               failing)
+
+        if len(output) == 1:
+            return output[0]
+        return output
+
+    def map(self,
+            iterable: Iterable[Any],
+            workers: int | None = None,
+            ordered: bool = True,
+            chunksize: int = 1,
+            max_in_flight: int | None = None,
+            stats: RunStats | None = None,
+            backend: str = "thread",
+            on_error: str = "raise",
+            quarantine: List[FailedSample] | None = None,
+            ) -> Generator[Any, None, None]:
+        """Execute the pipeline on every sample of an iterable with a thread or process pool.
+
+        Samples are grouped in chunks of `chunksize` and at most `max_in_flight` chunks are
+        processed or waiting to be consumed at the same time, so the iterable is read lazily
+        and memory stays flat. If the pipeline has several inputs, each sample must be a
+        tuple of the input values.
+
+        With the "thread" backend, functions releasing the GIL (e.g. `cv2.imread`, `cv2.resize`)
+        run in parallel. The "process" backend also parallelizes functions holding the GIL
+        (e.g. pure NumPy stages), the pipeline is pickled once per worker process, which are
+        reused for every chunk. All the functions of the graph must then be picklable
+        (defined at module level) and samples and outputs are sent between processes.
+
+        The error policy `on_error` decides what happens when a sample fails (a node raises or
+        an output doesn't validate): "raise" stops the run, "skip" drops the sample and
+        "sentinel" yields a `FailedSample` holding the sample, the exception and the failing
+        node in place of its output. Failed samples are also appended to `quarantine`, so a
+        new run can process only them.
+
+        Args:
+            iterable (Iterable[Any]): samples to process.
+            workers (int | None, optional): number of threads. Defaults to the number of CPUs.
+            ordered (bool, optional): yield the results in the order of the iterable, otherwise
+                as soon as they are computed. Defaults to True.
+            chunksize (int, optional): number of samples sent to a thread at once. Defaults to 1.
+            max_in_flight (int | None, optional): maximum number of chunks in flight.
+                Defaults to twice the number of workers.
+            stats (RunStats | None, optional): updated with the number of processed samples
+                and the throughput of the run. Defaults to None.
+            backend (str, optional): "thread" or "process". Defaults to "thread".
+            on_error (str, optional): "raise", "skip" or "sentinel". Defaults to "raise".
+            quarantine (List[FailedSample] | None, optional): list receiving the failed
+                samples. Defaults to None.
+
+        Raises:
+            ValueError: workers, chunksize or max_in_flight is less than 1, unknown backend
+                or unknown error policy.
+            PipelineExecutionError: a node produced a runtime error and on_error is "raise".
+            ValidationError: schema of output doesn't validate the output and on_error is "raise".
+
+        Yields:
+            Any: output of the pipeline for each sample.
+
+        Example:
+
+        >>> stats = RunStats()
+        >>> quarantine = []
+        >>> for image in pipeline.map(paths, workers=8, stats=stats, on_error="skip", quarantine=quarantine):
+        >>>     ...
+        >>> print(stats)
+        >>> corrupted = [failed.item for failed in quarantine]
+        """
+        _check_error_policy(on_error)
+        workers = workers if workers is not None else os.cpu_count() or 1
+        max_in_flight = max_in_flight if max_in_flight is not None else 2 * workers
+        executor, call_chunk = create_executor(self, backend, workers)
+        if on_error != "raise":
+            call_chunk = partial(call_chunk, on_error=on_error)
+
+        if stats is not None:
+            stats._start()
+        try:
+            with executor:
+                for results in imap_bounded(executor, call_chunk,
+                                            iter_chunks(iterable, chunksize),
+                                            max_in_flight, ordered):
+                    if stats is not None:
+                        stats._add_samples(len(results))
+                    if on_error == "raise":
+                        yield from results
+                        continue
+
+                    for result in results:
+                        if isinstance(result, FailedSample):
+                            if stats is not None:
+                                stats._add_failures(1)
+                            if quarantine is not None:
+                                quarantine.append(result)
+                            if on_error == "skip":
+                                continue
+                        yield result
+        finally:
+            if stats is not None:
+                stats._stop()
+
+    def stream(self,
+               source: Iterable[Any],
+               prefetch: int = 8,
+               workers: int | None = None,
+               shuffle_buffer: int = 0,
+               seed: int | None = None,
+               stats: RunStats | None = None,
+               backend: str = "thread",
+               on_error: str = "raise",
+               quarantine: List[FailedSample] | None = None,
+               ) -> Generator[Any, None, None]:
+        """Stream the outputs of the pipeline for the samples of a source iterator.
+
+        `prefetch` samples are kept in flight: they are computed by the workers while the
+        consumer handles the previous outputs. The source is only pulled when an output is
+        consumed, so a slow consumer blocks the source instead of accumulating results.
+        Outputs are yielded as soon as they are computed.
+
+        With `shuffle_buffer`, outputs are stored in a buffer of that size and a random one
+        is yielded each time the buffer is full, as a shuffle of a training stream.
+
+        Args:
+            source (Iterable[Any]): samples to process. If the pipeline has several inputs,
+                each sample must be a tuple of the input values.
+            prefetch (int, optional): number of samples in flight. Defaults to 8.
+            workers (int | None, optional): number of workers. Defaults to the number of CPUs.
+            shuffle_buffer (int, optional): size of the shuffle buffer, 0 disables the
+                shuffle. Defaults to 0.
+            seed (int | None, optional): seed of the shuffle. Defaults to None.
+            stats (RunStats | None, optional): updated with the number of processed samples
+                and the throughput of the run. Defaults to None.
+            backend (str, optional): "thread" or "process", see `Pipeline.map`. Defaults to "thread".
+            on_error (str, optional): "raise", "skip" or "sentinel", see `Pipeline.map`.
+                Defaults to "raise".
+            quarantine (List[FailedSample] | None, optional): list receiving the failed
+                samples. Defaults to None.
+
+        Raises:
+            ValueError: prefetch or workers is less than 1, shuffle_buffer is negative,
+                unknown backend or unknown error policy.
+            PipelineExecutionError: a node produced a runtime error and on_error is "raise".
+            ValidationError: schema of output doesn't validate the output and on_error is "raise".
+
+        Yields:
+            Any: output of the pipeline for each sample.
+
+        Example:
+
+        >>> for image, label in pipeline.stream(dataset_rows, prefetch=64, workers=8, shuffle_buffer=1024):
+        >>>     train_step(image, label)
+        """
+        if shuffle_buffer < 0:
+            raise ValueError(f"shuffle_buffer must be positive, not {shuffle_buffer}")
+
+        outputs = self.map(source, workers=workers, ordered=False, chunksize=1,
+                           max_in_flight=prefetch, stats=stats, backend=backend,
+                           on_error=on_error, quarantine=quarantine)
+        if shuffle_buffer == 0:
+            yield from outputs
+            return
+
+        rng = random.Random(seed)
+        buffer: List[Any] = []
+        for output in outputs:
+            buffer.append(output)
+            if len(buffer) >= shuffle_buffer:
+                yield _pop_random(buffer, rng)
+        while len(buffer) != 0:
+            yield _pop_random(buffer, rng)
+
+    def _call_chunk(self,
+                    chunk: List[Any],
+                    on_error: str = "raise",
+                    outputs: Sequence[int] | None = None,
+                    ) -> List[Any]:
+        """Call the pipeline on every sample of a chunk.
+
+        Args:
+            chunk (List[Any]): samples, a tuple of input values if the pipeline has several inputs.
+            on_error (str, optional): "raise" to propagate the exceptions, otherwise a failed
+                sample is returned as a `FailedSample`. Defaults to "raise".
+            outputs (Sequence[int] | None, optional): indices of the outputs to compute.
+                Defaults to all the outputs.
+
+        Returns:
+            List[Any]: outputs of the pipeline.
+        """
+        single_input = len(self.__inputs) == 1
+        if on_error == "raise":
+            if single_input:
+                return [self._call((sample,), outputs) for sample in chunk]
+            return [self._call(tuple(sample), outputs) for sample in chunk]
+
+        results = []
+        for sample in chunk:
+            try:
+                results.append(self._call((sample,) if single_input else tuple(sample), outputs))
+            except Exception as e:
+                results.append(FailedSample(sample, e))
+        return results
+
+    def _execute(self, args: Tuple[Any, ...], plan: RunnablePlan | None = None) -> List[Any]:
+        """Execute the graph in topological order for one call.
+
+        The values are stored in a fresh execution context (a list indexed by the
+        topological position of the nodes), nodes are never written, which makes
+        the pipeline reentrant.
+
+        Args:
+            args (Tuple[Any, ...]): values of the input nodes.
+            plan (RunnablePlan | None, optional):
+                runnable plan to execute. Defaults to the plan of all the outputs.
+
+        Raises:
+            RuntimeError: a node produced a runtime error.
+
+        Returns:
+            List[Any]: the execution context, value of every node of the graph.
+        """
+        if plan is None:
+            plan = self.__plans[None]
+        context = self._new_context(args)
+
+        # a single try for the whole plan, on failure output_slot is the failing node
+        output_slot = None
+        try:
+            for func, get_inputs, unpack, output_slot, release_slots in plan:
+                context[output_slot] = func(*get_inputs(context)) if unpack else func(get_inputs(context))
+
+                # free the values that no other node needs
+                for released in release_slots:
+                    context[released] = None
+        except Exception as e:
+            raise self._node_error(output_slot, e) from e
+        return context
+
+    def _new_context(self, args: Tuple[Any, ...]) -> List[Any]:
+        """Create the execution context of a call, with the values of the inputs set.
+
+        Args:
+            args (Tuple[Any, ...]): values of the input nodes.
+
+        Returns:
+            List[Any]: the execution context.
+        """
+        context: List[Any] = [None] * len(self.__exec_graph)
+        for slot, arg in zip(self.__input_slots, args):
+            if slot is not None:
+                context[slot] = arg
+        return context
+
+    def _call_slot(self, slot: int, context: List[Any]) -> None:
+        """Compute a node from the values of its parents and store it in the execution context.
+
+        Args:
+            slot (int): slot of the node.
+            context (List[Any]): the execution context.
+        """
+        context[slot] = self.__sync_funcs[slot](*[context[p] for p in self.__parent_slots[slot]])
+
+    def _node_error(self, slot: int, e: Exception) -> PipelineExecutionError:
+        """Build the error raised when the node of a slot fails, naming the fused parents.
+
+        Args:
+            slot (int): slot of the failing node.
+            e (Exception): the exception raised by the node.
+
+        Returns:
+            PipelineExecutionError: the error to raise.
+        """
+        fused = [self.__exec_graph[parent] for parent, child in self.__fused_slots.items() if child == slot]
+        return _node_error(self.__exec_graph[slot], e, fused)
+
+    def _release_parents(self, slot: int, context: List[Any], consumers: List[int]) -> None:
+        """Count a computed node as a consumer of its parents and free the parents
+        whose consumers are all computed, used by the concurrent executions.
+
+        Args:
+            slot (int): slot of the computed node.
+            context (List[Any]): the execution context.
+            consumers (List[int]): number of consumers not yet computed for each slot.
+        """
+        for parent_slot in self.__unique_parent_slots[slot]:
+            consumers[parent_slot] -= 1
+            if consumers[parent_slot] == 0 and parent_slot not in self.__output_slot_set:
+                context[parent_slot] = None
+
+    def _execute_parallel(self, args: Tuple[Any, ...], executor: Executor) -> List[Any]:
+        """Execute the graph for one call, submitting each node as soon as its parents are done.
+
+        Args:
+            args (Tuple[Any, ...]): values of the input nodes.
+            executor (Executor): executor running the nodes.
+
+        Raises:
+            RuntimeError: a node produced a runtime error.
+
+        Returns:
+            List[Any]: the execution context, value of every node of the graph.
+        """
+        context = self._new_context(args)
+
+        # number of parents not yet computed for each node
+        remaining = [len(parent_slots) for parent_slots in self.__unique_parent_slots]
+        consumers = [len(children) for children in self.__children_slots]
+        pending: Dict[Future, int] = {}
+
+        def launch(slot: int) -> None:
+            func = self.__sync_funcs[slot]
+            if func is None:
+                complete(slot)
+            else:
+                # values are read and written in the context by the worker, so the executor
+                # and the futures keep no reference to them once released
+                pending[executor.submit(self._call_slot, slot, context)] = slot
+
+        def complete(slot: int) -> None:
+            for child in self.__children_slots[slot]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    launch(child)
+
+        roots = [slot for slot, count in enumerate(remaining) if count == 0]
+        for slot in roots:
+            launch(slot)
+
+        while len(pending) != 0:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                slot = pending.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    for other in pending:
+                        other.cancel()
+                    raise self._node_error(slot, e) from e
+                self._release_parents(slot, context, consumers)
+                complete(slot)
+        return context
+
+    async def _execute_async(self, args: Tuple[Any, ...], executor: Executor | None) -> List[Any]:
+        """Execute the graph for one call as asyncio tasks, each one waiting for its parents.
+
+        Args:
+            args (Tuple[Any, ...]): values of the input nodes.
+            executor (Executor | None): executor running the synchronous nodes.
+
+        Raises:
+            RuntimeError: a node produced a runtime error.
+
+        Returns:
+            List[Any]: the execution context, value of every node of the graph.
+        """
+        # only acall needs asyncio, it isn't imported with the package
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        context = self._new_context(args)
+
+        tasks: List[asyncio.Task | None] = [None] * len(self.__exec_graph)
+        consumers = [len(children) for children in self.__children_slots]
+
+        async def run(slot: int) -> None:
+            parent_slots = self.__parent_slots[slot]
+            parent_tasks = [tasks[p] for p in self.__unique_parent_slots[slot] if tasks[p] is not None]
+            await asyncio.gather(*parent_tasks)
+
+            func = self.__funcs[slot]
+            try:
+                if is_async_call(func):
+                    context[slot] = await func(*[context[p] for p in parent_slots])
+                else:
+                    # the worker reads and writes the context, it keeps no reference to the values
+                    await loop.run_in_executor(executor, self._call_slot, slot, context)
+            except Exception as e:
+                raise self._node_error(slot, e) from e
+            self._release_parents(slot, context, consumers)
+
+        # tasks are created in topological order, parents always exist before their children
+        for slot, func in enumerate(self.__funcs):
+            if func is not None:
+                tasks[slot] = asyncio.ensure_future(run(slot))
+
+        created = [task for task in tasks if task is not None]
+        try:
+            await asyncio.gather(*created)
+        finally:
+            for task in created:
+                task.cancel()
+        return context
+
     def as_deferred(self, *args) -> PipelineNode:
         """Use pipeline as a Node function for an other pipeline
 
@@ -162,8 +1311,7 @@ class Pipeline:
                             "decorator")
 
         # kw_no_data = {k: v for k, v in kwargs.items() if not isinstance(v, PipeNode)}
-        deferred_func = lambda *data: self(*data, *args_no_data)
-        deferred_func.__name__ = "Pipeline"
+        deferred_func = DeferredCall(self, args_no_data, name="Pipeline")
         return PipelineNode(deferred_func, parents)
 
     def __repr__(self) -> str:
@@ -171,3 +1319,219 @@ class Pipeline:
                 f"num_inputs = {len(self.__inputs)}, "
                 f"num_outputs = {len(self.__outputs)}, "
                 f"num_validators = {len(self.__validators)})")
+
+def _stack(samples: List[Any]) -> Any:
+    """Stack the results of a node for each sample of a batch.
+
+    Args:
+        samples (List[Any]): result for each sample.
+
+    Returns:
+        Any: an array with a leading batch axis if the results are arrays (or numbers)
+            of the same shape and dtype, the list otherwise.
+    """
+    if len(samples) == 0:
+        return samples
+    if all(isinstance(sample, (np.ndarray, np.generic, int, float, bool)) for sample in samples):
+        first = np.asarray(samples[0])
+        if all(np.shape(sample) == first.shape and np.asarray(sample).dtype == first.dtype for sample in samples):
+            return np.stack(samples)
+    return samples
+
+def _pop_random(buffer: List[Any], rng: random.Random) -> Any:
+    """Remove and return a random element of a list in constant time.
+
+    Args:
+        buffer (List[Any]): the list, its order is not kept.
+        rng (random.Random): random generator.
+
+    Returns:
+        Any: the removed element.
+    """
+    index = rng.randrange(len(buffer))
+    buffer[index], buffer[-1] = buffer[-1], buffer[index]
+    return buffer.pop()
+
+def _merge_duplicates(exec_graph: List[PipelineNode]) -> Dict[PipelineNode, PipelineNode]:
+    """Find the nodes computing the same value (common subexpressions).
+
+    Two nodes are duplicates if they apply the same function to the same parents (after
+    merging) with equal constant arguments. Nodes without function (e.g. inputs) and nodes
+    with unhashable constant arguments are never merged.
+
+    Args:
+        exec_graph (List[PipelineNode]): nodes in topological order.
+
+    Returns:
+        Dict[PipelineNode, PipelineNode]: for each node, the first equivalent node of the graph.
+    """
+    canonical: Dict[PipelineNode, PipelineNode] = {}
+    seen: Dict[Any, PipelineNode] = {}
+    for node in exec_graph:
+        canonical[node] = node
+        key = _node_key(node, canonical)
+        if key is None:
+            continue
+        try:
+            canonical[node] = seen.setdefault(key, node)
+        except TypeError: # unhashable constant argument
+            pass
+    return canonical
+
+def _fuse_chains(funcs: List[Callable | None], parent_slots: List[List[int]], output_slots: set) -> Dict[int, int]:
+    """Replace the nodes computed from a single parent by a fused call when the functions
+    of the node and its parent have a fused implementation (see `fuse_calls`).
+
+    The parent must have no other consumer and not be an output. The fused node reads the
+    parents of its parent, the parent is left without function nor parent.
+
+    Args:
+        funcs (List[Callable | None]): function of each slot, modified in place.
+        parent_slots (List[List[int]]): parents of each slot, modified in place.
+        output_slots (set): slots of the outputs.
+
+    Returns:
+        Dict[int, int]: slot of the node computing each fused parent.
+    """
+    consumers: List[List[int]] = [[] for _ in funcs]
+    for slot, parents in enumerate(parent_slots):
+        for parent_slot in parents:
+            consumers[parent_slot].append(slot)
+
+    fused: Dict[int, int] = {}
+    for slot, parents in enumerate(parent_slots):
+        if len(parents) != 1:
+            continue
+        parent = parents[0]
+        if consumers[parent] != [slot] or parent in output_slots or len(parent_slots[parent]) == 0:
+            continue
+        call = fuse_calls(funcs[parent], funcs[slot])
+        if call is None:
+            continue
+
+        funcs[slot] = call
+        parent_slots[slot] = list(parent_slots[parent])
+        for grand_parent in parent_slots[slot]:
+            consumers[grand_parent] = [slot if s == parent else s for s in consumers[grand_parent]]
+        funcs[parent] = None
+        parent_slots[parent] = []
+        consumers[parent] = []
+        # a parent fused earlier in the chain is now computed by this node
+        for absorbed, fused_slot in fused.items():
+            if fused_slot == parent:
+                fused[absorbed] = slot
+        fused[parent] = slot
+    return fused
+
+def _node_key(node: PipelineNode, canonical: Dict[PipelineNode, PipelineNode]) -> Any:
+    """Key identifying the value computed by a node.
+
+    Args:
+        node (PipelineNode): the node.
+        canonical (Dict[PipelineNode, PipelineNode]): merged node of each parent.
+
+    Returns:
+        Any: the key, None if the node holds a value instead of computing one.
+    """
+    func = node.func
+    if func is None or len(node.parent) == 0:
+        return None
+
+    parents = tuple(id(canonical[parent]) for parent in node.parent)
+    if isinstance(func, DeferredCall):
+        # the type is part of the key, 1 and 1.0 are equal but may give different results
+        args = tuple((type(arg), arg) for arg in func.args)
+        kwargs = tuple(sorted((name, type(arg), arg) for name, arg in func.kwargs.items()))
+        return (id(func.func), parents, args, kwargs)
+    return (id(func), parents)
+
+def _runnable_plan(plan: List[Tuple[Callable, Tuple[int, ...], int, Tuple[int, ...]]]) -> RunnablePlan:
+    """Prepare a plan for the execution loop, input slots are replaced by an `itemgetter`.
+
+    Args:
+        plan (List[Tuple[Callable, Tuple[int, ...], int, Tuple[int, ...]]]): plan built
+            by `Pipeline.compile`.
+
+    Returns:
+        RunnablePlan: steps `(func, get_inputs, unpack, output_slot, release_slots)`,
+            `get_inputs` returns a tuple to unpack if the function has several inputs,
+            the single value otherwise.
+    """
+    return [(func, operator.itemgetter(*input_slots), len(input_slots) > 1, output_slot, release_slots)
+            for func, input_slots, output_slot, release_slots in plan]
+
+def _nbytes(values: Iterable[Any]) -> int:
+    """Size of the arrays held by some values, a view counts once with its base array.
+
+    Args:
+        values (Iterable[Any]): values, lists and tuples are searched for arrays.
+
+    Returns:
+        int: number of bytes.
+    """
+    seen = set()
+    total = 0
+    stack = list(values)
+    while len(stack) != 0:
+        value = stack.pop()
+        if isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, np.ndarray):
+            while isinstance(value.base, np.ndarray):
+                value = value.base
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += value.nbytes
+    return total
+
+def _fuse_validators(validators: List[Validator]) -> List[Validator]:
+    """Replace the first `MinMaxValidator` and `MeanVarValidator` of an output by a
+    `StatisticsValidator` computing their statistics in a single pass.
+
+    Args:
+        validators (List[Validator]): validators of the output, in the order they were added.
+
+    Returns:
+        List[Validator]: validators to run, the fused one at the position of the first of the two.
+    """
+    # subclasses may override validate, only the exact types are fused
+    min_max = next((v for v in validators if type(v) is MinMaxValidator), None)
+    mean_var = next((v for v in validators if type(v) is MeanVarValidator), None)
+    if min_max is None or mean_var is None:
+        return list(validators)
+
+    fused = StatisticsValidator.from_validators(min_max, mean_var)
+    position = min(validators.index(min_max), validators.index(mean_var))
+    run_validators = [v for v in validators if v is not min_max and v is not mean_var]
+    run_validators.insert(position, fused)
+    return run_validators
+
+def _check_error_policy(on_error: str) -> None:
+    """Check the error policy of a bulk execution.
+
+    Args:
+        on_error (str): the policy.
+
+    Raises:
+        ValueError: unknown policy.
+    """
+    if on_error not in ERROR_POLICIES:
+        raise ValueError(f"on_error must be one of {ERROR_POLICIES}, not {on_error!r}")
+
+def _node_error(node: PipelineNode, e: Exception, fused: List[PipelineNode] | None = None) -> PipelineExecutionError:
+    """Build the error raised when a node fails during the execution.
+
+    Args:
+        node (PipelineNode): the failing node.
+        e (Exception): the exception raised by the node.
+        fused (List[PipelineNode] | None, optional): parents computed by the fused call of
+            the node. Defaults to None.
+
+    Returns:
+        PipelineExecutionError: the error to raise.
+    """
+    fused_message = f" (fused with {', '.join(str(parent) for parent in fused)})" if fused else ""
+    return PipelineExecutionError("Error at runtime when excecuting the graph"
+                                  f"during the node : {node}{fused_message}."
+                                  f"Exception : {e}.",
+                                  node)
@@ -0,0 +1,236 @@
+"""
+deferred_call.py
+
+This module defines the `DeferredCall` class, the callable stored in a `PipelineNode` created by
+a deferred function.
+
+A `DeferredCall` stores the function, the constant positional arguments and the keyword arguments
+of the call instead of capturing them in a closure. Unlike a lambda, it can be pickled, which
+allows sending a whole `Pipeline` to worker processes.
+
+Classes:
+    DeferredCall: A picklable partial application of a function, the node values being passed first.
+    SyncCall: Run a coroutine function to completion, to execute async nodes synchronously.
+
+Functions:
+    is_async_call: Check if a node function returns a coroutine.
+    register_batched: Register the batched implementation of a function.
+    register_fused: Register the fused implementation of a function applied to the result of an other.
+    fuse_calls: Fuse the call of a node with the call of its single parent.
+"""
+
+import importlib
+import inspect
+import sys
+from collections.abc import Callable
+from typing import Any, Dict, Tuple
+
+# batched implementation of the functions, working on a leading batch axis
+_BATCHED_IMPLEMENTATIONS: Dict[Callable, Callable] = {}
+
+# builders of the fused call of a consumer function applied to the result of a producer
+_FUSED_IMPLEMENTATIONS: Dict[Tuple[Callable, Callable], Callable[["DeferredCall", "DeferredCall"], "DeferredCall | None"]] = {}
+
+def register_batched(func: Callable, batched_func: Callable) -> None:
+    """Register the batched implementation of a function.
+
+    `batched_func` takes the same arguments as `func`, except that the node values have a
+    leading batch axis, and returns the stacked results of `func` for each sample.
+
+    Args:
+        func (Callable): the per sample function.
+        batched_func (Callable): its batched implementation.
+    """
+    _BATCHED_IMPLEMENTATIONS[func] = batched_func
+
+def register_fused(producer: Callable,
+                   consumer: Callable,
+                   fuse: Callable[["DeferredCall", "DeferredCall"], "DeferredCall | None"]) -> None:
+    """Register the fused implementation of `consumer` applied to the result of `producer`.
+
+    `fuse(producer_call, consumer_call)` returns a call computing the value of the consumer
+    node directly from the parents of the producer node (e.g. decoding an image at a reduced
+    resolution when it's resized next), or None if these arguments can't be fused.
+
+    Args:
+        producer (Callable): the function of the parent node.
+        consumer (Callable): the function of the child node.
+        fuse (Callable[[DeferredCall, DeferredCall], DeferredCall | None]): builder of the
+            fused call.
+    """
+    _FUSED_IMPLEMENTATIONS[(producer, consumer)] = fuse
+
+def fuse_calls(producer_call: Any, consumer_call: Any) -> "DeferredCall | None":
+    """Fuse the call of a node with the call of its single parent.
+
+    Args:
+        producer_call (Any): function of the parent node.
+        consumer_call (Any): function of the child node.
+
+    Returns:
+        DeferredCall | None: the fused call, None if the functions have no registered fused
+            implementation.
+    """
+    if not isinstance(producer_call, DeferredCall) or not isinstance(consumer_call, DeferredCall):
+        return None
+    fuse = _FUSED_IMPLEMENTATIONS.get((producer_call.func, consumer_call.func))
+    if fuse is None:
+        return None
+    return fuse(producer_call, consumer_call)
+
+class DeferredCall:
+    """
+    A picklable partial application of a function.
+
+    Calling the object with the values of the parent nodes calls `func(*data, *args, **kwargs)`.
+
+    Functions decorated with `deferred_execution` are shadowed in their module by the decorator
+    wrapper, so they can't be pickled by reference. In this case the function is pickled as its
+    module and qualified name, and unwrapped from the decorator when unpickled.
+
+    Args:
+        func (Callable): the function to call.
+        args (Tuple[Any, ...], optional): constant positional arguments, passed after the node
+            values. Defaults to ().
+        kwargs (Dict[str, Any] | None, optional): keyword arguments. Defaults to None.
+        name (str | None, optional): name of the call, defaults to the name of the function.
+
+    Example:
+
+    >>> call = DeferredCall(np.clip, (0, 1))
+    >>> call(np.array([-1, 0.5, 2]))  # np.clip(data, 0, 1)
+    array([0. , 0.5, 1. ])
+    """
+    def __init__(self,
+                 func: Callable,
+                 args: Tuple[Any, ...] = (),
+                 kwargs: Dict[str, Any] | None = None,
+                 name: str | None = None,
+                 ) -> None:
+        self.__func = func
+        self.__args = tuple(args)
+        self.__kwargs = dict(kwargs) if kwargs is not None else {}
+        self.__name__ = name if name is not None else getattr(func, "__name__", type(func).__name__)
+
+    @property
+    def func(self) -> Callable:
+        """Function called.
+
+        Returns:
+            Callable: the function.
+        """
+        return self.__func
+
+    @property
+    def args(self) -> Tuple[Any, ...]:
+        """Constant positional arguments, passed after the node values.
+
+        Returns:
+            Tuple[Any, ...]: the arguments.
+        """
+        return self.__args
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments of the call.
+
+        Returns:
+            Dict[str, Any]: the keyword arguments.
+        """
+        return self.__kwargs
+
+    @property
+    def batched(self) -> "DeferredCall | None":
+        """Call of the batched implementation of the function, with the same arguments.
+
+        Returns:
+            DeferredCall | None: the batched call, None if the function has no batched
+                implementation.
+        """
+        batched_func = _BATCHED_IMPLEMENTATIONS.get(self.__func)
+        if batched_func is None:
+            return None
+        return DeferredCall(batched_func, self.__args, self.__kwargs, self.__name__)
+
+    def __call__(self, *data: Any) -> Any:
+        return self.__func(*data, *self.__args, **self.__kwargs)
+
+    def __reduce__(self) -> Tuple[Callable, Tuple[Any, ...]]:
+        module = getattr(self.__func, "__module__", None)
+        qualname = getattr(self.__func, "__qualname__", None)
+        if module is not None and qualname is not None:
+            wrapper = _lookup(module, qualname)
+            if wrapper is not self.__func and getattr(wrapper, "__wrapped__", None) is self.__func:
+                return (_restore_wrapped_call, (module, qualname, self.__args, self.__kwargs, self.__name__))
+        return (DeferredCall, (self.__func, self.__args, self.__kwargs, self.__name__))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__name__}, args = {self.__args}, kwargs = {self.__kwargs})"
+
+class SyncCall:
+    """
+    Run a coroutine function to completion, so an async node can be executed by a synchronous
+    caller (e.g. `Pipeline.__call__`).
+
+    Each call runs its own event loop, it can't be used from a thread running an event loop,
+    use `Pipeline.acall` there.
+
+    Args:
+        func (Callable): function returning a coroutine.
+    """
+    def __init__(self, func: Callable) -> None:
+        self.__func = func
+        self.__name__ = getattr(func, "__name__", type(func).__name__)
+
+    def __call__(self, *data: Any) -> Any:
+        import asyncio # only needed by async nodes
+        return asyncio.run(self.__func(*data))
+
+def is_async_call(func: Callable | None) -> bool:
+    """Check if a node function returns a coroutine.
+
+    Args:
+        func (Callable | None): function stored in a node.
+
+    Returns:
+        bool: True if the function (or the function of a `DeferredCall`) is a coroutine function.
+    """
+    if isinstance(func, DeferredCall):
+        func = func.func
+    return inspect.iscoroutinefunction(func)
+
+def _lookup(module: str, qualname: str) -> Any:
+    """Find an object from its module and qualified name.
+
+    Args:
+        module (str): name of the module.
+        qualname (str): qualified name of the object in the module.
+
+    Returns:
+        Any: the object, None if it can't be found.
+    """
+    obj = sys.modules.get(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part, None)
+    return obj
+
+def _restore_wrapped_call(module: str,
+                          qualname: str,
+                          args: Tuple[Any, ...],
+                          kwargs: Dict[str, Any],
+                          name: str) -> DeferredCall:
+    """Rebuild a `DeferredCall` of a function shadowed by its decorator wrapper.
+
+    Args:
+        module (str): name of the module of the function.
+        qualname (str): qualified name of the function.
+        args (Tuple[Any, ...]): constant positional arguments.
+        kwargs (Dict[str, Any]): keyword arguments.
+        name (str): name of the call.
+
+    Returns:
+        DeferredCall: the call of the unwrapped function.
+    """
+    importlib.import_module(module)
+    wrapper = _lookup(module, qualname)
+    return DeferredCall(wrapper.__wrapped__, args, kwargs, name)
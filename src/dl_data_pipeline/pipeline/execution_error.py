@@ -0,0 +1,41 @@
+"""
+execution_error.py
+
+This module defines the `PipelineExecutionError` exception, raised when a node fails during an
+execution of a pipeline. It records the failing node, which `FailedSample` reports for the samples
+quarantined by a bulk execution.
+
+Classes:
+    PipelineExecutionError: Failure of a node, chained to the exception raised by its function.
+"""
+
+from typing import Any, Callable, Tuple
+
+from .pipe_node import PipelineNode
+
+class PipelineExecutionError(RuntimeError):
+    """
+    Exception raised when a node of a pipeline fails during an execution.
+
+    The exception raised by the node function is chained as the cause (`__cause__`).
+
+    Inherits from:
+        RuntimeError: the type raised by the pipeline before this exception existed.
+
+    Args:
+        message (str): description of the failure.
+        node (PipelineNode | None, optional): the failing node. Defaults to None.
+
+    Examples:
+        >>> try:
+        >>>     pipeline("corrupted.jpg")
+        >>> except PipelineExecutionError as e:
+        >>>     print(e.node, e.__cause__)
+    """
+    def __init__(self, message: str, node: PipelineNode | None = None) -> None:
+        super().__init__(message)
+        self.node = node
+
+    def __reduce__(self) -> Tuple[Callable, Tuple[Any, ...]]:
+        # sent back by the worker processes, the cause isn't kept
+        return (self.__class__, (str(self), self.node))
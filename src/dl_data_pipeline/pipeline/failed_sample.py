@@ -0,0 +1,74 @@
+"""
+failed_sample.py
+
+This module defines the `FailedSample` class, the record of a sample whose execution failed during
+a bulk execution of a pipeline with an error policy other than "raise".
+
+Classes:
+    FailedSample: A failed sample, with the exception and the failing node.
+"""
+
+from typing import Any
+
+from .execution_error import PipelineExecutionError
+from .pipe_node import PipelineNode
+
+ERROR_POLICIES = ("raise", "skip", "sentinel")
+
+class FailedSample:
+    """
+    A sample whose execution failed in a bulk execution.
+
+    With `on_error="sentinel"`, it is yielded in place of the output of the sample. With a
+    quarantine list, it is appended to the list, so only the failed items are processed again.
+
+    Args:
+        item (Any): the sample, as given to the bulk execution.
+        error (Exception): the exception raised by the execution of the sample.
+
+    Example:
+
+    >>> quarantine = []
+    >>> for image in pipeline.map(paths, on_error="skip", quarantine=quarantine):
+    >>>     ...
+    >>> retried = list(pipeline.map([failed.item for failed in quarantine]))
+    """
+    def __init__(self, item: Any, error: Exception) -> None:
+        self.__item = item
+        self.__error = error
+
+    @property
+    def item(self) -> Any:
+        """The failed sample.
+
+        Returns:
+            Any: the sample, a tuple of input values if the pipeline has several inputs.
+        """
+        return self.__item
+
+    @property
+    def error(self) -> Exception:
+        """Exception raised by the execution of the sample.
+
+        Returns:
+            Exception: a `PipelineExecutionError` if a node failed, a `ValidationError` if an
+                output doesn't validate.
+        """
+        return self.__error
+
+    @property
+    def node(self) -> PipelineNode | None:
+        """Node which failed.
+
+        Returns:
+            PipelineNode | None: the node, None if the failure didn't come from a node
+                (e.g. a validator).
+        """
+        if isinstance(self.__error, PipelineExecutionError):
+            return self.__error.node
+        return None
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}("
+                f"item = {self.__item!r}, "
+                f"error = {self.__error!r})")
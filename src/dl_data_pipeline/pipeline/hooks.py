@@ -0,0 +1,76 @@
+"""
+hooks.py
+
+This module defines the `NodeHook` class, the base class of the callbacks notified before and
+after each node computed by a `Pipeline`, and the `HookedCall` wrapper calling them.
+
+Hooks are attached with `Pipeline.add_hook`. The node functions are wrapped only while at least
+one hook is attached, so a pipeline without hooks runs its plain execution plan.
+
+Classes:
+    NodeHook: Base class of the callbacks notified around the computation of each node.
+    HookedCall: Node function notifying hooks before and after the call.
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any, Tuple
+
+from .pipe_node import PipelineNode
+
+class NodeHook:
+    """
+    Base class of the callbacks notified around the computation of each node.
+
+    Both methods do nothing by default, subclasses override the ones they need. A pipeline
+    can be executed from several threads, hooks keeping a state must protect it.
+
+    Example:
+
+    >>> class PrintShapes(NodeHook):
+    >>>     def after_node(self, node, output, elapsed):
+    >>>         print(node, getattr(output, "shape", None))
+
+    >>> pipeline.add_hook(PrintShapes())
+    """
+    def before_node(self, node: PipelineNode, inputs: Tuple[Any, ...]) -> None:
+        """Called before a node is computed.
+
+        Args:
+            node (PipelineNode): the node.
+            inputs (Tuple[Any, ...]): values of its parents.
+        """
+
+    def after_node(self, node: PipelineNode, output: Any, elapsed: float) -> None:
+        """Called after a node is computed, not called if the node raises.
+
+        Args:
+            node (PipelineNode): the node.
+            output (Any): its value.
+            elapsed (float): wall time of the computation in seconds.
+        """
+
+class HookedCall:
+    """
+    Node function notifying hooks before and after the call.
+
+    Args:
+        func (Callable): function computed by the node.
+        node (PipelineNode): the node, passed to the hooks.
+        hooks (Tuple[NodeHook, ...]): hooks to notify, in order.
+    """
+    def __init__(self, func: Callable, node: PipelineNode, hooks: Tuple[NodeHook, ...]) -> None:
+        self.__func = func
+        self.__node = node
+        self.__hooks = hooks
+        self.__name__ = getattr(func, "__name__", type(func).__name__)
+
+    def __call__(self, *data: Any) -> Any:
+        for hook in self.__hooks:
+            hook.before_node(self.__node, data)
+        start = time.perf_counter()
+        output = self.__func(*data)
+        elapsed = time.perf_counter() - start
+        for hook in self.__hooks:
+            hook.after_node(self.__node, output, elapsed)
+        return output
@@ -26,5 +26,7 @@ class InputNode(PipelineNode):
     Args:
         name (str, optional): An optional name for the input node. Defaults to an empty string.
     """
+    __slots__ = ()
+
     def __init__(self, name: str = "") -> None:
         super().__init__(None, None, f"Input {name}")
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+parallel_map.py
+
+This module provides the scheduling helpers used by the bulk execution methods of `Pipeline`.
+
+Samples are grouped in chunks, and only a bounded number of chunks are submitted to the
+executor at the same time. The source iterable is consumed lazily, so memory stays flat
+whatever the size of the dataset.
+
+With the process backend, the pipeline is pickled once per worker process by the pool
+initializer and kept in the worker, so only the chunks of samples are sent afterwards.
+
+Functions:
+    iter_chunks: Split an iterable into lists of at most `chunksize` elements.
+    imap_bounded: Run a function on chunks with an executor, keeping a bounded number of
+                  chunks in flight.
+    create_executor: Create the thread or process pool executor of a bulk execution.
+"""
+
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import (
+    Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED)
+from itertools import islice
+from typing import Any, List, Tuple
+
+BACKENDS = ("thread", "process")
+
+# pipeline of the current worker process, set by the pool initializer
+_WORKER_PIPELINE = None
+
+def _init_worker(pipeline: Any) -> None:
+    """Store the pipeline in the worker process, called once per worker.
+
+    Args:
+        pipeline (Any): the unpickled pipeline.
+    """
+    global _WORKER_PIPELINE
+    _WORKER_PIPELINE = pipeline
+
+def _call_chunk_in_worker(chunk: List[Any], on_error: str = "raise") -> List[Any]:
+    """Call the pipeline of the worker process on a chunk.
+
+    Args:
+        chunk (List[Any]): samples to process.
+        on_error (str, optional): error policy of the run. Defaults to "raise".
+
+    Returns:
+        List[Any]: outputs of the pipeline, `FailedSample` for the failed samples if
+            on_error isn't "raise".
+    """
+    return _WORKER_PIPELINE._call_chunk(chunk, on_error)
+
+def create_executor(pipeline: Any, backend: str, workers: int) -> Tuple[Executor, Callable[[List[Any]], List[Any]]]:
+    """Create the executor of a bulk execution and the function processing a chunk with it.
+
+    Args:
+        pipeline (Any): the pipeline to execute.
+        backend (str): "thread" or "process".
+        workers (int): number of workers.
+
+    Raises:
+        ValueError: unknown backend or workers is less than 1.
+
+    Returns:
+        Tuple[Executor, Callable[[List[Any]], List[Any]]]: the executor and the chunk function.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, not {workers}")
+
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=workers), pipeline._call_chunk
+    if backend == "process":
+        # the pipeline is sent once to each worker, then reused for every chunk
+        executor = ProcessPoolExecutor(max_workers=workers,
+                                       initializer=_init_worker,
+                                       initargs=(pipeline,))
+        return executor, _call_chunk_in_worker
+    raise ValueError(f"backend must be one of {BACKENDS}, not {backend!r}")
+
+def iter_chunks(iterable: Iterable[Any], chunksize: int) -> Generator[List[Any], None, None]:
+    """Split an iterable into lists of at most `chunksize` elements.
+
+    Args:
+        iterable (Iterable[Any]): source of the samples.
+        chunksize (int): maximum number of samples per chunk.
+
+    Raises:
+        ValueError: chunksize is less than 1.
+
+    Yields:
+        List[Any]: the chunks, in the order of the source.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, not {chunksize}")
+
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+def imap_bounded(executor: Executor,
+                 func: Callable[[List[Any]], List[Any]],
+                 chunks: Iterable[List[Any]],
+                 max_in_flight: int,
+                 ordered: bool = True,
+                 ) -> Generator[List[Any], None, None]:
+    """Run `func` on every chunk with `executor`, with at most `max_in_flight` chunks submitted.
+
+    A new chunk is pulled from `chunks` only when a submitted one is consumed, so a slow
+    consumer blocks the source instead of accumulating results.
+
+    Args:
+        executor (Executor): executor running the chunks.
+        func (Callable[[List[Any]], List[Any]]): function processing a chunk.
+        chunks (Iterable[List[Any]]): source of the chunks.
+        max_in_flight (int): maximum number of chunks submitted at the same time.
+        ordered (bool, optional): yield the results in the order of the source, otherwise
+            as soon as they are completed. Defaults to True.
+
+    Raises:
+        ValueError: max_in_flight is less than 1.
+
+    Yields:
+        List[Any]: the result of `func` for each chunk.
+    """
+    if max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be at least 1, not {max_in_flight}")
+
+    chunks = iter(chunks)
+    pending: deque[Future] = deque()
+    try:
+        while True:
+            # submit until the bound is reached or the source is exhausted
+            while len(pending) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append(executor.submit(func, chunk))
+
+            if len(pending) == 0:
+                return
+
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+                pending.remove(future)
+            yield future.result()
+    finally:
+        # consumer stopped early or a chunk failed
+        for future in pending:
+            future.cancel()
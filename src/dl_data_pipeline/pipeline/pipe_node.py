@@ -35,9 +35,12 @@ Usage Example:
 
 
 from __future__ import annotations
+import operator
 from collections.abc import Callable, Generator
 from typing import Any
 
+from .deferred_call import DeferredCall
+
 class PipelineNode:
     """
     A class representing a node in a data processing pipeline.
@@ -53,6 +56,9 @@ class PipelineNode:
             to the function. Defaults to None.
         name (str | None, optional): An optional name for the node. Defaults to None.
     """
+    # graphs can have many nodes, no per instance __dict__
+    __slots__ = ("__parent", "__name", "__func", "__value", "__n_iter")
+
     def __init__(self,
                  func: Callable = None,
                  parent: list[PipelineNode] | None = None,
@@ -73,6 +79,25 @@ class PipelineNode:
         """
         return self.__value
 
+    @property
+    def name(self) -> str | None:
+        """Name of the node.
+
+        Returns:
+            str | None: the name given by the user, None if not set.
+        """
+        return self.__name
+
+    @property
+    def func(self) -> Callable | None:
+        """Function computed by the node.
+
+        Returns:
+            Callable | None: function applied on the parent values, `None` for
+                nodes that only hold a value (e.g. `InputNode`).
+        """
+        return self.__func
+
     @property
     def parent(self) -> list[PipelineNode]:
         """Parents of the node
@@ -120,18 +145,10 @@ class PipelineNode:
         >>> name = x[0]  # node representing the 'name'
         >>> path = x[1]  # node representing the 'path'
         """      
-        # define the lambda
-        def get_item(*_):
-            if hasattr(self.value, '__getitem__'):
-                return self.value[key]
-            else:
-                raise TypeError(f"value of this node of type {type(self.value)} "
-                                "cannot be accessed with [] "
-                                "ensure graph construction is made properly")
-        
-        # make it named like the __get_item__ function
-        get_item.__name__ = "__getitem__"
-        
+        # operator.getitem(value, key) is applied on the parent value,
+        # stored as a DeferredCall so the node holds no state and can be pickled
+        get_item = DeferredCall(operator.getitem, (key,), name="__getitem__")
+
         # create a Functional Node that will dynamically get the keyth result
         # in the parent Node
         return PipelineNode(get_item, parent=[self], name = "__getitem__")
@@ -0,0 +1,129 @@
+"""
+profiler.py
+
+This module defines the `Profiler` class, a `NodeHook` recording the cost of each node of a
+pipeline, usually created by `Pipeline.profile`.
+
+Classes:
+    Profiler: Records per node wall time, number of calls and size of the outputs.
+"""
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+from .hooks import NodeHook
+from .pipe_node import PipelineNode
+
+class Profiler(NodeHook):
+    """
+    Records per node wall time, number of calls and size of the outputs.
+
+    Nodes are labelled by their name, or the name of their function, with the position of the
+    node in `nodes` (or the order the nodes were first computed in) to tell apart the nodes
+    calling the same function.
+
+    With `Pipeline.map(backend="process")`, the nodes are computed by copies of the profiler
+    in the worker processes, only the thread backend is recorded.
+
+    Args:
+        nodes (List[PipelineNode] | None, optional): nodes of the pipeline in topological order,
+            used to label the nodes. Defaults to None.
+
+    Example:
+
+    >>> with pipeline.profile() as profiler:
+    >>>     for path in paths:
+    >>>         pipeline(path)
+    >>> print(profiler.table())
+    """
+    def __init__(self, nodes: List[PipelineNode] | None = None) -> None:
+        self.__order = {node: i for i, node in enumerate(nodes)} if nodes is not None else {}
+        self.__stats: Dict[PipelineNode, List[Any]] = {}
+        self.__lock = threading.Lock()
+
+    def after_node(self, node: PipelineNode, output: Any, elapsed: float) -> None:
+        nbytes = getattr(output, "nbytes", 0)
+        shape = getattr(output, "shape", None)
+        with self.__lock:
+            stats = self.__stats.get(node)
+            if stats is None:
+                # calls, total time, total bytes, last shape
+                stats = self.__stats[node] = [0, 0.0, 0, None]
+                self.__order.setdefault(node, len(self.__order))
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += nbytes
+            stats[3] = shape
+
+    def reset(self) -> None:
+        """Forget the recorded calls."""
+        with self.__lock:
+            self.__stats.clear()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of each computed node, the slowest first.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: for each node label, "calls", "total_time" and
+                "mean_time" in seconds, "mean_bytes" of the outputs (arrays only) and
+                "shape" of the last output (None if it isn't an array).
+        """
+        with self.__lock:
+            items = [(node, list(stats)) for node, stats in self.__stats.items()]
+
+        report = {}
+        for node, (calls, total_time, nbytes, shape) in sorted(items, key=lambda item: -item[1][1]):
+            report[self._label(node)] = {"calls": calls,
+                                         "total_time": total_time,
+                                         "mean_time": total_time / calls,
+                                         "mean_bytes": nbytes // calls,
+                                         "shape": shape}
+        return report
+
+    def table(self) -> str:
+        """Format the report as a table, the slowest node first.
+
+        Returns:
+            str: the table.
+        """
+        rows: List[Tuple[str, ...]] = [("node", "calls", "total (ms)", "mean (ms)", "mean bytes", "shape")]
+        for label, stats in self.report().items():
+            rows.append((label,
+                         str(stats["calls"]),
+                         f"{stats['total_time'] * 1e3:.3f}",
+                         f"{stats['mean_time'] * 1e3:.3f}",
+                         str(stats["mean_bytes"]),
+                         str(stats["shape"]) if stats["shape"] is not None else "-"))
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = ["  ".join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                           for i, (cell, width) in enumerate(zip(row, widths)))
+                 for row in rows]
+        lines.insert(1, "-" * len(lines[0]))
+        return "\n".join(lines)
+
+    def _label(self, node: PipelineNode) -> str:
+        """Label of a node in the report.
+
+        Args:
+            node (PipelineNode): the node.
+
+        Returns:
+            str: name of the node or of its function, with its position.
+        """
+        name = node.name
+        if name is None:
+            name = getattr(node.func, "__name__", type(node.func).__name__)
+        return f"{self.__order[node]}:{name}"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_Profiler__lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(nodes = {len(self.__stats)})"
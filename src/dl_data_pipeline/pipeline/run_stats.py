@@ -0,0 +1,108 @@
+"""
+run_stats.py
+
+This module defines the `RunStats` class, which collects throughput statistics of a bulk
+execution of a pipeline (e.g. `Pipeline.map`).
+
+Classes:
+    RunStats: Counts the processed samples and measures the elapsed time of a run.
+"""
+
+import time
+
+class RunStats:
+    """
+    Throughput statistics of a bulk execution of a pipeline.
+
+    An instance can be passed to the bulk execution methods of `Pipeline`, it is
+    updated while results are yielded, so it can be read during the run as well as
+    after it.
+
+    Example:
+
+    >>> stats = RunStats()
+    >>> for result in pipeline.map(paths, workers=8, stats=stats):
+    >>>     ...
+    >>> print(stats.throughput)  # samples per second
+    """
+    def __init__(self) -> None:
+        self.__samples = 0
+        self.__failures = 0
+        self.__start_time: float | None = None
+        self.__end_time: float | None = None
+
+    @property
+    def samples(self) -> int:
+        """Number of samples processed so far.
+
+        Returns:
+            int: number of samples.
+        """
+        return self.__samples
+
+    @property
+    def failures(self) -> int:
+        """Number of samples which failed so far, counted in `samples` too.
+
+        Returns:
+            int: number of failed samples.
+        """
+        return self.__failures
+
+    @property
+    def elapsed(self) -> float:
+        """Elapsed time of the run in seconds.
+
+        Returns:
+            float: elapsed time, 0 if the run didn't start.
+        """
+        if self.__start_time is None:
+            return 0.0
+        end_time = self.__end_time if self.__end_time is not None else time.perf_counter()
+        return end_time - self.__start_time
+
+    @property
+    def throughput(self) -> float:
+        """Number of samples processed per second.
+
+        Returns:
+            float: samples per second, 0 if nothing was processed.
+        """
+        elapsed = self.elapsed
+        if elapsed == 0:
+            return 0.0
+        return self.__samples / elapsed
+
+    def _start(self) -> None:
+        """Mark the beginning of the run."""
+        self.__samples = 0
+        self.__failures = 0
+        self.__start_time = time.perf_counter()
+        self.__end_time = None
+
+    def _add_samples(self, num: int) -> None:
+        """Count processed samples.
+
+        Args:
+            num (int): number of samples to add.
+        """
+        self.__samples += num
+
+    def _add_failures(self, num: int) -> None:
+        """Count failed samples.
+
+        Args:
+            num (int): number of failures to add.
+        """
+        self.__failures += num
+
+    def _stop(self) -> None:
+        """Mark the end of the run."""
+        self.__end_time = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}("
+                f"samples = {self.__samples}, "
+                f"failures = {self.__failures}, "
+                f"elapsed = {self.elapsed:.3f}s, "
+                f"throughput = {self.throughput:.1f} samples/s)")
@@ -19,13 +19,35 @@ Submodules:
 
 These submodules provide a comprehensive set of tools for handling different types of data, ensuring that they are
 in the optimal format and condition for downstream tasks.
-"""
-
 
+Submodules and functions are imported on first access (PEP 562), so importing the package doesn't
+import the image helpers and OpenCV, e.g. in audio only worker processes.
+"""
 
-from .any_process import rescale
-from .process_1d import rpad_rcut
-from .process_2d import (
-    resize_with_max_distortion, 
-    open_rgb_image,
-    image_chw_to_hwc, image_hwc_to_chw)
\ No newline at end of file
+import importlib
+from typing import Any, List
+
+_SUBMODULES = ("any_process", "process_1d", "process_2d")
+
+# function re-exported by the package -> submodule defining it
+_FUNCTIONS = {
+    "rescale": "any_process",
+    "rpad_rcut": "process_1d",
+    "resize_with_max_distortion": "process_2d",
+    "open_rgb_image": "process_2d",
+    "open_and_resize": "process_2d",
+    "decode_image": "process_2d",
+    "image_chw_to_hwc": "process_2d",
+    "image_hwc_to_chw": "process_2d",
+}
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _FUNCTIONS:
+        module = importlib.import_module(f".{_FUNCTIONS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_SUBMODULES, *_FUNCTIONS])
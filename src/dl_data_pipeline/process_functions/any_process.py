@@ -50,4 +50,18 @@ def rescale(data: np.ndarray, min_value: float = 0.0, max_value: float = 1.0) ->
     # Translate data to start from min_value
     data = data + min_value
 
-    return data
\ No newline at end of file
+    return data
+
+@rescale.register_batched
+def _rescale_batched(data: np.ndarray, min_value: float = 0.0, max_value: float = 1.0) -> np.ndarray:
+    """Batched `rescale`, each sample is rescaled with its own minimum and maximum."""
+    axis = tuple(range(1, data.ndim))
+    data_min = np.min(data, axis=axis, keepdims=True)
+    data_max = np.max(data, axis=axis, keepdims=True)
+    data_range = data_max - data_min
+    target_range = max_value - min_value
+
+    if np.any(data_range == 0):
+        raise ValueError("Data range is zero, cannot rescale a constant array.")
+
+    return (data - data_min) * (target_range / data_range) + min_value
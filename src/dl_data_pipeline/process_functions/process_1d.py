@@ -1,12 +1,41 @@
 import numpy as np
 from ..deferred import deferred_execution
+from ..pipeline.buffer_pool import register_buffered, resolve_out
+
+def _pad(data: np.ndarray, length: int, offset: int, out) -> np.ndarray:
+    """Place the audio at `offset` in a zero array of `length` along the last axis.
+
+    The result has the dtype of the concatenation of the audio with float64 zeros, or the
+    dtype of `out`. Only the padding is zeroed, the audio is written once.
+    """
+    shape = (*data.shape[:-1], length)
+    dtype = np.result_type(data.dtype, np.float64)
+    result = resolve_out(out, shape, dtype)
+    if result is None:
+        result = np.empty(shape, dtype)
+    end = offset + data.shape[-1]
+    result[..., :offset] = 0
+    result[..., end:] = 0
+    result[..., offset:end] = data
+    return result
+
+def _cut(data: np.ndarray, out) -> np.ndarray:
+    """The cut audio, a view, or copied in `out`."""
+    result = resolve_out(out, data.shape, data.dtype)
+    if result is None:
+        return data
+    np.copyto(result, data, casting="unsafe")
+    return result
 
 @deferred_execution
-def rpad_rcut(data : np.ndarray, desired_audio_length : int) -> np.ndarray:
+def rpad_rcut(data : np.ndarray, desired_audio_length : int, out = None) -> np.ndarray:
     """ Pad or cut the audio array so that output has a length equal to desired_audio_length
     Args:
         data (np.ndarray): the input audio array
         desired_audio_length (int): the target length for the audio
+        out (np.ndarray | Callable | None, optional): array receiving the result, or
+            allocator `(shape, dtype) -> array`. Defaults to None, a new array is padded
+            and a view is cut.
     Return
         (np.ndarray): correctly shaped audio array
 
@@ -22,18 +51,31 @@ def rpad_rcut(data : np.ndarray, desired_audio_length : int) -> np.ndarray:
     assert len(data.shape) == 2, "Audio should be 2D array, use reshape(1, -1) for 1D array"
     audio_length = data.shape[1]
     if audio_length < desired_audio_length:
-        padding_array = np.zeros((data.shape[0], desired_audio_length - audio_length))
-        return np.concatenate((data, padding_array), axis = 1)
+        return _pad(data, desired_audio_length, 0, out)
 
     # Else
-    return data[:,:desired_audio_length]
+    return _cut(data[:,:desired_audio_length], out)
+
+@rpad_rcut.register_batched
+def _rpad_rcut_batched(data : np.ndarray, desired_audio_length : int, out = None) -> np.ndarray:
+    """ Batched `rpad_rcut`, data has a leading batch axis """
+    assert len(data.shape) == 3, "Audio batch should be 3D array"
+    audio_length = data.shape[2]
+    if audio_length < desired_audio_length:
+        return _pad(data, desired_audio_length, 0, out)
+
+    # Else
+    return _cut(data[:,:,:desired_audio_length], out)
 
 @deferred_execution
-def lpad_lcut(data : np.ndarray, desired_audio_length : int) -> np.ndarray:
+def lpad_lcut(data : np.ndarray, desired_audio_length : int, out = None) -> np.ndarray:
     """ Pad or cut the audio array so that output has a length equal to desired_audio_length
     Args:
         data (np.ndarray): the input audio array
         desired_audio_length (int): the target length for the audio
+        out (np.ndarray | Callable | None, optional): array receiving the result, or
+            allocator `(shape, dtype) -> array`. Defaults to None, a new array is padded
+            and a view is cut.
     Return
         (np.ndarray): correctly shaped audio array
 
@@ -49,18 +91,31 @@ def lpad_lcut(data : np.ndarray, desired_audio_length : int) -> np.ndarray:
     assert len(data.shape) == 2, "Audio should be 2D array, use reshape(1, -1) for 1D array"
     audio_length = data.shape[1]
     if audio_length < desired_audio_length:
-        padding_array = np.zeros((data.shape[0], desired_audio_length - audio_length))
-        return np.concatenate((padding_array, data), axis = 1)
+        return _pad(data, desired_audio_length, desired_audio_length - audio_length, out)
+
+    # Else
+    return _cut(data[:,desired_audio_length:], out)
+
+@lpad_lcut.register_batched
+def _lpad_lcut_batched(data : np.ndarray, desired_audio_length : int, out = None) -> np.ndarray:
+    """ Batched `lpad_lcut`, data has a leading batch axis """
+    assert len(data.shape) == 3, "Audio batch should be 3D array"
+    audio_length = data.shape[2]
+    if audio_length < desired_audio_length:
+        return _pad(data, desired_audio_length, desired_audio_length - audio_length, out)
 
     # Else
-    return data[:,desired_audio_length:]
+    return _cut(data[:,:,desired_audio_length:], out)
 
 @deferred_execution
-def center_pad_rcut(data : np.ndarray, desired_audio_length : int) -> np.ndarray:
+def center_pad_rcut(data : np.ndarray, desired_audio_length : int, out = None) -> np.ndarray:
     """ Pad or cut the audio array so that output has a length equal to desired_audio_length
     Args:
         data (np.ndarray): the input audio array
         desired_audio_length (int): the target length for the audio
+        out (np.ndarray | Callable | None, optional): array receiving the result, or
+            allocator `(shape, dtype) -> array`. Defaults to None, a new array is padded
+            and a view is cut.
     Return
         (np.ndarray): correctly shaped audio array
 
@@ -77,10 +132,23 @@ def center_pad_rcut(data : np.ndarray, desired_audio_length : int) -> np.ndarray
     audio_length = data.shape[1]
     if audio_length < desired_audio_length:
         l_pad_length = (desired_audio_length - audio_length) // 2
-        r_pad_length = l_pad_length + (desired_audio_length - audio_length) % 2
-        l_padding_array = np.zeros((data.shape[0], l_pad_length))
-        r_padding_array = np.zeros((data.shape[0], r_pad_length))
-        return np.concatenate((l_padding_array, data, r_padding_array), axis = 1)
+        return _pad(data, desired_audio_length, l_pad_length, out)
 
     # Else
-    return data[:,:desired_audio_length]
\ No newline at end of file
+    return _cut(data[:,:desired_audio_length], out)
+
+@center_pad_rcut.register_batched
+def _center_pad_rcut_batched(data : np.ndarray, desired_audio_length : int, out = None) -> np.ndarray:
+    """ Batched `center_pad_rcut`, data has a leading batch axis """
+    assert len(data.shape) == 3, "Audio batch should be 3D array"
+    audio_length = data.shape[2]
+    if audio_length < desired_audio_length:
+        l_pad_length = (desired_audio_length - audio_length) // 2
+        return _pad(data, desired_audio_length, l_pad_length, out)
+
+    # Else
+    return _cut(data[:,:,:desired_audio_length], out)
+
+for _func in (rpad_rcut, lpad_lcut, center_pad_rcut):
+    register_buffered(_func.__wrapped__)
+del _func
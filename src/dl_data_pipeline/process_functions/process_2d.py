@@ -1,13 +1,14 @@
-from typing import Tuple
+from typing import List, Tuple
 from collections.abc import Callable
 
-import cv2
 import numpy as np
 
 from ..deferred import deferred_execution
+from ..pipeline.deferred_call import DeferredCall
+from ..pipeline.buffer_pool import register_buffered, resolve_out
 
 @deferred_execution
-def padding_2d(data: np.ndarray, target_shape: Tuple[int, int], fill_value: float = 1.0) -> np.ndarray:
+def padding_2d(data: np.ndarray, target_shape: Tuple[int, int], fill_value: float = 1.0, out = None) -> np.ndarray:
     """
     Pads a 2D (or 3D) array to the target shape with the specified fill value.
 
@@ -15,6 +16,8 @@ def padding_2d(data: np.ndarray, target_shape: Tuple[int, int], fill_value: floa
         data (np.ndarray): The input 2D (or 3D) array representing an image.
         target_shape (tuple): The desired shape of the output array (height, width).
         fill_value (float, optional): The value used for padding. Defaults to 1.0.
+        out (np.ndarray | Callable | None, optional): array receiving the result, or
+            allocator `(shape, dtype) -> array`. Defaults to None, a new array.
 
     Returns:
         np.ndarray: The padded array with the target shape.
@@ -47,51 +50,62 @@ def padding_2d(data: np.ndarray, target_shape: Tuple[int, int], fill_value: floa
         raise ValueError("Data shape must be smaller than target shape to add padding"
                          f"target : {target_shape} ; data shape : {shape}")
 
-    # Create an array with the fill value
-    padded_data = np.full(target_shape, fill_value, dtype=data.dtype)
-
     # Find padding lengths (for centering)
     l_pad = (target_shape[0] - shape[0]) // 2
     t_pad = (target_shape[1] - shape[1]) // 2
 
-    # Fill the array with the original image, centering it
-    if len(shape) == 2:
-        padded_data[l_pad:l_pad+shape[0], t_pad:t_pad+shape[1]] = data
-    else:
-        padded_data[l_pad:l_pad+shape[0], t_pad:t_pad+shape[1], :] = data
+    # Fill the borders with the fill value and the center with the original image
+    padded_data = resolve_out(out, target_shape, data.dtype)
+    if padded_data is None:
+        padded_data = np.empty(target_shape, dtype=data.dtype)
+    _fill_borders(padded_data, l_pad, t_pad, shape[0], shape[1], fill_value)
+    padded_data[l_pad:l_pad+shape[0], t_pad:t_pad+shape[1]] = data
 
     return padded_data
 
-@deferred_execution
-def resize_with_max_distortion(data: np.ndarray,
-                               target_shape: Tuple[int, int],
-                               max_ratio_distortion: float) -> np.ndarray:
-    """
-    Resizes the input 2D or 3D array (image) to the target shape with a constraint on maximum allowable distortion.
+@padding_2d.register_batched
+def _padding_2d_batched(data: np.ndarray, target_shape: Tuple[int, int], fill_value: float = 1.0, out = None) -> np.ndarray:
+    """Batched `padding_2d`, data has a leading batch axis."""
+    shape = data.shape
+    if len(shape) not in [3, 4]:
+        raise ValueError("Input data must be a batch of 2D or 3D arrays")
 
-    This function resizes an image (or any 2D/3D array) to a specified target shape while controlling the amount
-    of distortion (change in aspect ratio) allowed during the resizing process. If the distortion exceeds the
-    specified `max_ratio_distortion`, the function adjusts the stretch ratios accordingly to minimize distortion.
+    target_shape = (shape[0], *target_shape, *shape[3:])
+    if any(s > t for s, t in zip(shape, target_shape)):
+        raise ValueError("Data shape must be smaller than target shape to add padding"
+                         f"target : {target_shape[1:]} ; data shape : {shape[1:]}")
+
+    l_pad = (target_shape[1] - shape[1]) // 2
+    t_pad = (target_shape[2] - shape[2]) // 2
+    padded_data = resolve_out(out, target_shape, data.dtype)
+    if padded_data is None:
+        padded_data = np.empty(target_shape, dtype=data.dtype)
+    _fill_borders(np.moveaxis(padded_data, 0, 2), l_pad, t_pad, shape[1], shape[2], fill_value)
+    padded_data[:, l_pad:l_pad+shape[1], t_pad:t_pad+shape[2]] = data
+    return padded_data
+
+def _fill_borders(padded: np.ndarray, top: int, left: int, height: int, width: int, fill_value: float) -> None:
+    """Fill the borders around the (height, width) area at (top, left) of the 2 first axes."""
+    padded[:top] = fill_value
+    padded[top+height:] = fill_value
+    padded[top:top+height, :left] = fill_value
+    padded[top:top+height, left+width:] = fill_value
+
+def _resized_shape(height: int,
+                   width: int,
+                   target_shape: Tuple[int, int],
+                   max_ratio_distortion: float) -> Tuple[int, int]:
+    """Shape of an image of shape (height, width) resized by `resize_with_max_distortion`.
 
     Args:
-        data (np.ndarray): The input 2D or 3D array to be resized. Typically, this represents an image.
-        target_shape (Tuple[int, int]): The desired target shape (height, width) for the output array.
-        max_ratio_distortion (float): The maximum allowable difference between the horizontal and vertical
-                                      stretch ratios. This controls how much the aspect ratio can change during
-                                      resizing. 0 as max distortion ensures aspect ratio is kept.
+        height (int): height of the image.
+        width (int): width of the image.
+        target_shape (Tuple[int, int]): the target shape (height, width).
+        max_ratio_distortion (float): the maximum allowable distortion of the aspect ratio.
 
     Returns:
-        np.ndarray: The resized array that fits within the specified target shape.
-
-    Raises:
-        ValueError: If the input data is not a 2D or 3D array.
+        Tuple[int, int]: height and width of the resized image.
     """
-    # Validate input dimensions
-    if len(data.shape) not in [2, 3]:
-        raise ValueError("Input data is not a 2D or 3D array")
-
-    # Get original dimensions
-    height, width = data.shape[:2]
     target_height, target_width = target_shape
 
     # Calculate aspect ratios
@@ -125,7 +139,40 @@ def resize_with_max_distortion(data: np.ndarray,
     new_height = min(new_height, target_height)
     new_width = min(new_width, target_width)
 
-    # Resize the image
+    return new_height, new_width
+
+@deferred_execution
+def resize_with_max_distortion(data: np.ndarray,
+                               target_shape: Tuple[int, int],
+                               max_ratio_distortion: float) -> np.ndarray:
+    """
+    Resizes the input 2D or 3D array (image) to the target shape with a constraint on maximum allowable distortion.
+
+    This function resizes an image (or any 2D/3D array) to a specified target shape while controlling the amount
+    of distortion (change in aspect ratio) allowed during the resizing process. If the distortion exceeds the
+    specified `max_ratio_distortion`, the function adjusts the stretch ratios accordingly to minimize distortion.
+
+    Args:
+        data (np.ndarray): The input 2D or 3D array to be resized. Typically, this represents an image.
+        target_shape (Tuple[int, int]): The desired target shape (height, width) for the output array.
+        max_ratio_distortion (float): The maximum allowable difference between the horizontal and vertical
+                                      stretch ratios. This controls how much the aspect ratio can change during
+                                      resizing. 0 as max distortion ensures aspect ratio is kept.
+
+    Returns:
+        np.ndarray: The resized array that fits within the specified target shape.
+
+    Raises:
+        ValueError: If the input data is not a 2D or 3D array.
+    """
+    # Validate input dimensions
+    if len(data.shape) not in [2, 3]:
+        raise ValueError("Input data is not a 2D or 3D array")
+
+    new_height, new_width = _resized_shape(*data.shape[:2], target_shape, max_ratio_distortion)
+
+    # Resize the image, OpenCV is imported on first use (it takes hundreds of ms)
+    import cv2
     resized_image = cv2.resize(data, (new_width, new_height))
 
     return resized_image
@@ -145,10 +192,195 @@ def open_rgb_image(path: str) -> np.ndarray:
         >>> img.shape
         (height, width, 3)
     """
+    import cv2
     img = cv2.imread(path)
-    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    img_array = np.array(img_rgb)
-    return img_array
+    # cvtColor returns a new array, no need to copy it
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+# color modes of `decode_image`
+COLOR_MODES = ("rgb", "bgr", "gray", "unchanged")
+
+@deferred_execution
+def decode_image(source: str | bytes | bytearray | memoryview | np.ndarray,
+                 color: str = "rgb",
+                 dtype: np.dtype | type | None = None,
+                 out: np.ndarray | None = None) -> np.ndarray:
+    """Decode an image from a file or from its encoded bytes, without needless copies.
+
+    The decoded array is the only full size allocation: the BGR to RGB conversion is done in
+    place, or directly into `out`. Encoded bytes (e.g. read from an archive or a cache) are
+    decoded with `cv2.imdecode`, without temporary file.
+
+    Args:
+        source (str | bytes | bytearray | memoryview | np.ndarray): path of the image, or
+            its encoded bytes (a uint8 array is read as bytes too).
+        color (str, optional): "rgb" or "bgr" for 3 channels, "gray" for a 2D array,
+            "unchanged" to keep the channels of the file (e.g. alpha, 16 bits).
+            Defaults to "rgb".
+        dtype (np.dtype | type | None, optional): dtype of the output, the values are cast
+            without scaling. Defaults to None, the dtype of the file (uint8 mostly).
+        out (np.ndarray | None, optional): array receiving the image, of the decoded
+            shape. Its dtype is used if dtype is None. Defaults to None.
+
+    Raises:
+        ValueError: unknown color mode, the image can't be decoded, or out doesn't have
+            the shape of the image.
+
+    Returns:
+        np.ndarray: the image, `out` if it is given.
+
+    Examples:
+        >>> with zipfile.ZipFile("images.zip") as archive:
+        >>>     img = decode_image(archive.read("cat.jpg"), color="gray", dtype=np.float32)
+        >>> img.shape
+        (height, width)
+    """
+    if color not in COLOR_MODES:
+        raise ValueError(f"color must be one of {COLOR_MODES}, not {color!r}")
+
+    import cv2
+    flag = {"rgb": cv2.IMREAD_COLOR,
+            "bgr": cv2.IMREAD_COLOR,
+            "gray": cv2.IMREAD_GRAYSCALE,
+            "unchanged": cv2.IMREAD_UNCHANGED}[color]
+    if isinstance(source, str):
+        img = cv2.imread(source, flag)
+        name = source
+    else:
+        buffer = np.frombuffer(source, dtype=np.uint8)
+        img = cv2.imdecode(buffer, flag) if buffer.size != 0 else None
+        name = f"of {buffer.size} bytes"
+    if img is None:
+        raise ValueError(f"Can't decode the image {name}")
+
+    if out is not None and out.shape != img.shape:
+        raise ValueError(f"out has shape {out.shape}, the image has shape {img.shape}")
+    if dtype is not None and out is not None and np.dtype(dtype) != out.dtype:
+        raise ValueError(f"out has dtype {out.dtype}, not {np.dtype(dtype)}")
+
+    # OpenCV writes into dst only if it's contiguous
+    if out is not None and out.dtype == img.dtype and out.flags.c_contiguous:
+        if color == "rgb":
+            cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=out)
+        else:
+            np.copyto(out, img)
+        return out
+
+    if color == "rgb":
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
+    if out is not None:
+        np.copyto(out, img, casting="unsafe")
+        return out
+    if dtype is not None:
+        return img.astype(dtype, copy=False)
+    return img
+
+# JPEG decoding at 1/2, 1/4 or 1/8 of the resolution, largest reduction first
+_REDUCED_JPEG_FLAGS = (("IMREAD_REDUCED_COLOR_8", 8), ("IMREAD_REDUCED_COLOR_4", 4), ("IMREAD_REDUCED_COLOR_2", 2))
+
+@deferred_execution
+def open_and_resize(path: str, target_shape: Tuple[int, int], max_ratio_distortion: float) -> np.ndarray:
+    """Open an image as RGB and resize it like `resize_with_max_distortion`.
+
+    The size of a JPEG image is read from its header, and the image is decoded directly at
+    the smallest resolution (1/2, 1/4 or 1/8, with `cv2.IMREAD_REDUCED_COLOR_*`) still at
+    least as large as the resized image. The reduced decoding is several times faster and
+    never holds the full resolution image. Other formats are decoded at full resolution.
+
+    The output has the shape of `resize_with_max_distortion(open_rgb_image(path), ...)`, its
+    values differ slightly since the decoder downscales the image before the resize.
+
+    A `Pipeline` built with `fuse_nodes=True` replaces an `open_rgb_image` node only consumed
+    by a `resize_with_max_distortion` node by this function.
+
+    Args:
+        path (str): path of the image.
+        target_shape (Tuple[int, int]): The desired target shape (height, width).
+        max_ratio_distortion (float): The maximum allowable distortion of the aspect ratio,
+            see `resize_with_max_distortion`.
+
+    Raises:
+        ValueError: the image can't be opened.
+
+    Returns:
+        np.ndarray: the resized RGB image.
+
+    Examples:
+        >>> img = open_and_resize('path/to/photo.jpg', (224, 224), 0.1)
+        >>> img.shape
+        (224, 224, 3)
+    """
+    import cv2
+    flag, factor = cv2.IMREAD_COLOR, 1
+    size = _jpeg_size(path)
+    if size is not None:
+        # EXIF orientation may swap the axes, the reduced image must be large enough both ways
+        height, width = size
+        height_1, width_1 = _resized_shape(height, width, target_shape, max_ratio_distortion)
+        height_2, width_2 = _resized_shape(width, height, target_shape, max_ratio_distortion)
+        for name, candidate in _REDUCED_JPEG_FLAGS:
+            if height // candidate >= max(height_1, width_2) and width // candidate >= max(width_1, height_2):
+                flag, factor = getattr(cv2, name), candidate
+                break
+
+    img = cv2.imread(path, flag)
+    if img is None:
+        raise ValueError(f"Can't open the image {path}")
+    cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
+
+    # the resized shape is the one of the full resolution image, in the orientation of the decoded one
+    height, width = img.shape[:2]
+    if factor != 1:
+        height, width = size if (height >= width) == (size[0] >= size[1]) else size[::-1]
+    new_height, new_width = _resized_shape(height, width, target_shape, max_ratio_distortion)
+    return cv2.resize(img, (new_width, new_height))
+
+@open_rgb_image.register_fused(resize_with_max_distortion)
+def _fuse_open_and_resize(open_call: DeferredCall, resize_call: DeferredCall) -> DeferredCall:
+    """Call of `open_and_resize` computing the resize of the opened image."""
+    return DeferredCall(open_and_resize.__wrapped__, resize_call.args, resize_call.kwargs, "open_and_resize")
+
+# markers of the JPEG frame headers holding the image size (SOF0 to SOF15, without DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _jpeg_size(path: str) -> Tuple[int, int] | None:
+    """Read the size of a JPEG image from its frame header, without decoding it.
+
+    Args:
+        path (str): path of the image.
+
+    Returns:
+        Tuple[int, int] | None: height and width, None if the file isn't a JPEG image or
+            its header can't be read.
+    """
+    try:
+        with open(path, "rb") as fp:
+            if fp.read(2) != b"\xff\xd8":
+                return None
+            while True:
+                byte = fp.read(1)
+                if byte != b"\xff":
+                    return None
+                marker = fp.read(1)
+                while marker == b"\xff":  # fill bytes
+                    marker = fp.read(1)
+                if len(marker) == 0:
+                    return None
+                code = marker[0]
+                if code == 0x01 or 0xD0 <= code <= 0xD7:  # markers without segment
+                    continue
+                header = fp.read(2)
+                if len(header) != 2 or code == 0xDA:  # start of scan before the frame header
+                    return None
+                length = int.from_bytes(header, "big")
+                if code in _JPEG_SOF_MARKERS:
+                    frame = fp.read(5)
+                    if len(frame) != 5:
+                        return None
+                    return int.from_bytes(frame[1:3], "big"), int.from_bytes(frame[3:5], "big")
+                fp.seek(length - 2, 1)
+    except (OSError, TypeError):
+        return None
 
 @deferred_execution
 def image_to_channel_num(image: np.ndarray,
@@ -194,13 +426,15 @@ def image_to_channel_num(image: np.ndarray,
     return image_3d
 
 @deferred_execution
-def image_hwc_to_chw(data: np.ndarray) -> np.ndarray:
+def image_hwc_to_chw(data: np.ndarray, out = None) -> np.ndarray:
     """
     Converts an image from HWC (Height-Width-Channel) format to CHW (Channel-Height-Width) format.
 
     Args:
         data (np.ndarray): The input image array in HWC format.
                            The shape should be (height, width, channels).
+        out (np.ndarray | Callable | None, optional): array receiving a contiguous copy, or
+            allocator `(shape, dtype) -> array`. Defaults to None, a view of data.
 
     Returns:
         np.ndarray: The image array in CHW format.
@@ -208,16 +442,25 @@ def image_hwc_to_chw(data: np.ndarray) -> np.ndarray:
     """
     if len(data.shape) != 3:
         raise ValueError("input data must be dim 3")
-    return np.transpose(data, [2, 0, 1])
+    return _transposed(data, [2, 0, 1], out)
+
+@image_hwc_to_chw.register_batched
+def _image_hwc_to_chw_batched(data: np.ndarray, out = None) -> np.ndarray:
+    """Batched `image_hwc_to_chw`, data has a leading batch axis."""
+    if len(data.shape) != 4:
+        raise ValueError("input data must be a batch of dim 3")
+    return _transposed(data, [0, 3, 1, 2], out)
 
 @deferred_execution
-def image_chw_to_hwc(data: np.ndarray) -> np.ndarray:
+def image_chw_to_hwc(data: np.ndarray, out = None) -> np.ndarray:
     """
     Converts an image from CHW (Channel-Height-Width) format to HWC (Height-Width-Channel) format.
 
     Args:
         data (np.ndarray): The input image array in CHW format.
                            The shape should be (channels, height, width).
+        out (np.ndarray | Callable | None, optional): array receiving a contiguous copy, or
+            allocator `(shape, dtype) -> array`. Defaults to None, a view of data.
 
     Returns:
         np.ndarray: The image array in HWC format.
@@ -225,7 +468,23 @@ def image_chw_to_hwc(data: np.ndarray) -> np.ndarray:
     """
     if len(data.shape) != 3:
         raise ValueError("input data must be dim 3")
-    return np.transpose(data, [1, 2, 0])
+    return _transposed(data, [1, 2, 0], out)
+
+@image_chw_to_hwc.register_batched
+def _image_chw_to_hwc_batched(data: np.ndarray, out = None) -> np.ndarray:
+    """Batched `image_chw_to_hwc`, data has a leading batch axis."""
+    if len(data.shape) != 4:
+        raise ValueError("input data must be a batch of dim 3")
+    return _transposed(data, [0, 2, 3, 1], out)
+
+def _transposed(data: np.ndarray, axes: List[int], out) -> np.ndarray:
+    """Transposed view of data, or its copy in `out`."""
+    transposed = np.transpose(data, axes)
+    result = resolve_out(out, transposed.shape, data.dtype)
+    if result is None:
+        return transposed
+    np.copyto(result, transposed, casting="unsafe")
+    return result
 
 
 def _reshape_array_for_pooling(data: np.ndarray, strides: int) -> np.ndarray:
@@ -248,8 +507,37 @@ def _reshape_array_for_pooling(data: np.ndarray, strides: int) -> np.ndarray:
     mw = w // strides
     return data[:mh*strides, :mw*strides].reshape(mh, strides, mw, strides, -1)
 
+def _reshape_batch_for_pooling(data: np.ndarray, strides: int) -> np.ndarray:
+    """Reshape a batch for pooling, same as `_reshape_array_for_pooling` for each sample.
+
+    Args:
+        data (np.ndarray): The input arrays, with a leading batch axis.
+        strides (int): The stride size that determines the size of the blocks used for pooling.
+
+    Returns:
+        np.ndarray: A reshaped array of shape (batch, mh, strides, mw, strides, -1).
+    """
+    b, h, w = data.shape[:3]
+    mh = h // strides
+    mw = w // strides
+    return data[:, :mh*strides, :mw*strides].reshape(b, mh, strides, mw, strides, -1)
+
+def _pool(pooled: np.ndarray, axis: Tuple[int, int], out, pooling_function: Callable, axis_kw: str = "axis") -> np.ndarray:
+    """Reduce the blocks of a reshaped array, in `out` if it's given.
+
+    The dtype of the output buffer is the one of the result, computed on the first block.
+    """
+    if out is None:
+        return pooling_function(pooled, **{axis_kw: axis})
+    shape = tuple(size for i, size in enumerate(pooled.shape) if i not in axis)
+    first_block = tuple(slice(None) if i in axis else slice(0, 1) for i in range(pooled.ndim))
+    dtype = np.asarray(pooling_function(pooled[first_block], **{axis_kw: axis})).dtype
+    result = resolve_out(out, shape, dtype)
+    pooling_function(pooled, **{axis_kw: axis}, out=result)
+    return result
+
 @deferred_execution
-def max_pooling_2d(data: np.ndarray, strides: int = 2) -> np.ndarray:
+def max_pooling_2d(data: np.ndarray, strides: int = 2, out = None) -> np.ndarray:
     """Apply 2D max pooling to the input data.
 
     This function applies max pooling to the input 2D array, reducing its size by selecting 
@@ -259,15 +547,24 @@ def max_pooling_2d(data: np.ndarray, strides: int = 2) -> np.ndarray:
         data (np.ndarray): The input array representing the image or data to be pooled.
         strides (int, optional): The stride size that determines the size of the blocks 
                                  used for pooling. Defaults to 2.
+        out (np.ndarray | Callable | None, optional): array receiving the result, or
+            allocator `(shape, dtype) -> array`. Defaults to None, a new array.
 
     Returns:
         np.ndarray: A 2D array where max pooling has been applied, reducing the size 
                     of the input array based on the stride.
     """
-    return _reshape_array_for_pooling(data, strides).max(axis=(1,3))
+    pooled = _reshape_array_for_pooling(data, strides)
+    return _pool(pooled, (1, 3), out, np.max)
+
+@max_pooling_2d.register_batched
+def _max_pooling_2d_batched(data: np.ndarray, strides: int = 2, out = None) -> np.ndarray:
+    """Batched `max_pooling_2d`, data has a leading batch axis."""
+    pooled = _reshape_batch_for_pooling(data, strides)
+    return _pool(pooled, (2, 4), out, np.max)
 
 @deferred_execution
-def avg_pooling_2d(data: np.ndarray, strides: int = 2) -> np.ndarray:
+def avg_pooling_2d(data: np.ndarray, strides: int = 2, out = None) -> np.ndarray:
     """Apply 2D average pooling to the input data.
 
     This function applies average pooling to the input 2D array, reducing its size by calculating 
@@ -277,19 +574,29 @@ def avg_pooling_2d(data: np.ndarray, strides: int = 2) -> np.ndarray:
         data (np.ndarray): The input array representing the image or data to be pooled.
         strides (int, optional): The stride size that determines the size of the blocks 
                                  used for pooling. Defaults to 2.
+        out (np.ndarray | Callable | None, optional): array receiving the result, or
+            allocator `(shape, dtype) -> array`. Defaults to None, a new array.
 
     Returns:
         np.ndarray: A 2D array where average pooling has been applied, reducing the size 
                     of the input array based on the stride.
     """
-    return _reshape_array_for_pooling(data, strides).mean(axis=(1,3))
+    pooled = _reshape_array_for_pooling(data, strides)
+    return _pool(pooled, (1, 3), out, np.mean)
+
+@avg_pooling_2d.register_batched
+def _avg_pooling_2d_batched(data: np.ndarray, strides: int = 2, out = None) -> np.ndarray:
+    """Batched `avg_pooling_2d`, data has a leading batch axis."""
+    pooled = _reshape_batch_for_pooling(data, strides)
+    return _pool(pooled, (2, 4), out, np.mean)
 
 @deferred_execution
 def any_pooling_2d(
     data: np.ndarray, 
     strides: int = 2, *, 
     pooling_function: Callable,
-    axis_kw: str = "axis") -> np.ndarray:
+    axis_kw: str = "axis",
+    out = None) -> np.ndarray:
     """Apply a custom pooling operation to the input data.
 
     This function allows for flexible pooling operations by accepting a custom pooling 
@@ -306,12 +613,28 @@ def any_pooling_2d(
         axis_kw (str, optional): The keyword name for specifying the axis along which 
                                  pooling should be applied in the custom pooling function. 
                                  Defaults to "axis".
+        out (np.ndarray | Callable | None, optional): array receiving the result, or
+            allocator `(shape, dtype) -> array`, the pooling function must accept an `out`
+            argument. Defaults to None.
 
     Returns:
         np.ndarray: A 2D array where the custom pooling function has been applied, 
                     reducing the size of the input array based on the stride.
     """
     pooled = _reshape_array_for_pooling(data, strides)
-    kw = {axis_kw: (1,3)}
-    return pooling_function(pooled, **kw)
+    return _pool(pooled, (1, 3), out, pooling_function, axis_kw)
 
+@any_pooling_2d.register_batched
+def _any_pooling_2d_batched(
+    data: np.ndarray,
+    strides: int = 2, *,
+    pooling_function: Callable,
+    axis_kw: str = "axis",
+    out = None) -> np.ndarray:
+    """Batched `any_pooling_2d`, data has a leading batch axis."""
+    pooled = _reshape_batch_for_pooling(data, strides)
+    return _pool(pooled, (2, 4), out, pooling_function, axis_kw)
+
+for _func in (padding_2d, image_hwc_to_chw, image_chw_to_hwc, max_pooling_2d, avg_pooling_2d):
+    register_buffered(_func.__wrapped__)
+del _func
@@ -8,9 +8,14 @@ Classes:
 - `ShapeValidator`: Validates that the data has a specific shape.
 - `MinMaxValidator`: Ensures that the minimum and maximum values of the data fall within specified bounds.
 - `MeanVarValidator`: Validates that the mean and variance of the data are within acceptable ranges.
+- `StatisticsValidator`: Checks the bounds of `MinMaxValidator` and `MeanVarValidator` in a single pass over the data.
+- `SampledValidator`: Runs an other validator on a sample of the calls or of the array elements.
+- `DriftValidator`: Checks the running statistics of all the validated data, to detect a drift of the distribution.
+- `RunningStatistics`: Mergeable accumulator of the count, mean, variance, extrema and histogram of a stream of arrays.
 
 Exceptions:
 - `ValidationError`: Raised when data does not meet the validation criteria defined by any of the validators.
+- `BatchValidationError`: Raised when samples of a batch do not validate, with the indices of the failing samples.
 
 Usage Example:
     >>> from validators import TypeValidator, ShapeValidator, MinMaxValidator, MeanVarValidator, RangeValidator
@@ -37,4 +42,8 @@ from .type_validator import TypeValidator
 from .shape_validator import ShapeValidator
 from .min_max_validator import MinMaxValidator
 from .mean_var_validator import MeanVarValidator
-from .validation_error import ValidationError
\ No newline at end of file
+from .statistics_validator import StatisticsValidator
+from .sampled_validator import SampledValidator
+from .running_statistics import RunningStatistics
+from .drift_validator import DriftValidator
+from .validation_error import ValidationError, BatchValidationError
\ No newline at end of file
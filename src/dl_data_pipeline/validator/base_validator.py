@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+import numpy as np
+
 from .validation_error import ValidationError
 
 class Validator(ABC):
@@ -33,4 +35,26 @@ class Validator(ABC):
 
         Raises:
             ValidationError: data didn't validate
-        """
\ No newline at end of file
+        """
+
+    def validate_batch(self, batch: Any) -> np.ndarray:
+        """Validate every sample of a batch and report the failing ones.
+
+        The default implementation calls `validate` on each sample, subclasses override it
+        with a vectorized check over the non batch axes.
+
+        Args:
+            batch (Any): array with a leading batch axis, or sequence of samples.
+
+        Returns:
+            np.ndarray: boolean mask of the samples which don't validate, use
+                `np.flatnonzero` to get their indices.
+        """
+        failing = []
+        for sample in batch:
+            try:
+                self.validate(sample)
+                failing.append(False)
+            except ValidationError:
+                failing.append(True)
+        return np.array(failing, dtype=bool)
\ No newline at end of file
@@ -0,0 +1,213 @@
+import threading
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .base_validator import Validator
+from .validation_error import ValidationError
+from .running_statistics import RunningStatistics
+
+class DriftValidator(Validator):
+    """
+    Validator class that detects a drift of the distribution of the data across many
+    samples, instead of checking each sample alone.
+
+    Every validated array is accumulated in a `RunningStatistics`, then the running
+    extrema, mean, variance and the fraction of the values outside the histogram range are
+    checked against their bounds. The samples are never kept.
+
+    A ValidationError is raised only by the validation which makes the statistics leave their
+    bounds. The next samples validate while the drift lasts (`drifted` stays True), so a bulk
+    execution with `on_error="skip"` quarantines the sample where the drift was detected
+    instead of the rest of the epoch. The error is raised again if the statistics come back
+    in bounds and drift again.
+
+    When `raise_on_drift` is False, `validate` never raises, the violations are reported by
+    `violations` (and `check` at any time), e.g. to log them at the end of an epoch.
+
+    The validator can be shared by threads. With worker processes, each worker validates
+    with its own copy, the copies (or their `statistics`) can be sent back and merged with
+    `merge`.
+
+    Args:
+        min_value (float | None, optional): The minimum allowable value. Defaults to None.
+        max_value (float | None, optional): The maximum allowable value. Defaults to None.
+        target_mean (float | None, optional): The target mean of all the values.
+            Defaults to None.
+        max_mean_gap (float, optional): The maximum allowed deviation of the running mean
+            from the target mean. Defaults to 1.0.
+        target_var (float | None, optional): The target variance of all the values.
+            Defaults to None.
+        max_var_gap (float, optional): The maximum allowed deviation of the running
+            variance from the target variance. Defaults to 1.0.
+        bins (int | None, optional): number of bins of the histogram. Defaults to None.
+        value_range (Tuple[float, float] | None, optional): range of the histogram.
+            Defaults to None.
+        max_outside_fraction (float | None, optional): maximum allowed fraction of the
+            values outside value_range. Defaults to None.
+        min_count (int, optional): number of values accumulated before the bounds are
+            checked, so that the first samples don't raise on a noisy mean. Defaults to 1.
+        raise_on_drift (bool, optional): raise a ValidationError when the running
+            statistics leave their bounds. Defaults to True.
+
+    Raises:
+        ValueError: If no bound is set, or max_outside_fraction is set without histogram.
+        ValidationError: If raise_on_drift and the running statistics have just left their
+            bounds.
+
+    Examples:
+        >>> validator = DriftValidator(target_mean=0.45, max_mean_gap=0.05, min_count=10**6)
+        >>> pipeline.add_validator(validator, 0)
+        >>> ...
+        >>> validator.statistics.mean
+        0.448...
+    """
+    def __init__(self,
+                 min_value: float | None = None,
+                 max_value: float | None = None,
+                 target_mean: float | None = None,
+                 max_mean_gap: float = 1.0,
+                 target_var: float | None = None,
+                 max_var_gap: float = 1.0,
+                 bins: int | None = None,
+                 value_range: Tuple[float, float] | None = None,
+                 max_outside_fraction: float | None = None,
+                 min_count: int = 1,
+                 raise_on_drift: bool = True,
+                 ) -> None:
+        super().__init__()
+        if (min_value is None and max_value is None and target_mean is None
+                and target_var is None and max_outside_fraction is None):
+            raise ValueError("At least one of min_value, max_value, target_mean, target_var "
+                             "and max_outside_fraction must be set")
+        if max_outside_fraction is not None and bins is None:
+            raise ValueError("max_outside_fraction requires bins and value_range")
+
+        self.__statistics = RunningStatistics(bins, value_range)
+        self.__min = min_value
+        self.__max = max_value
+        self.__target_mean = target_mean
+        self.__max_mean_gap = max_mean_gap
+        self.__target_var = target_var
+        self.__max_var_gap = max_var_gap
+        self.__max_outside_fraction = max_outside_fraction
+        self.__min_count = min_count
+        self.__raise_on_drift = raise_on_drift
+        self.__violations: List[str] = []
+        self.__lock = threading.Lock()
+
+    @property
+    def statistics(self) -> RunningStatistics:
+        """The running statistics of the values validated so far.
+
+        Returns:
+            RunningStatistics: the accumulator.
+        """
+        return self.__statistics
+
+    @property
+    def violations(self) -> List[str]:
+        """Violated bounds found by the last validation.
+
+        Returns:
+            List[str]: a message per violated bound, empty if the statistics are in bounds.
+        """
+        return list(self.__violations)
+
+    @property
+    def drifted(self) -> bool:
+        """Whether the running statistics were out of bounds at the last validation.
+
+        Returns:
+            bool: True if a bound is violated.
+        """
+        return len(self.__violations) != 0
+
+    def validate(self, data: Any) -> None:
+        violations = self.__accumulate(data)
+        if self.__raise_on_drift and len(violations) != 0:
+            raise ValidationError(" ".join(violations))
+
+    def validate_batch(self, batch: Any) -> np.ndarray:
+        # the statistics are the ones of the whole dataset, accumulate the batch at once
+        if not isinstance(batch, np.ndarray) or batch.ndim == 0:
+            return super().validate_batch(batch)
+        violations = self.__accumulate(batch)
+        return np.full(len(batch), self.__raise_on_drift and len(violations) != 0)
+
+    def __accumulate(self, data: Any) -> List[str]:
+        """Update the statistics with an array.
+
+        Returns:
+            List[str]: the violations if the statistics have just left their bounds, empty
+                if they are in bounds or were already out of bounds.
+        """
+        with self.__lock:
+            was_drifted = len(self.__violations) != 0
+            self.__statistics.update(data)
+            violations = self.__violations = self.check()
+        return [] if was_drifted else violations
+
+    def check(self) -> List[str]:
+        """Check the running statistics against the bounds.
+
+        Returns:
+            List[str]: a message per violated bound, empty if the statistics are in bounds
+                or less than min_count values were accumulated.
+        """
+        stats = self.__statistics
+        if stats.count < self.__min_count:
+            return []
+
+        violations = []
+        if self.__min is not None and stats.min < self.__min:
+            violations.append(f"Running min of data is {stats.min}, this is less than {self.__min}, "
+                              "defined by user.")
+        if self.__max is not None and stats.max > self.__max:
+            violations.append(f"Running max of data is {stats.max}, this is more than {self.__max}, "
+                              "defined by user.")
+        # written as not (gap <= max) so that a NaN mean or var is a violation
+        if self.__target_mean is not None and not abs(stats.mean - self.__target_mean) <= self.__max_mean_gap:
+            violations.append(f"Running mean of data is {stats.mean}, this is out of interval "
+                              f"[{self.__target_mean - self.__max_mean_gap}, {self.__target_mean + self.__max_mean_gap}], "
+                              "defined by user.")
+        if self.__target_var is not None and not abs(stats.var - self.__target_var) <= self.__max_var_gap:
+            violations.append(f"Running var of data is {stats.var}, this is out of interval "
+                              f"[{self.__target_var - self.__max_var_gap}, {self.__target_var + self.__max_var_gap}], "
+                              "defined by user.")
+        if self.__max_outside_fraction is not None:
+            outside = (stats.underflow + stats.overflow) / stats.count
+            if outside > self.__max_outside_fraction:
+                violations.append(f"Fraction of data outside {stats.value_range} is {outside}, "
+                                  f"this is more than {self.__max_outside_fraction}, defined by user.")
+        return violations
+
+    def merge(self, other: "DriftValidator | RunningStatistics") -> None:
+        """Accumulate the statistics of an other validator (e.g. the copy of a worker process).
+
+        Args:
+            other (DriftValidator | RunningStatistics): the validator or the accumulator to merge.
+
+        Raises:
+            ValueError: the histograms don't have the same bins.
+        """
+        statistics = other.statistics if isinstance(other, DriftValidator) else other
+        with self.__lock:
+            self.__statistics.merge(statistics)
+            self.__violations = self.check()
+
+    def reset(self) -> None:
+        """Forget the values validated so far.
+        """
+        with self.__lock:
+            self.__statistics.reset()
+            self.__violations = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_DriftValidator__lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
@@ -54,6 +54,42 @@ class MeanVarValidator(Validator):
         self.__target_var = target_var
         self.__max_var_gap = max_var_gap
 
+    @property
+    def target_mean(self) -> float | None:
+        """The target mean.
+
+        Returns:
+            float | None: the target, None if the mean isn't validated.
+        """
+        return self.__target_mean
+
+    @property
+    def max_mean_gap(self) -> float:
+        """The maximum allowed deviation of the mean from the target mean.
+
+        Returns:
+            float: the gap.
+        """
+        return self.__max_mean_gap
+
+    @property
+    def target_var(self) -> float | None:
+        """The target variance.
+
+        Returns:
+            float | None: the target, None if the variance isn't validated.
+        """
+        return self.__target_var
+
+    @property
+    def max_var_gap(self) -> float:
+        """The maximum allowed deviation of the variance from the target variance.
+
+        Returns:
+            float: the gap.
+        """
+        return self.__max_var_gap
+
     def validate(self, data: Any) -> None:
         # check only if mean is set
         if self.__target_mean is not None:
@@ -71,4 +107,17 @@ class MeanVarValidator(Validator):
             if self.__max_var_gap < var_gap:
                 raise ValidationError(f"Var of data is {data_var}, this is out of interval "
                     f"[{self.__target_var - self.__max_var_gap}, {self.__target_var + self.__max_var_gap}], "
-                    "defined by user.")
\ No newline at end of file
+                    "defined by user.")
+
+    def validate_batch(self, batch: Any) -> np.ndarray:
+        if not isinstance(batch, np.ndarray) or batch.ndim == 0:
+            return super().validate_batch(batch)
+
+        # reduce over the non batch axes
+        axis = tuple(range(1, batch.ndim))
+        failing = np.zeros(len(batch), dtype=bool)
+        if self.__target_mean is not None:
+            failing |= self.__max_mean_gap < np.abs(np.mean(batch, axis=axis) - self.__target_mean)
+        if self.__target_var is not None:
+            failing |= self.__max_var_gap < np.abs(np.var(batch, axis=axis) - self.__target_var)
+        return failing
\ No newline at end of file
@@ -40,6 +40,24 @@ class MinMaxValidator(Validator):
         self.__max = max_value
         self.__min = min_value
 
+    @property
+    def min_value(self) -> float | None:
+        """The minimum allowable value.
+
+        Returns:
+            float | None: the bound, None if the minimum isn't validated.
+        """
+        return self.__min
+
+    @property
+    def max_value(self) -> float | None:
+        """The maximum allowable value.
+
+        Returns:
+            float | None: the bound, None if the maximum isn't validated.
+        """
+        return self.__max
+
     def validate(self, data: Any) -> None:
         if self.__min is not None:
             data_min = np.min(data)
@@ -52,4 +70,17 @@ class MinMaxValidator(Validator):
             data_max = np.max(data)
             if data_max > self.__max:
                 raise ValidationError(f"Max of data is {data_max}, "
-                    f"this is more than {self.__max}, defined by user.")
\ No newline at end of file
+                    f"this is more than {self.__max}, defined by user.")
+
+    def validate_batch(self, batch: Any) -> np.ndarray:
+        if not isinstance(batch, np.ndarray) or batch.ndim == 0:
+            return super().validate_batch(batch)
+
+        # reduce over the non batch axes
+        axis = tuple(range(1, batch.ndim))
+        failing = np.zeros(len(batch), dtype=bool)
+        if self.__min is not None:
+            failing |= np.min(batch, axis=axis) < self.__min
+        if self.__max is not None:
+            failing |= np.max(batch, axis=axis) > self.__max
+        return failing
\ No newline at end of file
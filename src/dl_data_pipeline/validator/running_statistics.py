@@ -0,0 +1,253 @@
+from typing import Any, Tuple
+
+import numpy as np
+
+from .statistics_validator import array_statistics, DEFAULT_CHUNK_SIZE
+
+class RunningStatistics:
+    """
+    Streaming accumulator of the count, mean, variance, extrema and histogram of all the
+    values it has been updated with, without keeping the values.
+
+    The moments of each update are computed in a single pass (`array_statistics`) and merged
+    with the running ones (Welford / Chan et al. parallel update), so two accumulators can be
+    merged exactly, e.g. the ones of several threads or of worker processes (accumulators
+    are picklable).
+
+    The histogram has `bins` bins of equal width over the half open interval `value_range`,
+    values below or above it are counted in `underflow` and `overflow`. NaN values are
+    counted in `count` but in no bin.
+
+    Note:
+        An accumulator isn't thread safe, `DriftValidator` locks its own.
+
+    Args:
+        bins (int | None, optional): number of bins of the histogram. Defaults to None,
+            no histogram.
+        value_range (Tuple[float, float] | None, optional): range of the histogram, required
+            with bins. Defaults to None.
+        chunk_size (int, optional): number of elements read per chunk. Defaults to 65536.
+
+    Raises:
+        ValueError: only one of bins and value_range is set, bins is less than 1 or the
+            range is empty.
+
+    Examples:
+        >>> stats = RunningStatistics(bins=10, value_range=(0, 1))
+        >>> stats.update(np.random.rand(224, 224))
+        >>> other.update(np.random.rand(224, 224))
+        >>> stats.merge(other).mean
+        0.4998...
+    """
+    def __init__(self,
+                 bins: int | None = None,
+                 value_range: Tuple[float, float] | None = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 ) -> None:
+        if (bins is None) != (value_range is None):
+            raise ValueError("bins and value_range must be both set or both None")
+        if bins is not None and bins < 1:
+            raise ValueError(f"bins must be at least 1, not {bins}")
+        if value_range is not None and not value_range[0] < value_range[1]:
+            raise ValueError(f"value_range must be an interval (low, high) with low < high, not {value_range}")
+
+        self.__bins = bins
+        self.__range = tuple(value_range) if value_range is not None else None
+        self.__chunk_size = chunk_size
+        self.__count = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        self.__min = None
+        self.__max = None
+        # underflow, the bins, then overflow
+        self.__histogram = np.zeros(bins + 2, dtype=np.int64) if bins is not None else None
+
+    @property
+    def count(self) -> int:
+        """Number of values accumulated.
+
+        Returns:
+            int: the count.
+        """
+        return self.__count
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values accumulated.
+
+        Returns:
+            float: the mean, NaN if there is no value.
+        """
+        return self.__mean if self.__count != 0 else float("nan")
+
+    @property
+    def var(self) -> float:
+        """Variance (population) of the values accumulated.
+
+        Returns:
+            float: the variance, NaN if there is no value.
+        """
+        return self.__m2 / self.__count if self.__count != 0 else float("nan")
+
+    @property
+    def std(self) -> float:
+        """Standard deviation (population) of the values accumulated.
+
+        Returns:
+            float: the standard deviation, NaN if there is no value.
+        """
+        return float(np.sqrt(self.var))
+
+    @property
+    def min(self) -> Any:
+        """Minimum of the values accumulated.
+
+        Returns:
+            Any: the minimum, None if there is no value.
+        """
+        return self.__min
+
+    @property
+    def max(self) -> Any:
+        """Maximum of the values accumulated.
+
+        Returns:
+            Any: the maximum, None if there is no value.
+        """
+        return self.__max
+
+    @property
+    def bins(self) -> int | None:
+        """Number of bins of the histogram.
+
+        Returns:
+            int | None: the number of bins, None if there is no histogram.
+        """
+        return self.__bins
+
+    @property
+    def value_range(self) -> Tuple[float, float] | None:
+        """Range of the histogram.
+
+        Returns:
+            Tuple[float, float] | None: the range, None if there is no histogram.
+        """
+        return self.__range
+
+    @property
+    def bin_edges(self) -> np.ndarray | None:
+        """Edges of the bins of the histogram.
+
+        Returns:
+            np.ndarray | None: `bins + 1` edges, None if there is no histogram.
+        """
+        if self.__bins is None:
+            return None
+        return np.linspace(self.__range[0], self.__range[1], self.__bins + 1)
+
+    @property
+    def histogram(self) -> np.ndarray | None:
+        """Number of values in each bin.
+
+        Returns:
+            np.ndarray | None: the counts, None if there is no histogram.
+        """
+        if self.__histogram is None:
+            return None
+        return self.__histogram[1:-1].copy()
+
+    @property
+    def underflow(self) -> int:
+        """Number of values below the range of the histogram.
+
+        Returns:
+            int: the count, 0 if there is no histogram.
+        """
+        return int(self.__histogram[0]) if self.__histogram is not None else 0
+
+    @property
+    def overflow(self) -> int:
+        """Number of values above the range of the histogram (or equal to its upper bound).
+
+        Returns:
+            int: the count, 0 if there is no histogram.
+        """
+        return int(self.__histogram[-1]) if self.__histogram is not None else 0
+
+    def update(self, data: Any) -> "RunningStatistics":
+        """Accumulate the values of an array.
+
+        Args:
+            data (Any): the array (or anything `np.asarray` accepts).
+
+        Returns:
+            RunningStatistics: self.
+        """
+        flat = np.asarray(data).reshape(-1)
+        if flat.size == 0:
+            return self
+
+        data_min, data_max, data_mean, data_var = array_statistics(flat, self.__chunk_size)
+        self.__merge_moments(flat.size, data_mean, data_var * flat.size, data_min, data_max)
+
+        if self.__histogram is not None:
+            low, high = self.__range
+            # in float, the values below low would wrap around with unsigned integers
+            scaled = np.subtract(flat, low, dtype=np.float64)
+            scaled *= self.__bins / (high - low)
+            scaled = scaled[~np.isnan(scaled)]
+            # -1 is the underflow, bins the overflow
+            index = np.clip(np.floor(scaled), -1, self.__bins).astype(np.intp) + 1
+            self.__histogram += np.bincount(index, minlength=self.__bins + 2)
+        return self
+
+    def merge(self, other: "RunningStatistics") -> "RunningStatistics":
+        """Accumulate the values accumulated by an other accumulator.
+
+        Args:
+            other (RunningStatistics): the accumulator to merge, not modified.
+
+        Raises:
+            ValueError: the histograms of the accumulators don't have the same bins.
+
+        Returns:
+            RunningStatistics: self.
+        """
+        if other.bins != self.__bins or other.value_range != self.__range:
+            raise ValueError(f"Can't merge a histogram of {other.bins} bins over {other.value_range} "
+                             f"with a histogram of {self.__bins} bins over {self.__range}")
+        if other.count == 0:
+            return self
+
+        self.__merge_moments(other.count, other.mean, other.var * other.count, other.min, other.max)
+        if self.__histogram is not None:
+            self.__histogram += other.__histogram
+        return self
+
+    def reset(self) -> None:
+        """Forget all the values accumulated.
+        """
+        self.__count = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        self.__min = None
+        self.__max = None
+        if self.__histogram is not None:
+            self.__histogram[:] = 0
+
+    def __merge_moments(self, count: int, mean: float, m2: float, data_min: Any, data_max: Any) -> None:
+        if self.__min is None:
+            self.__min, self.__max = data_min, data_max
+        else:
+            self.__min = np.minimum(self.__min, data_min)
+            self.__max = np.maximum(self.__max, data_max)
+
+        total = self.__count + count
+        delta = mean - self.__mean
+        self.__mean += delta * count / total
+        self.__m2 += m2 + delta * delta * self.__count * count / total
+        self.__count = total
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(count = {self.__count}, mean = {self.mean}, var = {self.var}, "
+                f"min = {self.__min}, max = {self.__max})")
@@ -0,0 +1,141 @@
+import random
+import threading
+from typing import Any, Dict
+
+import numpy as np
+
+from .base_validator import Validator
+
+class SampledValidator(Validator):
+    """
+    Validator class that runs an other validator on a subset of the data, to bound the
+    cost of the validation in production.
+
+    The calls to validate can be sampled, every Nth call or a random fraction of the calls,
+    and large arrays can be subsampled with a stride over their elements. The numbers of
+    validated and skipped calls are counted.
+
+    Note:
+        The element stride changes the shape of the validated array, it's meant for the
+        validators of the values (e.g. `MinMaxValidator`, `MeanVarValidator`), not for
+        `ShapeValidator`. The extrema of the subsample may miss outliers.
+
+    Args:
+        validator (Validator): the validator to run.
+        every_n (int | None, optional): validate one call every `every_n` calls, starting
+            with the first one. Defaults to None.
+        fraction (float | None, optional): probability of validating a call. Defaults to None.
+        element_stride (int | None, optional): validate one element every `element_stride`
+            elements of the arrays. Defaults to None.
+        seed (int | None, optional): seed of the random sampling. Defaults to None.
+
+    Raises:
+        TypeError: validator isn't a Validator.
+        ValueError: both every_n and fraction are set, every_n or element_stride is less
+            than 1, or fraction isn't in [0, 1].
+
+    Examples:
+        >>> validator = SampledValidator(MinMaxValidator(0, 1), every_n=100, element_stride=16)
+        >>> pipeline.add_validator(validator, 0)
+        >>> ...
+        >>> validator.validated, validator.skipped
+        (10, 990)
+    """
+    def __init__(self,
+                 validator: Validator,
+                 every_n: int | None = None,
+                 fraction: float | None = None,
+                 element_stride: int | None = None,
+                 seed: int | None = None,
+                 ) -> None:
+        super().__init__()
+        if not isinstance(validator, Validator):
+            raise TypeError(f"validator must be Validator type, not {type(validator)}")
+        if every_n is not None and fraction is not None:
+            raise ValueError("every_n and fraction can't be both set")
+        if every_n is not None and every_n < 1:
+            raise ValueError(f"every_n must be at least 1, not {every_n}")
+        if fraction is not None and not 0 <= fraction <= 1:
+            raise ValueError(f"fraction must be in [0, 1], not {fraction}")
+        if element_stride is not None and element_stride < 1:
+            raise ValueError(f"element_stride must be at least 1, not {element_stride}")
+
+        self.__validator = validator
+        self.__every_n = every_n
+        self.__fraction = fraction
+        self.__element_stride = element_stride
+        self.__rng = random.Random(seed)
+        self.__calls = 0
+        self.__validated = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def validator(self) -> Validator:
+        """The sampled validator.
+
+        Returns:
+            Validator: the validator.
+        """
+        return self.__validator
+
+    @property
+    def validated(self) -> int:
+        """Number of calls validated so far.
+
+        Returns:
+            int: number of validated calls.
+        """
+        return self.__validated
+
+    @property
+    def skipped(self) -> int:
+        """Number of calls skipped so far.
+
+        Returns:
+            int: number of skipped calls.
+        """
+        return self.__calls - self.__validated
+
+    def validate(self, data: Any) -> None:
+        with self.__lock:
+            if self.__every_n is not None:
+                selected = self.__calls % self.__every_n == 0
+            elif self.__fraction is not None:
+                selected = self.__rng.random() < self.__fraction
+            else:
+                selected = True
+            self.__calls += 1
+            if selected:
+                self.__validated += 1
+
+        if not selected:
+            return
+        if self.__element_stride is not None and isinstance(data, np.ndarray):
+            data = _subsample(data, self.__element_stride)
+        self.__validator.validate(data)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_SampledValidator__lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+def _subsample(data: np.ndarray, stride: int) -> np.ndarray:
+    """One element every `stride` elements of an array, without copy.
+
+    Args:
+        data (np.ndarray): the array.
+        stride (int): the stride.
+
+    Returns:
+        np.ndarray: a view of the flattened array if it's contiguous, of the leading
+            axis otherwise.
+    """
+    if data.ndim == 0:
+        return data
+    if data.flags.c_contiguous:
+        return data.reshape(-1)[::stride]
+    return data[::stride]
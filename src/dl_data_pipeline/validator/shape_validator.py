@@ -1,4 +1,7 @@
 from typing import Any
+
+import numpy as np
+
 from .base_validator import Validator
 from .validation_error import ValidationError
 
@@ -44,4 +47,10 @@ class ShapeValidator(Validator):
         
         shape = getattr(data, self.__getter)
         if shape != self.__shape:
-            raise ValidationError(f"Invalid shape, expected : {self.__shape}, received : {shape}.")
\ No newline at end of file
+            raise ValidationError(f"Invalid shape, expected : {self.__shape}, received : {shape}.")
+
+    def validate_batch(self, batch: Any) -> np.ndarray:
+        # the samples of an array share their shape
+        if not isinstance(batch, np.ndarray) or self.__getter != "shape" or batch.ndim == 0:
+            return super().validate_batch(batch)
+        return np.full(len(batch), batch.shape[1:] != self.__shape, dtype=bool)
\ No newline at end of file
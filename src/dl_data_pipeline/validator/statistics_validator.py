@@ -0,0 +1,193 @@
+from typing import Any, Tuple
+
+import numpy as np
+
+from .base_validator import Validator
+from .validation_error import ValidationError
+from .min_max_validator import MinMaxValidator
+from .mean_var_validator import MeanVarValidator
+
+# number of elements read per chunk, a float64 chunk (512 KiB) stays in the CPU cache
+# while its extrema and moments are computed
+DEFAULT_CHUNK_SIZE = 65536
+
+class StatisticsValidator(Validator):
+    """
+    Validator class that checks the extrema, the mean and the variance of the data
+    in a single pass.
+
+    `MinMaxValidator` and `MeanVarValidator` attached to the same output read the whole
+    array four times or more (min, max, mean, and var, which itself reads twice). This
+    validator reads the data by chunks small enough to stay in the CPU cache, computes
+    the extrema and the moments of each chunk, and merges the chunk moments (Chan et al.
+    parallel variance). Error messages are the ones of `MinMaxValidator` and
+    `MeanVarValidator`.
+
+    `Pipeline` replaces a `MinMaxValidator` and a `MeanVarValidator` of the same output by
+    this validator automatically.
+
+    Args:
+        min_value (float | None, optional): The minimum allowable value for the data.
+            Defaults to None.
+        max_value (float | None, optional): The maximum allowable value for the data.
+            Defaults to None.
+        target_mean (float | None, optional): The target mean value of the data.
+            Defaults to None.
+        max_mean_gap (float, optional): The maximum allowed deviation of the mean from
+            the target mean. Defaults to 1.0.
+        target_var (float | None, optional): The target variance of the data.
+            Defaults to None.
+        max_var_gap (float, optional): The maximum allowed deviation of the variance from
+            the target variance. Defaults to 1.0.
+        chunk_size (int, optional): number of elements read per chunk. Defaults to 65536.
+
+    Raises:
+        ValueError: If no bound is set, or chunk_size is less than 1.
+        ValidationError: If the extrema, mean or variance of the data is out of bounds.
+
+    Examples:
+        >>> validator = StatisticsValidator(min_value=0.0, max_value=1.0, target_mean=0.5, max_mean_gap=0.2)
+        >>> validator.validate(np.array([0.2, 0.5, 0.8]))  # This will pass
+        >>> validator.validate(np.array([0.2, 0.5, 1.2]))  # This will raise a ValidationError because 1.2 > 1.0
+    """
+    def __init__(self,
+                 min_value: float | None = None,
+                 max_value: float | None = None,
+                 target_mean: float | None = None,
+                 max_mean_gap: float = 1.0,
+                 target_var: float | None = None,
+                 max_var_gap: float = 1.0,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 ) -> None:
+        super().__init__()
+        if min_value is None and max_value is None and target_mean is None and target_var is None:
+            raise ValueError("At least one of min_value, max_value, target_mean and target_var must be set")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, not {chunk_size}")
+
+        self.__min = min_value
+        self.__max = max_value
+        self.__target_mean = target_mean
+        self.__max_mean_gap = max_mean_gap
+        self.__target_var = target_var
+        self.__max_var_gap = max_var_gap
+        self.__chunk_size = chunk_size
+
+    @classmethod
+    def from_validators(cls,
+                        min_max: MinMaxValidator,
+                        mean_var: MeanVarValidator,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        ) -> "StatisticsValidator":
+        """Create the validator checking the bounds of a `MinMaxValidator` and a `MeanVarValidator`.
+
+        Args:
+            min_max (MinMaxValidator): validator of the extrema.
+            mean_var (MeanVarValidator): validator of the mean and variance.
+            chunk_size (int, optional): number of elements read per chunk. Defaults to 65536.
+
+        Returns:
+            StatisticsValidator: the fused validator.
+        """
+        return cls(min_value=min_max.min_value,
+                   max_value=min_max.max_value,
+                   target_mean=mean_var.target_mean,
+                   max_mean_gap=mean_var.max_mean_gap,
+                   target_var=mean_var.target_var,
+                   max_var_gap=mean_var.max_var_gap,
+                   chunk_size=chunk_size)
+
+    def validate(self, data: Any) -> None:
+        data_min, data_max, data_mean, data_var = array_statistics(data, self.__chunk_size)
+
+        if self.__min is not None and data_min < self.__min:
+            raise ValidationError(f"Min of data is {data_min}, "
+                f"this is less than {self.__min}, "
+                f"defined by user.")
+
+        if self.__max is not None and data_max > self.__max:
+            raise ValidationError(f"Max of data is {data_max}, "
+                f"this is more than {self.__max}, defined by user.")
+
+        if self.__target_mean is not None:
+            mean_gap = np.abs(data_mean - self.__target_mean)
+            if self.__max_mean_gap < mean_gap:
+                raise ValidationError(f"Mean of data is {data_mean}, this is out of interval "
+                    f"[{self.__target_mean - self.__max_mean_gap}, {self.__target_mean + self.__max_mean_gap}], "
+                    "defined by user.")
+
+        if self.__target_var is not None:
+            var_gap = np.abs(data_var - self.__target_var)
+            if self.__max_var_gap < var_gap:
+                raise ValidationError(f"Var of data is {data_var}, this is out of interval "
+                    f"[{self.__target_var - self.__max_var_gap}, {self.__target_var + self.__max_var_gap}], "
+                    "defined by user.")
+
+    def validate_batch(self, batch: Any) -> np.ndarray:
+        if not isinstance(batch, np.ndarray) or batch.ndim == 0:
+            return super().validate_batch(batch)
+
+        # reduce over the non batch axes
+        axis = tuple(range(1, batch.ndim))
+        failing = np.zeros(len(batch), dtype=bool)
+        if self.__min is not None:
+            failing |= np.min(batch, axis=axis) < self.__min
+        if self.__max is not None:
+            failing |= np.max(batch, axis=axis) > self.__max
+        if self.__target_mean is not None or self.__target_var is not None:
+            mean = np.mean(batch, axis=axis, dtype=np.float64, keepdims=True)
+            if self.__target_mean is not None:
+                failing |= self.__max_mean_gap < np.abs(mean.reshape(-1) - self.__target_mean)
+            if self.__target_var is not None:
+                var = np.mean(np.square(batch - mean), axis=axis)
+                failing |= self.__max_var_gap < np.abs(var - self.__target_var)
+        return failing
+
+def array_statistics(data: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[Any, Any, float, float]:
+    """Minimum, maximum, mean and variance of an array, read once by chunks.
+
+    Each chunk is read from memory once and stays in the CPU cache while its extrema and
+    moments are computed, then the moments are merged with the ones of the previous chunks.
+
+    Args:
+        data (Any): the array (or anything `np.asarray` accepts).
+        chunk_size (int, optional): number of elements per chunk. Defaults to 65536.
+
+    Raises:
+        ValueError: the array is empty.
+
+    Returns:
+        Tuple[Any, Any, float, float]: minimum, maximum, mean and variance (population).
+    """
+    flat = np.asarray(data).reshape(-1)
+    if flat.size == 0:
+        raise ValueError("zero-size array has no statistics")
+
+    data_min = data_max = None
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for start in range(0, flat.size, chunk_size):
+        chunk = flat[start:start + chunk_size]
+        chunk_min = chunk.min()
+        chunk_max = chunk.max()
+        chunk_mean = chunk.mean(dtype=np.float64)
+        deviation = chunk.astype(np.float64) - chunk_mean
+        chunk_m2 = float(np.dot(deviation, deviation))
+
+        if data_min is None:
+            data_min, data_max = chunk_min, chunk_max
+        else:
+            # np.minimum / np.maximum propagate NaN like np.min / np.max
+            data_min = np.minimum(data_min, chunk_min)
+            data_max = np.maximum(data_max, chunk_max)
+
+        # merge the moments of the chunk with the previous ones
+        chunk_count = chunk.size
+        total = count + chunk_count
+        delta = chunk_mean - mean
+        mean += delta * chunk_count / total
+        m2 += chunk_m2 + delta * delta * count * chunk_count / total
+        count = total
+
+    return data_min, data_max, float(mean), m2 / count
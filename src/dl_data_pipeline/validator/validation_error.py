@@ -1,3 +1,5 @@
+from typing import Any, Callable, Sequence, Tuple
+
 class ValidationError(Exception):
     """
     Exception raised for errors in data validation.
@@ -12,4 +14,27 @@ class ValidationError(Exception):
         >>> if not some_validation_check(data):
         >>>     raise ValidationError("The data did not meet the validation criteria.")
     """
-    pass
\ No newline at end of file
+    pass
+
+class BatchValidationError(ValidationError):
+    """
+    Exception raised when samples of a batch fail a validation check.
+
+    Inherits from:
+        ValidationError: Base class of the validation errors.
+
+    Args:
+        message (str): description of the failure.
+        indices (Sequence[int]): indices of the failing samples in the batch.
+
+    Examples:
+        >>> mask = validator.validate_batch(batch)
+        >>> if mask.any():
+        >>>     raise BatchValidationError("Samples out of bounds.", np.flatnonzero(mask))
+    """
+    def __init__(self, message: str, indices: Sequence[int]) -> None:
+        super().__init__(message)
+        self.indices = list(indices)
+
+    def __reduce__(self) -> Tuple[Callable, Tuple[Any, ...]]:
+        return (self.__class__, (str(self), self.indices))
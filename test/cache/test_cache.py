@@ -0,0 +1,232 @@
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.dl_data_pipeline import Pipeline, InputNode, deferred_execution
+from src.dl_data_pipeline.cache import MemoryCache, DiskCache, NodeCache
+from src.dl_data_pipeline.cache.fingerprint import value_fingerprint, function_fingerprint
+from src.dl_data_pipeline.process_functions.any_process import rescale
+
+calls = []
+
+_increment = lambda x: x + 1
+_double = lambda x: x * 2
+
+@deferred_execution
+def decode(path, size=8):
+    calls.append(path)
+    return np.arange(size * size, dtype=np.float64).reshape(size, size) + len(path)
+
+def test_value_fingerprint():
+    data = np.arange(10)
+    assert value_fingerprint(data) == value_fingerprint(np.arange(10))
+    assert value_fingerprint(data) != value_fingerprint(np.arange(10).astype(np.float64))
+    assert value_fingerprint(data) != value_fingerprint(data.reshape(2, 5))
+    assert value_fingerprint((1, "a")) == value_fingerprint((1, "a"))
+    assert value_fingerprint(1) != value_fingerprint(1.0)
+    assert value_fingerprint(np.max) == value_fingerprint(np.max)
+    with pytest.raises(TypeError):
+        value_fingerprint(lambda x: x)
+
+def test_function_fingerprint_code():
+    # module level lambdas have the same qualified name, they differ by their code
+    assert value_fingerprint(_increment) != value_fingerprint(_double)
+    assert value_fingerprint(_increment) == value_fingerprint(_increment)
+
+def test_disk_cache_lambdas_dont_collide(tmp_path):
+    results = []
+    for func in (_increment, _double):
+        inp = InputNode()
+        pipe = Pipeline(inp, deferred_execution(func)(inp))
+        pipe.set_cache(DiskCache(str(tmp_path), max_bytes=1024**2))
+        results.append(pipe(np.arange(4)))
+    np.testing.assert_array_equal(results[0], [1, 2, 3, 4])
+    np.testing.assert_array_equal(results[1], [0, 2, 4, 6])
+
+def test_function_fingerprint():
+    inp = InputNode()
+    a = rescale(inp, 0, 1).func
+    b = rescale(inp, 0, 1).func
+    c = rescale(inp, 0, 2).func
+    assert function_fingerprint(a) == function_fingerprint(b)
+    assert function_fingerprint(a) != function_fingerprint(c)
+
+def test_memory_cache_lru_bytes():
+    cache = MemoryCache(max_bytes=3 * 800)
+    for key in range(3):
+        cache.put(key, np.zeros(100))     # 800 bytes each
+    assert cache.get(0)[0]                 # 0 is now the most recently used
+    cache.put(3, np.zeros(100))            # evicts 1
+
+    assert not cache.get(1)[0]
+    assert cache.get(0)[0] and cache.get(2)[0] and cache.get(3)[0]
+    assert cache.stats == {"hits": 4, "misses": 1, "evictions": 1, "entries": 3, "bytes": 2400}
+
+    # larger than the budget, not stored
+    cache.put(4, np.zeros(1000))
+    assert not cache.get(4)[0]
+    cache.clear()
+    assert cache.stats["bytes"] == 0
+
+def test_memory_cache_read_only():
+    cache = MemoryCache(max_bytes=1024)
+    value = np.zeros(10)
+    stored = cache.put("key", value)
+    assert value.flags.writeable
+    with pytest.raises(ValueError):
+        stored[0] = 1
+    with pytest.raises(ValueError):
+        cache.get("key")[1][0] = 1
+
+def test_memory_cache_pickle():
+    cache = MemoryCache(max_bytes=1024)
+    cache.put("key", np.zeros(10))
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored.stats["entries"] == 0
+    restored.put("key", np.zeros(10))
+    assert restored.get("key")[0]
+
+def test_memory_cache_wrong_budget():
+    with pytest.raises(ValueError):
+        MemoryCache(max_bytes=-1)
+
+def test_pipeline_set_cache():
+    inp = InputNode()
+    image = decode(inp)
+    output = rescale(image, 0, 1)
+    pipe = Pipeline(inp, output)
+
+    cache = MemoryCache(max_bytes=10 * 1024)
+    pipe.set_cache(cache, nodes=image)
+
+    calls.clear()
+    for _ in range(3):
+        list(pipe.map(["a", "bb", "ccc"], workers=2))
+    assert sorted(calls) == ["a", "bb", "ccc"]
+    assert cache.stats["hits"] == 6
+    assert cache.stats["misses"] == 3
+
+    # stop caching
+    pipe.set_cache(None, nodes=image)
+    calls.clear()
+    pipe("a")
+    assert calls == ["a"]
+
+def test_pipeline_set_cache_every_node():
+    inp = InputNode()
+    pipe = Pipeline(inp, decode(inp, 4)[0])
+    cache = MemoryCache(max_bytes=10 * 1024)
+    pipe.set_cache(cache)
+
+    calls.clear()
+    for _ in range(2):
+        assert np.array_equal(pipe("ab"), [2, 3, 4, 5])
+    assert calls == ["ab"]
+    assert cache.stats["entries"] == 2
+
+def test_pipeline_set_cache_wrong_args():
+    inp = InputNode()
+    pipe = Pipeline(inp, decode(inp))
+    with pytest.raises(TypeError):
+        pipe.set_cache(1)
+    with pytest.raises(ValueError):
+        pipe.set_cache(MemoryCache(1024), nodes=inp)
+    with pytest.raises(ValueError):
+        pipe.set_cache(MemoryCache(1024), nodes=decode(InputNode()))
+
+def test_disk_cache(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=3 * 928)
+    inp = InputNode()
+    func = rescale(inp, 0, 1).func
+    key = (cache.node_key(func), cache.fingerprint((np.arange(10),)))
+
+    assert cache.get(key) == (False, None)
+    stored = cache.put(key, np.arange(100, dtype=np.float64))
+    assert not stored.flags.writeable
+
+    found, value = cache.get(key)
+    assert found
+    assert isinstance(value, np.memmap)
+    assert np.array_equal(value, np.arange(100))
+
+    # not an array, not stored
+    cache.put(("a", "b"), "value")
+    assert not cache.get(("a", "b"))[0]
+
+    # a new cache on the same directory finds the values
+    other = DiskCache(str(tmp_path / "cache"), max_bytes=3 * 928)
+    assert other.get(key)[0]
+    assert other.stats["bytes"] == 928
+
+    cache.clear()
+    assert not other.get(key)[0]
+
+def test_disk_cache_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=2 * 928, low_watermark=1.0)
+    for i in range(3):
+        cache.put(("node", str(i)), np.zeros(100))
+        time.sleep(0.01)
+    assert not cache.get(("node", "0"))[0]
+    assert cache.get(("node", "1"))[0]
+    assert cache.get(("node", "2"))[0]
+    assert cache.stats["evictions"] == 1
+
+def test_disk_cache_low_watermark(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), max_bytes=10 * 928, low_watermark=0.5)
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+
+    # the 11th file evicts down to 5 files, the next 5 puts don't scan the directory
+    for i in range(17):
+        cache.put(("node", str(i)), np.zeros(100))
+        time.sleep(0.002)
+    assert len(scans) == 2
+    assert cache.stats["evictions"] == 12 and cache.stats["bytes"] == 5 * 928
+    assert cache.get(("node", "12"))[0] and not cache.get(("node", "11"))[0]
+
+    with pytest.raises(ValueError):
+        DiskCache(str(tmp_path), max_bytes=1024, low_watermark=1.5)
+
+def test_disk_cache_file_fingerprint(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=1024)
+    path = tmp_path / "image.bin"
+    path.write_bytes(b"1234")
+    before = cache.fingerprint((str(path),))
+    assert before == cache.fingerprint((str(path),))
+
+    path.write_bytes(b"123456")
+    assert before != cache.fingerprint((str(path),))
+
+def test_pipeline_disk_cache(tmp_path):
+    inp = InputNode()
+    image = decode(inp)
+    pipe = Pipeline(inp, rescale(image, 0, 1))
+    pipe.set_cache(DiskCache(str(tmp_path), max_bytes=1024**2), nodes=image)
+    expected = pipe("abc")
+
+    # an other pipeline, same function and arguments
+    inp = InputNode()
+    image = decode(inp)
+    pipe = Pipeline(inp, rescale(image, 0, 1))
+    pipe.set_cache(DiskCache(str(tmp_path), max_bytes=1024**2), nodes=image)
+    calls.clear()
+    assert np.array_equal(pipe("abc"), expected)
+    assert calls == []
+
+    # different constant arguments invalidate
+    inp = InputNode()
+    image = decode(inp, 4)
+    pipe = Pipeline(inp, image)
+    pipe.set_cache(DiskCache(str(tmp_path), max_bytes=1024**2), nodes=image)
+    assert pipe("abc").shape == (4, 4)
+    assert calls == ["abc"]
+
+def test_disk_cache_wrong_function(tmp_path):
+    inp = InputNode()
+    pipe = Pipeline(inp, deferred_execution(lambda x: x)(inp))
+    with pytest.raises(ValueError, match="can't be cached"):
+        pipe.set_cache(DiskCache(str(tmp_path), max_bytes=1024))
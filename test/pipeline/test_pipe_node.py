@@ -39,3 +39,8 @@ def test_node_unwrap():
 def test_node_iter_no_unwrap():
     with pytest.raises(RuntimeError):
         x, y = PipelineNode()
+
+def test_node_slots():
+    # nodes don't have a per instance __dict__
+    assert not hasattr(PipelineNode(), "__dict__")
+    assert not hasattr(InputNode(), "__dict__")
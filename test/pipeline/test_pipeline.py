@@ -1,10 +1,20 @@
+import asyncio
+import pickle
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
 import numpy as np
 import pytest
 
 from src.dl_data_pipeline import Pipeline, InputNode, deferred_execution
-from src.dl_data_pipeline.validator import MinMaxValidator, ValidationError
+from src.dl_data_pipeline.validator import Validator, MinMaxValidator, MeanVarValidator, StatisticsValidator, ValidationError, BatchValidationError
+from src.dl_data_pipeline.pipeline import NodeHook, BackgroundValidation, BufferPool
 from src.dl_data_pipeline.process_functions.any_process import rescale
-from src.dl_data_pipeline.process_functions.process_2d import image_chw_to_hwc
+from src.dl_data_pipeline.process_functions.process_2d import (
+    image_chw_to_hwc, image_hwc_to_chw, open_rgb_image, resize_with_max_distortion, padding_2d, max_pooling_2d)
 
 def test_pipeline_basic():
     inp = InputNode()
@@ -92,4 +102,630 @@ def test_sub_pipeline_no_node_execption():
     subpipe = Pipeline([inp, inp2], output)
 
     with pytest.raises(TypeError):
-        subpipe.as_deferred(0, 0)
\ No newline at end of file
+        subpipe.as_deferred(0, 0)
+
+def test_pipeline_concurrent_calls():
+    @deferred_execution
+    def slow_add(a, b):
+        time.sleep(0.001)
+        return a + b
+
+    inp1 = InputNode()
+    inp2 = InputNode()
+    x = slow_add(inp1, inp2)
+    output = slow_add(x, x)
+    pipe = Pipeline([inp1, inp2], output)
+
+    # a single pipeline object is shared by all the threads
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(pipe, range(200), range(200)))
+
+    assert results == [4 * i for i in range(200)]
+
+    # per call values aren't stored in the nodes
+    assert x.value is None
+    assert output.value is None
+
+def test_pipeline_call_parallel():
+    # both branches must run at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    @deferred_execution
+    def branch(a, factor):
+        barrier.wait()
+        return a * factor
+
+    @deferred_execution
+    def add(a, b):
+        return a + b
+
+    inp1 = InputNode()
+    inp2 = InputNode()
+    x = branch(inp1, 2)
+    y = branch(inp2, 3)
+    pipe = Pipeline([inp1, inp2], [add(x, y), x[0]])
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        out, first = pipe.call_parallel(np.array([1, 2]), np.array([1, 1]), executor=executor)
+    assert np.array_equal(out, [5, 7])
+    assert first == 2
+
+    out, _ = pipe.call_parallel(np.array([1, 2]), np.array([1, 1]), workers=2)
+    assert np.array_equal(out, [5, 7])
+
+def test_pipeline_call_parallel_error():
+    inp = InputNode()
+    output = rescale(inp, 0, 5)
+    pipe = Pipeline(inp, output)
+    pipe.add_validator(MinMaxValidator(0, 2), 0)
+
+    with pytest.raises(ValidationError):
+        pipe.call_parallel(np.random.rand(10))
+    with pytest.raises(RuntimeError):
+        pipe.call_parallel(np.zeros(10))
+    with pytest.raises(ValueError):
+        pipe.call_parallel()
+
+def test_pipeline_acall():
+    @deferred_execution
+    async def fetch(key, barrier):
+        # both fetches must be awaited at the same time to pass the barrier
+        barrier.append(key)
+        while len(barrier) < 2:
+            await asyncio.sleep(0.001)
+        return np.full(3, key)
+
+    @deferred_execution
+    def add(a, b):
+        return a + b
+
+    inp1 = InputNode()
+    inp2 = InputNode()
+    barrier = []
+    output = add(fetch(inp1, barrier), fetch(inp2, barrier))
+    pipe = Pipeline([inp1, inp2], output)
+
+    result = asyncio.run(asyncio.wait_for(pipe.acall(1, 2), timeout=5))
+    assert np.array_equal(result, [3, 3, 3])
+
+    # async nodes also work with the synchronous call
+    barrier.extend([0, 0])
+    assert np.array_equal(pipe(1, 2), [3, 3, 3])
+
+def test_pipeline_acall_error():
+    inp = InputNode()
+    output = rescale(inp, 0, 5)
+    pipe = Pipeline(inp, output)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(pipe.acall(np.zeros(10)))
+    with pytest.raises(ValueError):
+        asyncio.run(pipe.acall())
+
+def test_pipeline_release_intermediate_values():
+    refs = []
+
+    @deferred_execution
+    def decode(size):
+        value = np.ones((size, size))
+        refs.append(weakref.ref(value))
+        return value
+
+    @deferred_execution
+    def shrink(value):
+        return value[::4, ::4].copy()
+
+    @deferred_execution
+    def is_released(value):
+        # the decoded array is no longer referenced once shrunk
+        return refs[-1]() is None
+
+    inp = InputNode()
+    small = shrink(decode(inp))
+    pipe = Pipeline(inp, [is_released(small), small])
+    released, result = pipe(64)
+    assert released
+    assert result.shape == (16, 16)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        released, _ = pipe.call_parallel(64, executor=executor)
+    assert released
+
+    released, _ = asyncio.run(pipe.acall(64))
+    assert released
+
+def test_pipeline_memory_report():
+    @deferred_execution
+    def decode(size):
+        return np.ones((size, size), dtype=np.uint8)
+
+    @deferred_execution
+    def shrink(value):
+        return value[::2, ::2].copy()
+
+    @deferred_execution
+    def transpose(value):
+        return value.T
+
+    inp = InputNode()
+    x = decode(inp)
+    pipe = Pipeline(inp, shrink(transpose(shrink(x))))
+    report = pipe.memory_report(100)
+
+    # the transposition is a view, it doesn't count
+    assert report["peak_bytes_without_release"] == 100 * 100 + 50 * 50 + 25 * 25
+    assert report["peak_bytes"] == 100 * 100 + 50 * 50
+    assert report["saved_bytes"] == 25 * 25
+
+def test_pipeline_compile():
+    @deferred_execution
+    def add(a, b):
+        return a + b
+
+    inp1 = InputNode()
+    inp2 = InputNode()
+    x = add(inp1, inp2)
+    output = add(x, x[...])
+    pipe = Pipeline([inp1, inp2], output)
+
+    plan = pipe.compile()
+    # inputs have no step, x is freed after its last consumer
+    assert len(plan) == 3
+    func, input_slots, output_slot, release_slots = plan[-1]
+    assert func.__name__ == "add"
+    assert len(input_slots) == 2
+    assert output_slot == max(slot for _, _, slot, _ in plan)
+    assert len(release_slots) == 2
+    assert np.array_equal(pipe(np.array([1]), np.array([2])), [6])
+
+def test_pipeline_merge_duplicates():
+    calls = []
+
+    @deferred_execution
+    def decode(path, scale=1):
+        calls.append(path)
+        return np.arange(4) * scale
+
+    @deferred_execution
+    def add(a, b):
+        return a + b
+
+    inp = InputNode()
+    x = add(decode(inp), decode(inp))           # same function, parents and args
+    y = add(decode(inp)[0], decode(inp)[0])     # same __getitem__ on a merged parent
+    z = add(decode(inp, scale=2), decode(inp, scale=2.0)) # 2 == 2.0 but not the same type
+    pipe = Pipeline(inp, [x, y, z], merge_duplicates=True)
+
+    report = pipe.optimization_report()
+    assert report["merged_nodes"] == 4
+    assert report["nodes"] - report["merged_nodes"] == report["executed_nodes"] + 1
+
+    out_x, out_y, out_z = pipe("path")
+    assert np.array_equal(out_x, [0, 2, 4, 6])
+    assert out_y == 0
+    assert np.array_equal(out_z, [0, 4, 8, 12])
+    assert len(calls) == 3
+
+    calls.clear()
+    pipe = Pipeline(inp, [x, y, z])
+    assert pipe.optimization_report()["merged_nodes"] == 0
+    pipe("path")
+    assert len(calls) == 6
+
+def test_pipeline_stochastic_nodes_not_merged_by_default():
+    @deferred_execution
+    def noise(data):
+        return data + np.random.standard_normal(data.shape)
+
+    inp = InputNode()
+    pipe = Pipeline(inp, [noise(inp), noise(inp)])
+    assert pipe.optimization_report()["merged_nodes"] == 0
+    view1, view2 = pipe(np.zeros(16))
+    assert not np.array_equal(view1, view2)
+
+def test_pipeline_merge_unhashable_args():
+    @deferred_execution
+    def add(a, b):
+        return a + b
+
+    inp = InputNode()
+    pipe = Pipeline(inp, [add(inp, np.ones(2)), add(inp, np.ones(2))], merge_duplicates=True)
+    assert pipe.optimization_report()["merged_nodes"] == 0
+    out1, out2 = pipe(np.zeros(2))
+    assert np.array_equal(out1, out2)
+
+def test_pipeline_select_outputs():
+    calls = []
+
+    @deferred_execution
+    def record(value, name):
+        calls.append(name)
+        return value
+
+    inp = InputNode()
+    shared = record(inp, "shared")
+    features = record(shared, "features")
+    thumbnail = record(shared, "thumbnail")
+    label = record(inp, "label")
+    pipe = Pipeline(inp, [features, thumbnail, label])
+    pipe.add_validator(MinMaxValidator(0, 1), 1)
+
+    assert pipe(5, outputs=[0]) == 5
+    assert calls == ["shared", "features"]
+
+    calls.clear()
+    assert pipe(5, outputs=[2, 0]) == [5, 5]
+    assert sorted(calls) == ["features", "label", "shared"]
+
+    # validators of the other outputs aren't run
+    with pytest.raises(ValidationError):
+        pipe(5, outputs=[1])
+
+    # only the label node is part of its plan
+    assert len(pipe.compile([2])) == 1
+    with pytest.raises(IndexError):
+        pipe(5, outputs=[3])
+
+def test_pipeline_call_batch():
+    calls = []
+
+    @deferred_execution
+    def add(value, constant):
+        calls.append(constant)
+        return value + constant
+
+    inp = InputNode()
+    x = rescale(add(inp, 1))
+    x = image_chw_to_hwc(x)
+    pipe = Pipeline(inp, x)
+
+    batch = np.random.rand(8, 3, 4, 5)
+    result = pipe.call_batch(batch)
+    assert result.shape == (8, 4, 5, 3)
+    # the user function is called for each sample, the registered ones once
+    assert len(calls) == 8
+    for sample, expected in zip(batch, result):
+        assert np.allclose(pipe(sample), expected)
+
+    # samples which can't be stacked are kept in a list
+    @deferred_execution
+    def length(value):
+        return list(range(value))
+
+    inp = InputNode()
+    pipe = Pipeline(inp, length(inp))
+    assert pipe.call_batch([1, 2]) == [[0], [0, 1]]
+
+    inp2 = InputNode()
+    pipe = Pipeline([inp, inp2], [length(inp), length(inp2)])
+    with pytest.raises(ValueError):
+        pipe.call_batch([1, 2], [1])
+
+def test_pipeline_call_batch_error():
+    inp = InputNode()
+    pipe = Pipeline(inp, rescale(inp, 0, 2))
+
+    # constant sample
+    with pytest.raises(RuntimeError):
+        pipe.call_batch(np.ones((2, 4)))
+
+    pipe.add_validator(MinMaxValidator(0, 1), 0)
+    with pytest.raises(ValidationError):
+        pipe.call_batch(np.random.rand(2, 4))
+
+    pipe = Pipeline(inp, rescale(inp, 0, 2))
+    pipe.add_validator(MeanVarValidator(1, 0.2), 0)
+    with pytest.raises(BatchValidationError) as info:
+        pipe.call_batch(np.array([[0, 0, 0, 1], [0, 1, 1, 1], [0, 1, 2, 3]]))
+    assert info.value.indices == [0, 1]
+
+def test_pipeline_hooks():
+    events = []
+
+    class Recorder(NodeHook):
+        def before_node(self, node, inputs):
+            events.append(("before", node.name, inputs))
+
+        def after_node(self, node, output, elapsed):
+            events.append(("after", node.name, output))
+            assert elapsed >= 0
+
+    inp = InputNode()
+    x = rescale(inp)
+    pipe = Pipeline(inp, x)
+    plain_plan = pipe.compile()
+
+    with pytest.raises(TypeError):
+        pipe.add_hook(lambda node: None)
+
+    hook = Recorder()
+    pipe.add_hook(hook)
+    data = np.array([0, 2, 4])
+    result = pipe(data)
+    assert [event[0] for event in events] == ["before", "after"]
+    assert events[0][2][0] is data
+    assert events[1][2] is result
+
+    # without hooks the plain functions are executed
+    pipe.remove_hook(hook)
+    assert pipe.compile()[0][0] is plain_plan[0][0]
+    with pytest.raises(ValueError):
+        pipe.remove_hook(hook)
+
+def test_pipeline_profile():
+    @deferred_execution
+    def slow(value):
+        time.sleep(0.01)
+        return value
+
+    inp = InputNode()
+    x = slow(rescale(inp))
+    pipe = Pipeline(inp, [x, rescale(inp)], merge_duplicates=True)
+
+    with pipe.profile() as profiler:
+        for _ in range(3):
+            pipe(np.arange(12.0).reshape(3, 4))
+    pipe(np.arange(12.0))
+
+    report = profiler.report()
+    assert list(report) == ["2:slow", "1:rescale"]
+    assert report["2:slow"]["calls"] == 3
+    assert report["2:slow"]["mean_time"] >= 0.01
+    assert report["1:rescale"]["mean_bytes"] == 96
+    assert report["1:rescale"]["shape"] == (3, 4)
+    assert "2:slow" in profiler.table().splitlines()[2]
+
+    profiler.reset()
+    assert profiler.report() == {}
+
+def test_pipeline_fuse_statistics_validators(monkeypatch):
+    inp = InputNode()
+    pipe = Pipeline(inp, inp)
+    pipe.add_validator(MinMaxValidator(0, 1), 0)
+    pipe.add_validator(MeanVarValidator(target_mean=0.5, max_mean_gap=0.2), 0)
+
+    # the separate validators aren't called, a single StatisticsValidator is
+    def fail(self, data):
+        raise AssertionError("not fused")
+    monkeypatch.setattr(MinMaxValidator, "validate", fail)
+    monkeypatch.setattr(MeanVarValidator, "validate", fail)
+
+    pipe(np.array([0.4, 0.6]))
+    with pytest.raises(ValidationError, match=r"Max of data is.*"):
+        pipe(np.array([0.4, 1.6]))
+    with pytest.raises(ValidationError, match=r"Mean of data is.*"):
+        pipe(np.array([0.0, 0.1]))
+
+def test_pipeline_sampled_validator():
+    inp = InputNode()
+    pipe = Pipeline(inp, inp)
+    sampled = pipe.add_validator(MinMaxValidator(0, 1), 0, every_n=2)
+
+    with pytest.raises(ValidationError):
+        pipe(np.array([2.0]))
+    pipe(np.array([2.0]))  # skipped
+    assert (sampled.validated, sampled.skipped) == (1, 1)
+
+    with pytest.raises(ValueError):
+        pipe.add_validator(MinMaxValidator(0, 1), 0, fraction=2)
+
+class _BlockingValidator(Validator):
+    def __init__(self):
+        self.release = threading.Event()
+
+    def validate(self, data):
+        self.release.wait()
+
+def test_pipeline_background_validation():
+    inp = InputNode()
+    pipe = Pipeline(inp, inp)
+    pipe.add_validator(MinMaxValidator(0, 1), 0)
+    failures = []
+    background = BackgroundValidation(on_failure=lambda e, i: failures.append((type(e), i)))
+    pipe.set_background_validation(background)
+
+    assert pipe(np.array([2.0]))[0] == 2.0  # returned before the validation
+    pipe(np.array([0.5]))
+    background.join()
+    assert failures == [(ValidationError, 0)]
+    assert (background.validated, background.failures) == (2, 1)
+
+    # the bulk executions keep validating synchronously
+    with pytest.raises(ValidationError):
+        list(pipe.map([np.array([2.0])]))
+
+    with pytest.raises(TypeError):
+        pipe.set_background_validation(42)
+
+def test_pipeline_background_validation_raise_next_call():
+    inp = InputNode()
+    pipe = Pipeline(inp, inp)
+    pipe.add_validator(MinMaxValidator(0, 1), 0)
+    background = BackgroundValidation()
+    pipe.set_background_validation(background)
+
+    pipe(np.array([2.0]))
+    background.close()  # wait for the validation
+    with pytest.raises(ValidationError):
+        pipe(np.array([0.5]))
+    pipe(np.array([0.5]))  # raised once
+
+    pipe(np.array([-1.0]))
+    with pytest.raises(ValidationError):
+        background.join()
+
+    pipe.set_background_validation(None)
+    with pytest.raises(ValidationError):
+        pipe(np.array([2.0]))
+
+def test_pipeline_background_validation_bounded_queue():
+    inp = InputNode()
+    pipe = Pipeline(inp, inp)
+    validator = _BlockingValidator()
+    pipe.add_validator(validator, 0)
+    background = BackgroundValidation(max_queue=2, when_full="drop")
+    pipe.set_background_validation(background)
+
+    for i in range(10):
+        pipe(i)
+    assert background.pending <= 2
+    # one being validated, two queued
+    assert background.dropped >= 7
+    validator.release.set()
+    background.join()
+    assert background.validated + background.dropped == 10
+
+    with pytest.raises(ValueError):
+        BackgroundValidation(max_queue=0)
+    with pytest.raises(ValueError):
+        BackgroundValidation(when_full="wait")
+
+def test_pipeline_background_validation_close_while_submitting():
+    def workers():
+        return sum(thread.name == "pipeline-validation" for thread in threading.enumerate())
+
+    # a submit racing with close must not start a second worker reading the queue
+    background = BackgroundValidation()
+    task = [(0, [MinMaxValidator(0, 1)], np.array([0.5]))]
+    before = workers()
+    for _ in range(200):
+        closing = threading.Thread(target=background.close)
+        closing.start()
+        background.submit(task)
+        closing.join(timeout=5)
+        assert not closing.is_alive()
+    background.join()
+    background.close()
+    assert background.validated == 200
+    assert workers() == before
+
+def test_pipeline_background_validation_pickle():
+    inp = InputNode()
+    pipe = Pipeline(inp, inp)
+    pipe.add_validator(MinMaxValidator(0, 1), 0)
+    pipe.set_background_validation(BackgroundValidation(max_queue=4))
+    pipe(np.array([0.5]))
+
+    # the copy gets its own queue and thread
+    restored = pickle.loads(pickle.dumps(pipe))
+    assert restored(np.array([2.0]))[0] == 2.0
+
+def test_pipeline_fuse_open_and_resize(tmp_path):
+    path = str(tmp_path / "photo.jpg")
+    y, x = np.mgrid[:900, :1200]
+    cv2.imwrite(path, np.stack([x % 256, y % 256, (x + y) % 256], -1).astype(np.uint8))
+
+    inp = InputNode()
+    resized = resize_with_max_distortion(open_rgb_image(inp), (224, 224), 0)
+    pipe = Pipeline(inp, resized, fuse_nodes=True)
+    assert pipe.optimization_report()["fused_nodes"] == 1
+    unfused = Pipeline(inp, resized)
+    assert unfused.optimization_report()["fused_nodes"] == 0
+    assert pipe(path).shape == unfused(path).shape == (168, 224, 3)
+    assert pickle.loads(pickle.dumps(pipe))(path).shape == (168, 224, 3)
+
+    # the opened image is an output, it's computed
+    image = open_rgb_image(inp)
+    pipe = Pipeline(inp, [image, resize_with_max_distortion(image, (224, 224), 0)], fuse_nodes=True)
+    assert pipe.optimization_report()["fused_nodes"] == 0
+    assert pipe(path)[0].shape == (900, 1200, 3)
+
+def test_pipeline_fused_node_is_reported():
+    from src.dl_data_pipeline.cache import MemoryCache
+
+    inp = InputNode()
+    opened = open_rgb_image(inp)
+    resized = resize_with_max_distortion(opened, (224, 224), 0)
+
+    # without fusion the opened image is a node of the pipeline
+    Pipeline(inp, resized).set_cache(MemoryCache(1 << 20), opened)
+
+    pipe = Pipeline(inp, resized, fuse_nodes=True)
+    with pytest.raises(ValueError, match="fused"):
+        pipe.set_cache(MemoryCache(1 << 20), opened)
+    with pytest.raises(RuntimeError, match="fused with"):
+        pipe("missing.jpg")
+
+def test_pipeline_buffer_pool():
+    inp = InputNode()
+    pooled = max_pooling_2d(padding_2d(inp, (40, 40), 0), 2)
+    chw = image_hwc_to_chw(pooled)
+    pipe = Pipeline(inp, [chw, rescale(pooled)])
+    reference = Pipeline(inp, [chw, rescale(pooled)])
+    pool = BufferPool()
+    pipe.set_buffer_pool(pool)
+
+    images = [np.random.rand(32, 30, 3) for _ in range(5)]
+    results = [pipe(image) for image in images]
+    for image, (out_chw, out_rescaled) in zip(images, results):
+        # outputs of the previous calls aren't overwritten by the buffers
+        expected_chw, expected_rescaled = reference(image)
+        np.testing.assert_array_equal(out_chw, expected_chw)
+        np.testing.assert_array_equal(out_rescaled, expected_rescaled)
+
+    # the padding is pooled, the pooling isn't (rescale isn't buffered)
+    assert pool.allocations == 1 and pool.reuses == 4
+    assert pool.nbytes() == 40 * 40 * 3 * 8
+
+    # threads have their own buffers
+    list(pipe.map(images, workers=2, backend="thread"))
+    assert pool.allocations <= 3
+
+    restored = pickle.loads(pickle.dumps(pipe))
+    np.testing.assert_array_equal(restored(images[0])[0], results[0][0])
+
+    pipe.set_buffer_pool(None)
+    used = pool.reuses + pool.allocations
+    pipe(images[0])
+    assert pool.reuses + pool.allocations == used
+    with pytest.raises(TypeError):
+        pipe.set_buffer_pool(42)
+
+def test_pipeline_buffer_pool_skips_outputs_and_cache():
+    from src.dl_data_pipeline.cache import MemoryCache
+    inp = InputNode()
+    padded = padding_2d(inp, (16, 16), 0)
+    pipe = Pipeline(inp, [padded, max_pooling_2d(padded, 2)])
+    pool = BufferPool()
+    pipe.set_buffer_pool(pool)
+    pipe(np.ones((8, 8)))
+    assert pool.allocations == 0
+
+    pipe = Pipeline(inp, max_pooling_2d(padded, 2))
+    pipe.set_buffer_pool(pool)
+    pipe.set_cache(MemoryCache(1 << 20), padded)
+    pipe(np.ones((8, 8)))
+    assert pool.allocations == 0
+
+def test_pipeline_buffer_pool_shared_by_nested_pipelines():
+    from src.dl_data_pipeline.pipeline.buffer_pool import register_buffered, resolve_out
+
+    @deferred_execution
+    def stack(a, b, out=None):
+        result = resolve_out(out, (2,) + a.shape, a.dtype)
+        if result is None:
+            return np.stack([a, b])
+        result[0], result[1] = a, b
+        return result
+    register_buffered(stack.__wrapped__)
+
+    # the slot 1 of both pipelines is pooled, the inner pipeline runs while the buffer of
+    # the outer one holds the padded input
+    inner_inp = InputNode()
+    inner = Pipeline(inner_inp, padding_2d(padding_2d(inner_inp, (3, 3), 7), (3, 3), 7))
+    inp = InputNode()
+    outer = Pipeline(inp, stack(padding_2d(inp, (3, 3), 0), inner.as_deferred(padding_2d(inp, (3, 3), 5))))
+    reference = Pipeline(inp, stack(padding_2d(inp, (3, 3), 0), inner.as_deferred(padding_2d(inp, (3, 3), 5))))
+
+    pool = BufferPool()
+    inner.set_buffer_pool(pool)
+    outer.set_buffer_pool(pool)
+    for _ in range(2):
+        np.testing.assert_array_equal(outer(np.ones((2, 2))), reference(np.ones((2, 2))))
+
+    # two pipelines sharing the pool don't share their buffers
+    other = Pipeline(inp, stack(padding_2d(inp, (3, 3), 0), padding_2d(inp, (3, 3), 0)))
+    other.set_buffer_pool(pool)
+    allocations = pool.allocations
+    other(np.ones((2, 2)))
+    assert pool.allocations == allocations + 2
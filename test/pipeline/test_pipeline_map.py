@@ -0,0 +1,250 @@
+import pickle
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.dl_data_pipeline import Pipeline, InputNode, deferred_execution
+from src.dl_data_pipeline.pipeline import RunStats, FailedSample, PipelineExecutionError
+from src.dl_data_pipeline.validator import MinMaxValidator, DriftValidator, ValidationError
+from src.dl_data_pipeline.process_functions.any_process import rescale
+
+@deferred_execution
+def add(a, b):
+    return a + b
+
+@deferred_execution
+def slow_square(a):
+    time.sleep(0.001 * (a % 3))
+    return a * a
+
+@deferred_execution
+def inverse(a):
+    if a == 0:
+        raise ZeroDivisionError("corrupted sample")
+    return 1 / a
+
+def test_map_ordered():
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    results = list(pipe.map(range(100), workers=4, chunksize=3))
+    assert results == [i * i for i in range(100)]
+
+def test_map_unordered():
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    results = list(pipe.map(range(100), workers=4, ordered=False))
+    assert sorted(results) == [i * i for i in range(100)]
+
+def test_map_multi_inputs():
+    inp1 = InputNode()
+    inp2 = InputNode()
+    pipe = Pipeline([inp1, inp2], add(inp1, inp2))
+    results = list(pipe.map(zip(range(10), range(10)), workers=2))
+    assert results == [2 * i for i in range(10)]
+
+def test_map_stats():
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    stats = RunStats()
+    list(pipe.map(range(50), workers=4, stats=stats))
+    assert stats.samples == 50
+    assert stats.elapsed > 0
+    assert stats.throughput > 0
+    stats.__repr__()
+
+def test_map_bounded_in_flight():
+    pulled = 0
+    def source():
+        nonlocal pulled
+        for i in range(1000):
+            pulled += 1
+            yield i
+
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    results = pipe.map(source(), workers=2, chunksize=4, max_in_flight=3)
+    next(results)
+
+    # the source is only read as far as the in flight chunks
+    assert pulled <= 3 * 4 + 1
+    results.close()
+
+def test_map_uses_threads():
+    thread_ids = set()
+
+    @deferred_execution
+    def record_thread(a):
+        thread_ids.add(threading.get_ident())
+        time.sleep(0.002)
+        return a
+
+    inp = InputNode()
+    pipe = Pipeline(inp, record_thread(inp))
+    list(pipe.map(range(40), workers=4))
+    assert len(thread_ids) > 1
+
+def test_map_propagate_error():
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    with pytest.raises(RuntimeError):
+        list(pipe.map([1, 2, "a"], workers=2))
+
+def test_map_wrong_arguments():
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    with pytest.raises(ValueError):
+        list(pipe.map(range(10), workers=0))
+    with pytest.raises(ValueError):
+        list(pipe.map(range(10), chunksize=0))
+    with pytest.raises(ValueError):
+        list(pipe.map(range(10), max_in_flight=0))
+
+def test_pipeline_pickle():
+    inp = InputNode()
+    inp2 = InputNode()
+    sub_pipe = Pipeline([inp, inp2], rescale(inp, inp2, 5))
+
+    n_input = InputNode()
+    x = sub_pipe.as_deferred(n_input[0], 0)
+    pipe = Pipeline(n_input, [x, n_input[1]])
+
+    data = np.random.rand(10, 10)
+    restored = pickle.loads(pickle.dumps(pipe))
+    result, label = restored((data, "label"))
+    expected, _ = pipe((data, "label"))
+    assert np.array_equal(result, expected)
+    assert label == "label"
+
+def test_map_process_backend():
+    inp = InputNode()
+    pipe = Pipeline(inp, rescale(inp, 0, 2))
+    data = [np.random.rand(16) for _ in range(20)]
+    results = list(pipe.map(data, workers=2, chunksize=4, backend="process"))
+    assert len(results) == 20
+    for result in results:
+        assert abs(np.max(result) - 2) < 1e-9
+
+def test_map_unknown_backend():
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    with pytest.raises(ValueError):
+        list(pipe.map(range(10), backend="gpu"))
+
+def test_stream():
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    stats = RunStats()
+    results = list(pipe.stream(iter(range(100)), prefetch=4, workers=2, stats=stats))
+    assert sorted(results) == [i * i for i in range(100)]
+    assert stats.samples == 100
+
+def test_stream_backpressure():
+    pulled = 0
+    def source():
+        nonlocal pulled
+        for i in range(1000):
+            pulled += 1
+            yield i
+
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    results = pipe.stream(source(), prefetch=5, workers=2)
+    for _ in range(10):
+        next(results)
+    assert pulled <= 10 + 5 + 1
+    results.close()
+
+def test_stream_shuffle():
+    inp = InputNode()
+    pipe = Pipeline(inp, inp[0])
+    results = list(pipe.stream(((i,) for i in range(200)), workers=1, shuffle_buffer=50, seed=0))
+    assert sorted(results) == list(range(200))
+    assert results != list(range(200))
+
+    # same seed, same shuffle with a single worker
+    again = list(pipe.stream(((i,) for i in range(200)), workers=1, shuffle_buffer=50, seed=0))
+    assert again == results
+
+def test_stream_wrong_arguments():
+    inp = InputNode()
+    pipe = Pipeline(inp, slow_square(inp))
+    with pytest.raises(ValueError):
+        list(pipe.stream(range(10), shuffle_buffer=-1))
+    with pytest.raises(ValueError):
+        list(pipe.stream(range(10), prefetch=0))
+
+def test_map_error_policies():
+    inp = InputNode()
+    out = inverse(inp)
+    pipe = Pipeline(inp, out)
+    pipe.add_validator(MinMaxValidator(-1, 1), 0)
+
+    with pytest.raises(PipelineExecutionError) as error:
+        list(pipe.map([1, 0, 2], workers=2))
+    assert error.value.node is out
+    assert isinstance(error.value.__cause__, ZeroDivisionError)
+
+    quarantine = []
+    stats = RunStats()
+    results = list(pipe.map([1, 0, 2, 0.5], workers=2, on_error="skip", quarantine=quarantine, stats=stats))
+    assert results == [1, 0.5]
+    assert [failed.item for failed in quarantine] == [0, 0.5]
+    assert quarantine[0].node is out
+    assert isinstance(quarantine[1].error, ValidationError) and quarantine[1].node is None
+    assert stats.samples == 4 and stats.failures == 2
+
+    results = list(pipe.stream([1, 0, 2], workers=2, on_error="sentinel"))
+    failed = [result for result in results if isinstance(result, FailedSample)]
+    assert len(failed) == 1 and failed[0].item == 0
+    assert sorted(result for result in results if not isinstance(result, FailedSample)) == [0.5, 1]
+
+    with pytest.raises(ValueError):
+        list(pipe.map([1], on_error="ignore"))
+
+def test_map_skip_drift():
+    inp = InputNode()
+    pipe = Pipeline(inp, inp)
+    validator = DriftValidator(max_value=1)
+    pipe.add_validator(validator, 0)
+
+    # only the sample where the drift is detected is quarantined, not the rest of the epoch
+    quarantine = []
+    results = list(pipe.map([0.5, 2.0, 0.5, 0.2], workers=1, on_error="skip", quarantine=quarantine))
+    assert results == [0.5, 0.5, 0.2]
+    assert [failed.item for failed in quarantine] == [2.0]
+    assert validator.drifted
+
+def test_map_error_policy_process_backend():
+    inp = InputNode()
+    out = inverse(inp)
+    pipe = Pipeline(inp, out)
+    quarantine = []
+    results = list(pipe.map([1, 0, 2], workers=2, backend="process", on_error="skip", quarantine=quarantine))
+    assert results == [1, 0.5]
+    assert quarantine[0].item == 0
+    assert isinstance(quarantine[0].error, PipelineExecutionError)
+
+    # the error is sent back from the worker with the policy "raise"
+    with pytest.raises(PipelineExecutionError):
+        list(pipe.map([1, 0], workers=1, backend="process"))
+
+def test_call_batch_error_policies():
+    inp = InputNode()
+    pipe = Pipeline(inp, [rescale(inp), inp])
+
+    batch = np.random.rand(4, 3)
+    batch[1] = 2
+    with pytest.raises(PipelineExecutionError):
+        pipe.call_batch(batch)
+
+    quarantine = []
+    rescaled, raw = pipe.call_batch(batch, on_error="skip", quarantine=quarantine)
+    assert rescaled.shape == (3, 3)
+    assert np.array_equal(raw, batch[[0, 2, 3]])
+    assert len(quarantine) == 1 and np.array_equal(quarantine[0].item, batch[1])
+
+    rescaled, raw = pipe.call_batch(batch, on_error="sentinel")
+    assert isinstance(rescaled, list) and isinstance(rescaled[1], FailedSample)
+    assert raw[1] is rescaled[1]
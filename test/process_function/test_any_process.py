@@ -18,4 +18,14 @@ def test_rescale_error_0_range():
     with pytest.raises(ValueError):
         node = PipelineNode()
         node._set_value(data)
-        any_process.rescale(node, 0, 1).execute()
\ No newline at end of file
+        any_process.rescale(node, 0, 1).execute()
+
+def test_rescale_batched():
+    batch = np.random.randint(0, 255, (4, 8, 8))
+    call = any_process.rescale(PipelineNode(), -1, 1).func
+    expected = np.stack([call(sample) for sample in batch])
+    assert np.allclose(call.batched(batch), expected)
+
+    batch[2] = 3
+    with pytest.raises(ValueError):
+        call.batched(batch)
@@ -94,3 +94,44 @@ def test_center_pad_rcut_normal_smaller():
     result = result_node.value
     assert result.shape == (2, 500)
     assert np.array_equal(array[:, :500], result)
+
+@pytest.mark.parametrize("func", [process_1d.rpad_rcut, process_1d.lpad_lcut, process_1d.center_pad_rcut])
+@pytest.mark.parametrize("length", [500, 1500])
+def test_batched_matches_per_sample(func, length):
+    batch = np.random.rand(4, 2, 1000).astype(np.float32)
+    call = func(PipelineNode(), length).func
+    result = call.batched(batch)
+    expected = np.stack([call(sample) for sample in batch])
+    assert result.dtype == expected.dtype
+    assert np.array_equal(result, expected)
+
+def _call_with_out(call, data, out):
+    return call.func(data, *call.args, out=out, **call.kwargs)
+
+@pytest.mark.parametrize("func", [process_1d.rpad_rcut, process_1d.lpad_lcut, process_1d.center_pad_rcut])
+@pytest.mark.parametrize("length", [1500, 600])
+def test_out_matches_new_array(func, length):
+    data = np.random.rand(2, 1000).astype(np.float32)
+    call = func(PipelineNode(), length).func
+    expected = call(data)
+
+    out = np.full(expected.shape, 7, expected.dtype)
+    assert _call_with_out(call, data, out) is out
+    np.testing.assert_array_equal(out, expected)
+
+    allocated = []
+    def allocator(shape, dtype):
+        allocated.append((shape, dtype))
+        return np.full(shape, 7, dtype)
+    result = _call_with_out(call, data, allocator)
+    np.testing.assert_array_equal(result, expected)
+    assert allocated == [(expected.shape, expected.dtype)]
+    assert not np.shares_memory(result, data)
+
+    batch = np.stack([data, data])
+    out = np.empty((2, *expected.shape), expected.dtype)
+    assert _call_with_out(call.batched, batch, out) is out
+    np.testing.assert_array_equal(out, np.stack([expected, expected]))
+
+    with pytest.raises(ValueError):
+        _call_with_out(call, data, np.empty((2, length + 1)))
@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 from typing import Tuple
 from unittest.mock import patch
 
@@ -259,4 +262,178 @@ def test_max_pooling_shape():
     ndata_node.execute()
     ndata = ndata_node.value
     expected_shape = (50,50,3)
-    assert expected_shape == ndata.shape
\ No newline at end of file
+    assert expected_shape == ndata.shape
+
+@pytest.mark.parametrize("func, kwargs, shape", [
+    (process_2d.padding_2d, {"target_shape": (12, 14), "fill_value": 0}, (4, 9, 10, 3)),
+    (process_2d.padding_2d, {"target_shape": (12, 14)}, (4, 9, 10)),
+    (process_2d.image_hwc_to_chw, {}, (4, 9, 10, 3)),
+    (process_2d.image_chw_to_hwc, {}, (4, 3, 9, 10)),
+    (process_2d.max_pooling_2d, {"strides": 2}, (4, 9, 10, 3)),
+    (process_2d.avg_pooling_2d, {"strides": 3}, (4, 9, 10)),
+    (process_2d.any_pooling_2d, {"strides": 2, "pooling_function": np.min}, (4, 9, 10, 3)),
+])
+def test_batched_matches_per_sample(func, kwargs, shape):
+    batch = np.random.rand(*shape)
+    call = func(PipelineNode(), **kwargs).func
+    result = call.batched(batch)
+    expected = np.stack([call(sample) for sample in batch])
+    assert result.dtype == expected.dtype
+    assert np.array_equal(result, expected)
+
+def test_opencv_imported_lazily():
+    # a fresh interpreter, the test session already imported cv2
+    code = ("import sys\n"
+            "import src.dl_data_pipeline as dl\n"
+            "from src.dl_data_pipeline.process_functions import process_1d, rescale\n"
+            "dl.process_2d.padding_2d\n"
+            "assert 'cv2' not in sys.modules, 'cv2 imported'\n"
+            "import numpy as np\n"
+            "from src.dl_data_pipeline import instant_excecution\n"
+            "with instant_excecution():\n"
+            "    dl.process_2d.resize_with_max_distortion(np.zeros((8, 8, 3), np.uint8), (4, 4), 0)\n"
+            "assert 'cv2' in sys.modules\n")
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+def _photo(height, width):
+    # smooth gradients, compressed like a photo
+    y, x = np.mgrid[:height, :width]
+    return np.stack([x * 255 // width, y * 255 // height, (x + y) * 127 // (height + width)], -1).astype(np.uint8)
+
+def test_jpeg_size(tmp_path):
+    jpg = str(tmp_path / "image.jpg")
+    png = str(tmp_path / "image.png")
+    cv2.imwrite(jpg, _photo(300, 200))
+    cv2.imwrite(png, _photo(300, 200))
+    assert process_2d._jpeg_size(jpg) == (300, 200)
+    assert process_2d._jpeg_size(png) is None
+    assert process_2d._jpeg_size(str(tmp_path / "missing.jpg")) is None
+
+@pytest.mark.parametrize("shape, factor", [((1000, 800), 4), ((300, 2000), 8), ((240, 240), 1), ((480, 480), 2)])
+def test_open_and_resize(tmp_path, shape, factor):
+    path = str(tmp_path / "photo.jpg")
+    cv2.imwrite(path, _photo(*shape))
+
+    flags = []
+    imread = cv2.imread
+    def spy(path, flag=cv2.IMREAD_COLOR):
+        flags.append(flag)
+        return imread(path, flag)
+
+    with patch("cv2.imread", side_effect=spy):
+        result = process_2d.open_and_resize.__wrapped__(path, (224, 224), 0.1)
+    expected = process_2d.resize_with_max_distortion.__wrapped__(
+        process_2d.open_rgb_image.__wrapped__(path), (224, 224), 0.1)
+
+    assert result.shape == expected.shape and result.dtype == expected.dtype
+    assert np.abs(result.astype(int) - expected).mean() < 3
+    reduced = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4,
+               8: cv2.IMREAD_REDUCED_COLOR_8}
+    assert flags == [reduced[factor]]
+
+def test_open_and_resize_png_and_missing(tmp_path):
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, _photo(500, 400))
+    assert process_2d.open_and_resize.__wrapped__(path, (224, 224), 0).shape == (224, 179, 3)
+    with pytest.raises(ValueError):
+        process_2d.open_and_resize.__wrapped__(str(tmp_path / "missing.jpg"), (224, 224), 0)
+
+def test_decode_image(tmp_path):
+    image = _photo(60, 80)
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, image)
+    with open(path, "rb") as fp:
+        encoded = fp.read()
+
+    decode = process_2d.decode_image.__wrapped__
+    bgr = decode(path, "bgr")
+    np.testing.assert_array_equal(bgr, image)
+    np.testing.assert_array_equal(decode(path), image[..., ::-1])
+    np.testing.assert_array_equal(decode(encoded), image[..., ::-1])
+    np.testing.assert_array_equal(decode(memoryview(encoded), "bgr"), image)
+    np.testing.assert_array_equal(decode(np.frombuffer(encoded, np.uint8), "bgr"), image)
+    assert decode(encoded, "gray").shape == (60, 80)
+
+    as_float = decode(encoded, dtype=np.float32)
+    assert as_float.dtype == np.float32
+    np.testing.assert_array_equal(as_float, image[..., ::-1])
+
+def test_decode_image_unchanged(tmp_path):
+    path = str(tmp_path / "image.png")
+    image = np.arange(24 * 32 * 4, dtype=np.uint16).reshape(24, 32, 4)
+    cv2.imwrite(path, image)
+    decoded = process_2d.decode_image.__wrapped__(path, "unchanged")
+    assert decoded.dtype == np.uint16
+    np.testing.assert_array_equal(decoded, image)
+
+def test_decode_image_out(tmp_path):
+    image = _photo(60, 80)
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, image)
+    decode = process_2d.decode_image.__wrapped__
+
+    batch = np.zeros((2, 60, 80, 3), np.uint8)
+    assert decode(path, out=batch[1]) is not None
+    np.testing.assert_array_equal(batch[1], image[..., ::-1])
+    assert not batch[0].any()
+
+    out = np.zeros((60, 80, 3), np.float32)
+    assert decode(path, "bgr", out=out) is out
+    np.testing.assert_array_equal(out, image)
+
+    strided = np.zeros((60, 80, 6), np.uint8)[..., ::2]
+    decode(path, out=strided)
+    np.testing.assert_array_equal(strided, image[..., ::-1])
+
+    with pytest.raises(ValueError):
+        decode(path, out=np.zeros((60, 80), np.uint8))
+    with pytest.raises(ValueError):
+        decode(path, dtype=np.uint8, out=out)
+
+def test_decode_image_errors(tmp_path):
+    decode = process_2d.decode_image.__wrapped__
+    with pytest.raises(ValueError):
+        decode(b"not an image")
+    with pytest.raises(ValueError):
+        decode(str(tmp_path / "missing.png"))
+    with pytest.raises(ValueError):
+        decode(b"", color="hsv")
+
+def _call_with_out(call, data, out):
+    return call.func(data, *call.args, out=out, **call.kwargs)
+
+@pytest.mark.parametrize("func, kwargs, shape", [
+    (process_2d.padding_2d, {"target_shape": (12, 14), "fill_value": 0}, (9, 10, 3)),
+    (process_2d.padding_2d, {"target_shape": (12, 14)}, (9, 10)),
+    (process_2d.image_hwc_to_chw, {}, (9, 10, 3)),
+    (process_2d.image_chw_to_hwc, {}, (3, 9, 10)),
+    (process_2d.max_pooling_2d, {"strides": 2}, (9, 10, 3)),
+    (process_2d.avg_pooling_2d, {"strides": 3}, (9, 10)),
+    (process_2d.any_pooling_2d, {"strides": 2, "pooling_function": np.min}, (9, 10, 3)),
+])
+def test_out_matches_new_array(func, kwargs, shape):
+    data = (np.random.rand(*shape) * 255).astype(np.uint8)
+    call = func(PipelineNode(), **kwargs).func
+    expected = call(data)
+
+    out = np.full(expected.shape, 7, expected.dtype)
+    assert _call_with_out(call, data, out) is out
+    np.testing.assert_array_equal(out, expected)
+
+    allocated = []
+    def allocator(shape, dtype):
+        allocated.append((shape, dtype))
+        return np.full(shape, 7, dtype)
+    result = _call_with_out(call, data, allocator)
+    assert result.dtype == expected.dtype and result.flags.c_contiguous
+    np.testing.assert_array_equal(result, expected)
+    assert allocated == [(expected.shape, expected.dtype)]
+
+    batch = np.stack([data, data])
+    out = np.empty((2, *expected.shape), expected.dtype)
+    assert _call_with_out(call.batched, batch, out) is out
+    np.testing.assert_array_equal(out, np.stack([expected, expected]))
+
+    with pytest.raises(ValueError):
+        _call_with_out(call, data, np.empty((1, 1, 1, 1), expected.dtype))
@@ -1,13 +1,21 @@
+import pickle
+
 import pytest
 import numpy as np
 from . import DummyData, CustomShapeData, CustomClass
 from src.dl_data_pipeline.validator import (
     MeanVarValidator,
     MinMaxValidator,
+    SampledValidator,
     ShapeValidator,
+    StatisticsValidator,
     TypeValidator,
-    ValidationError
+    DriftValidator,
+    RunningStatistics,
+    ValidationError,
+    BatchValidationError
 )
+from src.dl_data_pipeline.validator.statistics_validator import array_statistics
 
 def test_validate_with_mean_within_gap():
     data = np.array([1.0, 2.0, 3.0])
@@ -157,3 +165,220 @@ def test_type_validator_invalid_custom_class():
     data = 42
     with pytest.raises(ValidationError, match=r"data must be type :.*not <class 'int'>"):
         validator.validate(data)
+
+
+def test_array_statistics_single_pass():
+    data = np.random.rand(37, 41).astype(np.float32) * 10
+    data_min, data_max, data_mean, data_var = array_statistics(data, chunk_size=100)
+    assert data_min == data.min() and data_max == data.max()
+    assert np.isclose(data_mean, data.mean(dtype=np.float64))
+    assert np.isclose(data_var, data.var(dtype=np.float64))
+
+    # integers and a single chunk
+    data = np.arange(10)
+    assert array_statistics(data) == (0, 9, 4.5, 8.25)
+
+    with pytest.raises(ValueError):
+        array_statistics(np.array([]))
+
+def test_statistics_validator():
+    data = np.array([1.0, 2.0, 3.0])
+    StatisticsValidator(min_value=1.0, max_value=3.0, target_mean=2.0, target_var=0.6667, max_var_gap=0.5).validate(data)
+
+    with pytest.raises(ValidationError, match=r"Min of data is.*less than.*"):
+        StatisticsValidator(min_value=1.5, chunk_size=2).validate(data)
+    with pytest.raises(ValidationError, match=r"Max of data is.*more than.*"):
+        StatisticsValidator(max_value=2.5).validate(data)
+    with pytest.raises(ValidationError, match=r"Mean of data is.*out of interval.*"):
+        StatisticsValidator(target_mean=4.0, max_mean_gap=0.5).validate(data)
+    with pytest.raises(ValidationError, match=r"Var of data is.*out of interval.*"):
+        StatisticsValidator(target_var=2.0, max_var_gap=0.5).validate(data)
+
+    with pytest.raises(ValueError):
+        StatisticsValidator()
+    with pytest.raises(ValueError):
+        StatisticsValidator(min_value=0, chunk_size=0)
+
+def test_statistics_validator_from_validators():
+    min_max = MinMaxValidator(min_value=0.0, max_value=1.0)
+    mean_var = MeanVarValidator(target_mean=0.5, max_mean_gap=0.1)
+    assert (min_max.min_value, min_max.max_value) == (0.0, 1.0)
+    assert (mean_var.target_mean, mean_var.max_mean_gap, mean_var.target_var) == (0.5, 0.1, None)
+
+    fused = StatisticsValidator.from_validators(min_max, mean_var)
+    fused.validate(np.array([0.4, 0.6]))
+    with pytest.raises(ValidationError, match=r"Mean of data is.*"):
+        fused.validate(np.array([0.0, 0.2]))
+
+def test_sampled_validator_every_n():
+    validator = SampledValidator(MinMaxValidator(0, 1), every_n=3)
+    for i in range(7):
+        if i % 3 == 0:
+            with pytest.raises(ValidationError):
+                validator.validate(np.array([2.0]))
+        else:
+            validator.validate(np.array([2.0]))
+    assert (validator.validated, validator.skipped) == (3, 4)
+
+def test_sampled_validator_fraction():
+    validator = SampledValidator(MinMaxValidator(0, 1), fraction=0.25, seed=0)
+    for _ in range(1000):
+        validator.validate(np.array([0.5]))
+    assert validator.validated + validator.skipped == 1000
+    assert 150 < validator.validated < 350
+
+    never = SampledValidator(MinMaxValidator(0, 1), fraction=0)
+    never.validate(np.array([2.0]))
+    assert never.skipped == 1
+
+def test_sampled_validator_element_stride():
+    data = np.zeros((8, 8))
+    data[0, 1] = 5  # not in the subsample
+    validator = SampledValidator(MinMaxValidator(0, 1), element_stride=2)
+    validator.validate(data)
+    validator.validate(data.T)  # non contiguous, strided on the leading axis
+    data[0, 2] = 5
+    with pytest.raises(ValidationError):
+        validator.validate(data)
+
+def test_sampled_validator_wrong_arguments():
+    with pytest.raises(TypeError):
+        SampledValidator(42, every_n=2)
+    with pytest.raises(ValueError):
+        SampledValidator(MinMaxValidator(0, 1), every_n=2, fraction=0.5)
+    with pytest.raises(ValueError):
+        SampledValidator(MinMaxValidator(0, 1), every_n=0)
+    with pytest.raises(ValueError):
+        SampledValidator(MinMaxValidator(0, 1), fraction=1.5)
+    with pytest.raises(ValueError):
+        SampledValidator(MinMaxValidator(0, 1), element_stride=0)
+
+def _loop_mask(validator, batch):
+    return np.array([_fails(validator, sample) for sample in batch])
+
+def _fails(validator, sample):
+    try:
+        validator.validate(sample)
+        return False
+    except ValidationError:
+        return True
+
+@pytest.mark.parametrize("validator", [
+    MinMaxValidator(0.1, 0.9),
+    MeanVarValidator(0.5, 0.1),
+    MeanVarValidator(target_var=0.8 ** 2 / 12, max_var_gap=0.02),
+    StatisticsValidator(min_value=0.1, target_mean=0.5, max_mean_gap=0.1, target_var=0.8 ** 2 / 12, max_var_gap=0.02),
+])
+def test_validate_batch_matches_validate(validator):
+    rng = np.random.default_rng(0)
+    batch = rng.uniform(0.1, 0.9, (32, 8, 8)).astype(np.float32)
+    batch[3] *= 1.5
+    batch[7] -= 0.3
+    batch[10] = 0.5
+    mask = validator.validate_batch(batch)
+    assert mask.dtype == bool and mask.shape == (32,)
+    np.testing.assert_array_equal(mask, _loop_mask(validator, batch))
+    assert mask.any() and not mask.all()
+
+def test_validate_batch_shape_and_default():
+    validator = ShapeValidator((3, 4))
+    assert not validator.validate_batch(np.zeros((5, 3, 4))).any()
+    assert validator.validate_batch(np.zeros((5, 4, 3))).all()
+    assert validator.validate_batch([np.zeros((3, 4)), np.zeros((4, 3))]).tolist() == [False, True]
+
+    # TypeValidator relies on the per sample loop of the base class
+    validator = TypeValidator(int)
+    assert validator.validate_batch([1, "a", 2, 3.0]).tolist() == [False, True, False, True]
+
+def test_batch_validation_error():
+    error = BatchValidationError("samples don't validate", np.array([1, 4]))
+    assert isinstance(error, ValidationError)
+    assert error.indices == [1, 4]
+    restored = pickle.loads(pickle.dumps(error))
+    assert restored.indices == [1, 4] and str(restored) == "samples don't validate"
+
+def test_running_statistics_update():
+    rng = np.random.default_rng(0)
+    arrays = [rng.normal(1, 2, size) for size in (1, 10, 1000, 70000)]
+    stats = RunningStatistics(bins=8, value_range=(-3, 5))
+    for array in arrays:
+        stats.update(array)
+
+    values = np.concatenate(arrays)
+    assert stats.count == values.size
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.var == pytest.approx(values.var())
+    assert (stats.min, stats.max) == (values.min(), values.max())
+    histogram, edges = np.histogram(values, 8, (-3, 5))
+    np.testing.assert_array_equal(stats.bin_edges, edges)
+    np.testing.assert_array_equal(stats.histogram, histogram)
+    assert stats.underflow == np.count_nonzero(values < -3)
+    assert stats.overflow == np.count_nonzero(values >= 5)
+
+    # unsigned integers below the range don't wrap around
+    stats = RunningStatistics(bins=4, value_range=(10, 250))
+    stats.update(np.array([0, 5, 20, 100, 255], np.uint8))
+    assert (stats.underflow, stats.overflow) == (2, 1)
+    np.testing.assert_array_equal(stats.histogram, [1, 1, 0, 0])
+
+def test_running_statistics_merge():
+    rng = np.random.default_rng(1)
+    left = RunningStatistics(bins=4, value_range=(0, 1)).update(rng.random(100))
+    right = RunningStatistics(bins=4, value_range=(0, 1)).update(rng.random(3000) * 2)
+    whole = RunningStatistics(bins=4, value_range=(0, 1))
+    whole.merge(pickle.loads(pickle.dumps(left))).merge(right)
+
+    assert whole.count == 3100
+    empty = RunningStatistics(bins=4, value_range=(0, 1)).update(np.zeros(0))
+    assert empty.count == 0 and np.isnan(empty.mean)
+    assert whole.merge(empty).count == 3100
+    assert whole.mean == pytest.approx((left.mean * 100 + right.mean * 3000) / 3100)
+    np.testing.assert_array_equal(whole.histogram, left.histogram + right.histogram)
+    assert whole.overflow == right.overflow
+
+    with pytest.raises(ValueError):
+        whole.merge(RunningStatistics(bins=5, value_range=(0, 1)))
+    with pytest.raises(ValueError):
+        RunningStatistics(bins=4)
+
+def test_drift_validator():
+    validator = DriftValidator(target_mean=0.5, max_mean_gap=0.1, min_count=100)
+    validator.validate(np.ones(50))  # not enough values to check
+    validator.validate(np.zeros(60))
+    with pytest.raises(ValidationError, match="Running mean"):
+        validator.validate(np.zeros(100))
+    assert validator.drifted
+    # only the transition into drift raises
+    validator.validate(np.zeros(100))
+    assert validator.drifted
+    validator.validate(np.ones(300))  # back in bounds
+    assert not validator.drifted
+    with pytest.raises(ValidationError):
+        validator.validate(np.zeros(1000))
+
+    validator.reset()
+    validator.validate(np.full(200, 0.55))
+    assert not validator.drifted and validator.statistics.count == 200
+
+def test_drift_validator_report_and_merge():
+    validator = DriftValidator(bins=10, value_range=(0, 1), max_outside_fraction=0.1, raise_on_drift=False)
+    worker = pickle.loads(pickle.dumps(validator))
+    validator.validate(np.random.rand(100))
+    assert validator.violations == []
+
+    worker.validate(np.full(100, 2.0))  # doesn't raise
+    assert worker.drifted
+    validator.merge(worker)
+    assert validator.statistics.count == 200 and validator.statistics.overflow == 100
+    assert "outside" in validator.violations[0]
+
+    with pytest.raises(ValueError):
+        DriftValidator()
+    with pytest.raises(ValueError):
+        DriftValidator(max_outside_fraction=0.1)
+
+def test_drift_validator_batch():
+    validator = DriftValidator(max_value=1)
+    assert not validator.validate_batch(np.random.rand(4, 3)).any()
+    assert validator.validate_batch(np.array([[0, 2], [0, 0]])).all()
+    assert not validator.validate_batch(np.array([[0, 3]])).any()